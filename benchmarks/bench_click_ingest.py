@@ -0,0 +1,61 @@
+"""Benchmark for the click ingestion path used by ClickTab.
+
+Simulates the pynput mouse hook calling ``ClickIngestor.on_click`` from its
+own thread while a consumer drains the queue the way the Tk loop does, and
+reports throughput and per-callback latency.
+
+    python benchmarks/bench_click_ingest.py
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.input_ingest import ClickIngestor  # noqa: E402
+
+EVENTS = 200_000
+DRAIN_INTERVAL_S = 0.03
+
+
+def main():
+    ingestor = ClickIngestor()
+    ingestor.update_geometry(100, 100, 800, 600)
+    done = threading.Event()
+    consumed = [0]
+
+    def consumer():
+        while not done.is_set():
+            consumed[0] += len(ingestor.drain())
+            time.sleep(DRAIN_INTERVAL_S)
+        consumed[0] += len(ingestor.drain())
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        x = 1000 + i % 500
+        t0 = time.perf_counter_ns()
+        ingestor.on_click(x, 50, "left", i % 2 == 0)
+        latencies.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter() - start
+    done.set()
+    thread.join()
+
+    latencies.sort()
+    stats = ingestor.stats()
+    print(f"events:            {EVENTS}")
+    print(f"events/sec:        {EVENTS / elapsed:,.0f}")
+    print(f"callback p50:      {latencies[len(latencies) // 2] / 1000:.2f} us")
+    print(f"callback p99:      {latencies[int(len(latencies) * 0.99)] / 1000:.2f} us")
+    print(f"callback mean:     {statistics.fmean(latencies) / 1000:.2f} us")
+    print(f"consumed/dropped:  {consumed[0]} / {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
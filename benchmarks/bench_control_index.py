@@ -0,0 +1,95 @@
+"""Benchmark for the control filter's inverted index.
+
+Builds a synthetic ``print_control_identifiers`` dump with 50k controls,
+indexes it once and times the queries the filter box runs while typing:
+short prefixes, substrings, field-qualified terms and multi-term queries.
+The target is under 50 ms per keystroke.
+
+    python benchmarks/bench_control_index.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.control_index import ControlIndex, parse_controls  # noqa: E402
+
+CONTROLS = 50_000
+RUNS = 20
+TYPES = ["Button", "Edit", "Text", "CheckBox", "ComboBox", "ListItem", "MenuItem", "TreeItem", "Pane", "Hyperlink"]
+WORDS = ["保存", "名前を付けて保存", "開く", "Cancel", "OK", "Settings", "ユーザー名", "Password", "Search", "Next", "検索結果", "Details"]
+QUERIES = [
+    "b",
+    "bu",
+    "but",
+    "button",
+    "settings",
+    "ttin",
+    "type:edit",
+    "type:edit user",
+    "id:txt_4",
+    "id:txt_4242",
+    "class:win search 12",
+    "検索",
+    "保",
+    "title:保存",
+    "zzz",
+]
+
+
+def make_dump(rng):
+    """ウィンドウのコントロールを並べた print_control_identifiers 風のダンプを作ります。"""
+    lines = ["Control Identifiers:", "", "Dialog - 'Main Window'    (L0, T0, R1920, B1080)", "['Main Window', 'Dialog']",
+             'child_window(title="Main Window", control_type="Window")']
+    for i in range(CONTROLS):
+        kind = rng.choice(TYPES)
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+        depth = "   | " * rng.randint(1, 6)
+        lines.append(f"{depth}")
+        lines.append(f"{depth}{kind} - '{title}'    (L{i % 1900}, T{i % 1000}, R{i % 1900 + 80}, B{i % 1000 + 24})")
+        lines.append(f"{depth}['{title}', '{title}{kind}', '{kind}{i}']")
+        lines.append(f'{depth}child_window(title="{title}", auto_id="txt_{i}", control_type="{kind}", class_name="Windows.UI.{kind}")')
+    return lines
+
+
+def timed(func, *args):
+    """関数を繰り返し実行し、``(中央値ms, 最後の結果)`` を返します。"""
+    samples = []
+    result = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    lines = make_dump(random.Random(1))
+    start = time.perf_counter()
+    controls = parse_controls(lines)
+    parse_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index = ControlIndex(controls)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(lines)} lines, {len(index)} controls: parse {parse_ms:.0f} ms, index {build_ms:.0f} ms")
+
+    def scan(query):
+        """索引を使わずに全コントロールを調べる場合（比較用）。"""
+        terms = query.lower().split()
+        return [n for n, c in enumerate(controls)
+                if all(any(t.split(":")[-1] in getattr(c, f).lower()
+                           for f in ("title", "class_name", "control_type", "automation_id")) for t in terms)]
+
+    print(f"{'query':24} {'index ms':>9} {'scan ms':>9} {'hits':>7}")
+    for query in QUERIES:
+        ms, hits = timed(index.search, query)
+        scan_ms, _ = timed(scan, query)
+        print(f"{query:24} {ms:9.2f} {scan_ms:9.1f} {len(hits):7}")
+
+
+if __name__ == "__main__":
+    main()
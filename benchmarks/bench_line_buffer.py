@@ -0,0 +1,82 @@
+"""Benchmark for the line-indexed buffer behind the virtualized text viewer.
+
+Builds a ~7 MB control dump (100k lines), appends it in the chunk size the
+dump worker uses, then times what the viewer does per frame or keystroke:
+fetching one screenful of lines, jumping to a scroll position, incremental
+search forward and backward, and opening the saved dump as a memory map.
+
+    python benchmarks/bench_line_buffer.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.line_buffer import LineBuffer, compile_search  # noqa: E402
+
+LINES = 100_000
+CHUNK_CHARS = 64 * 1024
+SCREEN_LINES = 40
+RUNS = 20
+
+
+def make_dump():
+    """print_control_identifiers に似た行を並べたダンプを作ります。"""
+    return "".join(
+        f"   |    | Button - 'ボタン{i}'    (L{i % 1900}, T{i % 1000}, R{i % 1900 + 80}, B{i % 1000 + 24})\n"
+        f"   |    | ['ボタン{i}', 'Button{i}']\n"
+        f"   |    | child_window(title=\"ボタン{i}\", auto_id=\"btn{i}\", control_type=\"Button\")\n"
+        for i in range(LINES // 3)
+    )
+
+
+def timed(func, *args, **kwargs):
+    """関数を繰り返し実行し、``(中央値ms, 最後の結果)`` を返します。"""
+    samples = []
+    result = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    dump = make_dump()
+    chunks = [dump[i:i + CHUNK_CHARS] for i in range(0, len(dump), CHUNK_CHARS)]
+
+    start = time.perf_counter()
+    buffer = LineBuffer()
+    for chunk in chunks:
+        buffer.append(chunk)
+    append_ms = (time.perf_counter() - start) * 1000
+    print(f"dump {buffer.nbytes / 1e6:.1f} MB, {len(buffer)} lines, {len(chunks)} chunks")
+    print(f"append all chunks                : {append_ms:8.1f} ms ({append_ms / len(chunks) * 1000:.0f} us/chunk)")
+
+    middle = len(buffer) // 2
+    ms, _ = timed(buffer.lines, middle, middle + SCREEN_LINES)
+    print(f"fetch one screen ({SCREEN_LINES} lines)      : {ms:8.3f} ms")
+
+    pattern = compile_search('auto_id="btn31337"')
+    ms, found = timed(buffer.search, pattern, 0, 0)
+    print(f"search forward from the top      : {ms:8.2f} ms  -> {found}")
+    ms, found = timed(buffer.search, pattern, found[0] + 500, 0, backward=True)
+    print(f"search backward, 500 lines away  : {ms:8.2f} ms  -> {found}")
+    ms, found = timed(buffer.search, compile_search("存在しない"), middle, 0)
+    print(f"search with no match (full scan) : {ms:8.2f} ms  -> {found}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dump.txt")
+        with open(path, "wb") as file:
+            buffer.write_to(file)
+        ms, opened = timed(LineBuffer.from_file, path)
+        print(f"open saved dump (mmap + index)   : {ms:8.1f} ms  -> {len(opened)} lines")
+        opened.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark for the image-template fallback used by ClickTab.
+
+Builds a synthetic 4K (3840x2160) screenshot, cuts a 48x48 template around a
+"recorded click", moves the window by a few dozen pixels and measures how
+long ``locate`` takes to find it again, with and without the recorded
+position as a hint. A single-level full-resolution search is timed for
+comparison.
+
+When a screen is available it also times the real capture cost: the
+96x96 square the click-template prefetcher grabs every 200 ms, the search
+region around a recorded click, and the whole virtual screen, each through
+``grab_screen`` and through a plain ``ImageGrab.grab(all_screens=True)``
+for comparison.
+
+    python benchmarks/bench_template_match.py
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.template_match import (  # noqa: E402
+    DEFAULT_SEARCH_MARGIN,
+    DEFAULT_TEMPLATE_SIZE,
+    grab_screen,
+    locate,
+    match_scores,
+    to_gray,
+    virtual_screen_bbox,
+)
+
+WIDTH, HEIGHT = 3840, 2160
+RUNS = 10
+
+
+def make_screen(rng):
+    """ウィンドウやボタンのような矩形と、文字のような細かい模様を並べた疑似スクリーンショットを作ります。"""
+    screen = np.full((HEIGHT, WIDTH, 3), 235, dtype=np.uint8)
+    for _ in range(3000):
+        w, h = rng.integers(20, 240, size=2)
+        x, y = rng.integers(0, WIDTH - w), rng.integers(0, HEIGHT - h)
+        screen[y:y + h, x:x + w] = rng.integers(0, 255, size=3)
+    for _ in range(40000):
+        glyph = rng.random((9, 6)) < 0.4
+        x, y = rng.integers(0, WIDTH - 6), rng.integers(0, HEIGHT - 9)
+        screen[y:y + 9, x:x + 6][glyph] = 20
+    noise = rng.integers(-6, 7, size=screen.shape)
+    return np.clip(screen.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def timed(func, *args, **kwargs):
+    """関数を繰り返し実行し、``(中央値ms, 最後の結果)`` を返します。"""
+    samples = []
+    result = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    rng = np.random.default_rng(1)
+    screen = make_screen(rng)
+    click_x, click_y = 1900, 1100
+    half = DEFAULT_TEMPLATE_SIZE // 2
+    template = screen[click_y - half:click_y + half, click_x - half:click_x + half].copy()
+
+    # ウィンドウが右下に動いた状態を作る
+    shift_x, shift_y = 37, 23
+    moved = np.full_like(screen, 235)
+    moved[shift_y:, shift_x:] = screen[:-shift_y, :-shift_x]
+    expected = (click_x + shift_x, click_y + shift_y)
+
+    print(f"screen {WIDTH}x{HEIGHT}, template {DEFAULT_TEMPLATE_SIZE}x{DEFAULT_TEMPLATE_SIZE}, runs {RUNS}")
+    print(f"expected center: {expected}")
+
+    ms, found = timed(locate, moved, template, near=(click_x, click_y))
+    print(f"pyramid, near recorded position : {ms:8.1f} ms  -> {found}")
+    ms, found = timed(locate, moved, template)
+    print(f"pyramid, full screen            : {ms:8.1f} ms  -> {found}")
+
+    def single_level():
+        scores = match_scores(to_gray(moved), to_gray(template))
+        y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return int(x) + half, int(y) + half
+
+    ms, found = timed(single_level)
+    print(f"single level, full resolution   : {ms:8.1f} ms  -> {found}")
+
+    bench_capture()
+
+
+def bench_capture():
+    """実際の画面で、範囲を絞った撮影と画面全体の撮影にかかる時間を測ります。"""
+    from PIL import ImageGrab
+
+    size = 2 * DEFAULT_TEMPLATE_SIZE
+    region = DEFAULT_TEMPLATE_SIZE + 2 * DEFAULT_SEARCH_MARGIN
+    cases = [
+        (f"prefetch square {size}x{size}", (100, 100, 100 + size, 100 + size)),
+        (f"search region {region}x{region}", (100, 100, 100 + region, 100 + region)),
+        ("whole virtual screen", virtual_screen_bbox()),
+    ]
+    print()
+    for label, bbox in cases:
+        try:
+            ms, image = timed(grab_screen, bbox)
+            base_ms, _ = timed(ImageGrab.grab, bbox=bbox, all_screens=True)
+        except Exception as e:
+            print(f"capture {label}: skipped ({e.__class__.__name__}: {e})")
+            return
+        print(f"capture {label:28}: grab_screen {ms:7.1f} ms, ImageGrab {base_ms:7.1f} ms  {image.size}")
+
+
+if __name__ == "__main__":
+    main()
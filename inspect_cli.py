@@ -0,0 +1,97 @@
+"""Command line entry point for unattended UI element inspection.
+
+Inspects every point of a list or a grid over one window and writes one
+JSON line per point, for example::
+
+    python inspect_cli.py --window "メモ帳" --grid 20 --output notepad.jsonl
+    python inspect_cli.py --window "メモ帳" --points points.txt --relative
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from src.utils.element_inspector import INSPECTION_DEADLINE_S, ElementInspector, grid_points
+
+
+def read_points(path):
+    """座標ファイルを読み込みます。1行に ``x,y`` / ``x y`` か、``x`` と ``y`` を持つ JSON を書きます。"""
+    points = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                points.append((int(item["x"]), int(item["y"])))
+            else:
+                x, y = line.replace(",", " ").split()[:2]
+                points.append((int(x), int(y)))
+    return points
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析します。"""
+    parser = argparse.ArgumentParser(description="ウィンドウ上の座標ごとにUI要素を調べ、JSONLで出力します。")
+    parser.add_argument("--window", required=True, help="対象ウィンドウのタイトル")
+    parser.add_argument("--backend", choices=("uia", "win32"), default="uia", help="pywinauto のバックエンド")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--points", help="座標の一覧ファイル（x,y を1行に1つ、または JSONL）")
+    source.add_argument("--grid", type=int, metavar="STEP", help="ウィンドウ全体を STEP ピクセル間隔で調べる")
+    parser.add_argument("--relative", action="store_true", help="座標をウィンドウ左上からの相対座標として扱う")
+    parser.add_argument("--output", help="出力先のファイル（省略時は標準出力）")
+    parser.add_argument("--deadline", type=float, default=INSPECTION_DEADLINE_S, help="1点あたりの検査の上限時間（秒）")
+    parser.add_argument("--no-focus", action="store_true", help="検査前にウィンドウを前面に出さない")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """指定したウィンドウの座標を一括で検査し、1点につき1行の JSON を出力します。"""
+    args = parse_args(argv)
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(filename=os.path.join("logs", "app.log"), level=logging.ERROR,
+                        format='%(asctime)s %(levelname)s: %(message)s')
+
+    inspector = ElementInspector(deadline=args.deadline)
+    window = inspector.element_cache.desktop(args.backend).window(title=args.window).wrapper_object()
+    if not args.no_focus:
+        window.set_focus()
+    rect = window.rectangle()
+    if args.grid:
+        points = grid_points((rect.left, rect.top, rect.right, rect.bottom), args.grid)
+    else:
+        points = read_points(args.points)
+        if args.relative:
+            points = [(rect.left + x, rect.top + y) for x, y in points]
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    found = covered = elements = 0
+    started = time.perf_counter()
+    try:
+        for record in inspector.inspect_points(points, args.backend, top_hwnd=window.handle):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            found += record.get("found", False)
+            covered += record.get("covered", False)
+            if "strategy" in record:
+                elements += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    stats = inspector.element_cache.stats()
+    print(
+        f"{len(points)} 点を {elapsed:.1f} 秒で検査しました（{len(points) / elapsed if elapsed else 0:.1f} 点/秒）。"
+        f" 要素: {elements} 件, 見つかった点: {found}, 他のウィンドウに隠れた点: {covered},"
+        f" キャッシュ: ヒット {stats['hits']} / ミス {stats['misses']}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,11 @@
 
 import logging
 import os
-from src.gui.automation_recorder import AutomationRecorderApp
+from src.utils.startup_timing import startup_timer
+from src.utils.tracing import tracer
+
+with startup_timer.timed_import("src.gui.automation_recorder"):
+    from src.gui.automation_recorder import AutomationRecorderApp
 
 # Ensure logs directory and file exist
 os.makedirs("logs", exist_ok=True)
@@ -20,3 +24,6 @@ if __name__ == "__main__":
         app.run()
     except Exception as e:
         logging.error("An error occurred", exc_info=True)
+    finally:
+        # トレースの集計を logs/trace.json に書き出す（記録がなければ何もしない）
+        tracer.dump()
@@ -0,0 +1,47 @@
+"""Input backends that perform replayed steps."""
+
+import time
+
+
+class InputBackend:
+    """Interface for sending input events during replay.
+
+    ``perform`` receives the PyAutoGUI-style function name (``"click"``,
+    ``"write"``, ``"hotkey"``, ...) with its positional and keyword
+    arguments, so any recorded ``codegen.Step`` can be replayed.
+    """
+
+    def perform(self, name, args, kwargs):
+        """1つの操作を実行します。"""
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Sends input through ``pyautogui``."""
+
+    def __init__(self):
+        """pyautogui を読み込みます。"""
+        import pyautogui
+
+        self._pyautogui = pyautogui
+
+    def perform(self, name, args, kwargs):
+        """pyautogui の同名の関数を呼び出します。"""
+        getattr(self._pyautogui, name)(*args, **kwargs)
+
+
+class FakeBackend(InputBackend):
+    """Records performed steps in memory instead of sending input.
+
+    Each call is stored as ``(monotonic_time, name, args, kwargs)`` in
+    ``calls``, which makes the backend usable for dry runs and for checking
+    the replay schedule without touching the real mouse and keyboard.
+    """
+
+    def __init__(self):
+        """記録用のリストを用意します。"""
+        self.calls = []
+
+    def perform(self, name, args, kwargs):
+        """呼び出しを記録します。"""
+        self.calls.append((time.monotonic(), name, tuple(args), dict(kwargs)))
@@ -1,2 +1,30 @@
-"""Keyboard automation utilities (placeholder)."""
+"""Keyboard steps for the replay engine."""
 
+from ..utils.codegen import step
+
+
+def write(text):
+    """文字列入力のステップを返します。"""
+    return step("pyautogui.write", text)
+
+
+def press(key, presses=1):
+    """キー押下のステップを返します。"""
+    if presses > 1:
+        return step("pyautogui.press", key, presses=presses)
+    return step("pyautogui.press", key)
+
+
+def hotkey(*keys):
+    """ホットキーのステップを返します。"""
+    return step("pyautogui.hotkey", *keys)
+
+
+def key_down(key):
+    """キーを押し続けるステップを返します。"""
+    return step("pyautogui.keyDown", key)
+
+
+def key_up(key):
+    """キーを離すステップを返します。"""
+    return step("pyautogui.keyUp", key)
@@ -1,2 +1,37 @@
-"""Mouse automation utilities (placeholder)."""
+"""Mouse steps for the replay engine."""
 
+from ..utils.codegen import step
+
+
+def _button_kwargs(button):
+    """左ボタン以外のときだけ ``button`` 引数を返します。"""
+    return {} if button == "left" else {"button": button}
+
+
+def click(x, y, button="left", clicks=1):
+    """クリック操作のステップを返します。"""
+    if clicks == 2:
+        return step("pyautogui.doubleClick", x, y, **_button_kwargs(button))
+    return step("pyautogui.click", x, y, **_button_kwargs(button))
+
+
+def move_to(x, y, duration=0.0):
+    """カーソル移動のステップを返します。"""
+    if duration:
+        return step("pyautogui.moveTo", x, y, duration=duration)
+    return step("pyautogui.moveTo", x, y)
+
+
+def drag_to(x, y, duration=0.0, button="left"):
+    """ドラッグのステップを返します。"""
+    return step("pyautogui.dragTo", x, y, duration=duration, **_button_kwargs(button))
+
+
+def mouse_down(x, y, button="left"):
+    """ボタン押下のステップを返します。"""
+    return step("pyautogui.mouseDown", x, y, **_button_kwargs(button))
+
+
+def mouse_up(x, y, button="left"):
+    """ボタン解放のステップを返します。"""
+    return step("pyautogui.mouseUp", x, y, **_button_kwargs(button))
@@ -0,0 +1,221 @@
+"""Timing-accurate replay of recorded steps."""
+
+import logging
+import threading
+import time
+
+# 目標時刻の手前でこの時間（秒）以内になったら、sleep をやめて待ち続ける
+SPIN_THRESHOLD_S = 0.002
+MIN_SPEED = 0.5
+MAX_SPEED = 10.0
+
+STATUS_DONE = "done"
+STATUS_STOPPED = "stopped"
+STATUS_ERROR = "error"
+
+
+def _percentile(sorted_values, fraction):
+    """ソート済みの値から百分位数を返します。"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ReplayReport:
+    """Result of one replay run with per-step scheduling jitter."""
+
+    def __init__(self, status, jitters, elapsed):
+        """状態、各ステップのジッタ（秒）、所要時間（秒）を保持します。"""
+        self.status = status
+        self.jitters = jitters
+        self.elapsed = elapsed
+
+    def summary(self):
+        """ジッタの統計（ミリ秒）を辞書で返します。"""
+        ordered = sorted(abs(j) for j in self.jitters)
+        return {
+            "steps": len(self.jitters),
+            "p50_ms": _percentile(ordered, 0.5) * 1000,
+            "p95_ms": _percentile(ordered, 0.95) * 1000,
+            "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+            "elapsed_s": self.elapsed,
+        }
+
+
+class ReplayEngine:
+    """Replays ``(timestamp, step, duration)`` lists against a monotonic clock.
+
+    Every step is scheduled at an absolute deadline computed from the start
+    of the run, not relative to the previous step, so time spent inside the
+    backend or late wake-ups do not accumulate into drift. The engine sleeps
+    until shortly before each deadline and spins for the remainder.
+
+    ``speed`` scales the recorded gaps and step durations (0.5x–10x);
+    ``None`` replays as fast as possible. Replay runs on a background
+    thread and can be paused, stepped one step at a time while paused, and
+    stopped. ``on_step(index, jitter)`` and ``on_done(report)`` are called
+    on the replay thread.
+    """
+
+    def __init__(self, backend, speed=1.0, on_step=None, on_done=None):
+        """入力バックエンドと再生速度、通知先を設定します。"""
+        self.backend = backend
+        self.speed = self.clamp_speed(speed)
+        self.on_step = on_step
+        self.on_done = on_done
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._stop_event = threading.Event()
+        self._step_requests = 0
+        self._lock = threading.Lock()
+        # 一時停止と中止を、次の予定時刻を待っている再生スレッドにすぐ伝える
+        self._wake = threading.Condition()
+        self._paused_at = None
+        self._thread = None
+
+    @staticmethod
+    def clamp_speed(speed):
+        """再生速度を許容範囲に収めます（``None`` は最速）。"""
+        if speed is None:
+            return None
+        return min(MAX_SPEED, max(MIN_SPEED, float(speed)))
+
+    def start(self, timed_steps):
+        """別スレッドで再生を開始します。"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, args=(list(timed_steps),), name="ReplayEngine", daemon=True)
+        self._thread.start()
+
+    def is_running(self):
+        """再生中かどうかを返します。"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_paused(self):
+        """一時停止中かどうかを返します。"""
+        return not self._resume_event.is_set()
+
+    def pause(self):
+        """再生を一時停止します。"""
+        with self._wake:
+            if self._resume_event.is_set():
+                self._paused_at = time.monotonic()
+            self._resume_event.clear()
+            self._wake.notify_all()
+
+    def resume(self):
+        """一時停止した再生を再開します。"""
+        self._resume_event.set()
+
+    def step(self):
+        """一時停止中に、次のステップを1つだけ実行します。"""
+        with self._lock:
+            self._step_requests += 1
+
+    def stop(self):
+        """再生を中止します。"""
+        with self._wake:
+            self._stop_event.set()
+            self._resume_event.set()
+            self._wake.notify_all()
+
+    def _wait_while_paused(self):
+        """一時停止中は再開かステップ実行の指示を待ちます。ステップ実行なら ``True`` を返します。"""
+        while not self._resume_event.is_set() and not self._stop_event.is_set():
+            with self._lock:
+                if self._step_requests:
+                    self._step_requests -= 1
+                    return True
+            self._resume_event.wait(0.01)
+        return False
+
+    def _wait_until(self, deadline):
+        """目標時刻まで待ちます。
+
+        時刻になれば ``True``、中止されたら ``False``、待っている間に一時停止されたら ``None`` を返します。
+        """
+        with self._wake:
+            while True:
+                if self._stop_event.is_set():
+                    return False
+                if not self._resume_event.is_set():
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= SPIN_THRESHOLD_S:
+                    break
+                self._wake.wait(remaining - SPIN_THRESHOLD_S)
+        while time.monotonic() < deadline:
+            if self._stop_event.is_set():
+                return False
+            if not self._resume_event.is_set():
+                return None
+        return True
+
+    def _perform(self, step):
+        """ステップを速度に合わせて調整し、バックエンドで実行します。"""
+        name = step.func.rsplit(".", 1)[-1]
+        kwargs = dict(step.kwargs)
+        if "duration" in kwargs:
+            kwargs["duration"] = 0.0 if self.speed is None else kwargs["duration"] / self.speed
+        self.backend.perform(name, step.args, kwargs)
+
+    def _wait_for_step(self, started, offset, elapsed):
+        """記録上の経過時刻 ``elapsed`` のステップを実行する時刻まで待ちます。
+
+        一時停止されたら再開を待ち、止まっていた時間だけ予定全体をずらしてから待ち直します。
+        ステップ実行なら今すぐ実行する予定に組み直します。``(予定時刻, 新しい offset)`` を、
+        中止されたら ``None`` を返します。
+        """
+        while True:
+            paused_at = self._paused_at if self.is_paused() else None
+            stepped = self._wait_while_paused()
+            if self._stop_event.is_set():
+                return None
+            now = time.monotonic()
+            if self.speed is None:
+                return now, offset
+            if stepped:
+                # ステップ実行は今すぐ行い、ここから改めて一時停止したものとして扱う
+                offset += now - (started + offset + elapsed / self.speed)
+                self._paused_at = now
+                return now, offset
+            if paused_at is not None:
+                # 再生開始前からの一時停止は、開始時刻から数える
+                offset += now - max(paused_at, started)
+            deadline = started + offset + elapsed / self.speed
+            waited = self._wait_until(deadline)
+            if waited is False:
+                return None
+            if waited:
+                return deadline, offset
+
+    def run(self, timed_steps):
+        """操作列を現在のスレッドで再生し、``ReplayReport`` を返します。"""
+        jitters = []
+        status = STATUS_DONE
+        started = time.monotonic()
+        try:
+            if timed_steps:
+                first_t = timed_steps[0][0]
+                # 一時停止やステップ実行のたびに、予定全体をずらす量（秒）
+                offset = 0.0
+                for index, (t, step, _duration) in enumerate(timed_steps):
+                    scheduled = self._wait_for_step(started, offset, t - first_t)
+                    if scheduled is None:
+                        status = STATUS_STOPPED
+                        break
+                    deadline, offset = scheduled
+                    jitter = time.monotonic() - deadline
+                    self._perform(step)
+                    jitters.append(jitter)
+                    if self.on_step is not None:
+                        self.on_step(index, jitter)
+        except Exception:
+            logging.error("ReplayEngine error", exc_info=True)
+            status = STATUS_ERROR
+        report = ReplayReport(status, jitters, time.monotonic() - started)
+        if self.on_done is not None:
+            self.on_done(report)
+        return report
@@ -1,21 +1,34 @@
 """Graphical user interface for recording automation actions on Windows."""
 
+import importlib
+import logging
+import time
 import tkinter as tk
 from tkinter import ttk
-from pynput import mouse
 
-from .tabs.click_tab import ClickTab
-from .tabs.key_tab import KeyTab
-from .tabs.window_tab import WindowTab
-from .tabs.control_tab import ControlTab
-from .tabs.ui_inspector_tab import UIInspectorTab
+from ..utils.startup_timing import startup_timer
+
+# (属性名, モジュール名, クラス名, タブのタイトル)。モジュールはタブを初めて開いたときに読み込む
+TAB_SPECS = (
+    ("click_tab", "click_tab", "ClickTab", "クリック操作"),
+    ("key_tab", "key_tab", "KeyTab", "キー操作"),
+    ("window_tab", "window_tab", "WindowTab", "ウィンドウ一覧"),
+    ("control_tab", "control_tab", "ControlTab", "ウィンドウコントロール"),
+    ("ui_inspector_tab", "ui_inspector_tab", "UIInspectorTab", "UI要素インスペクタ"),
+    ("trace_tab", "trace_tab", "TraceTab", "トレース"),
+)
 
 
 class AutomationRecorderApp:
-    """Main window for recording and generating automation scripts."""
+    """Main window for recording and generating automation scripts.
+
+    Only the notebook pages are created up front. Each tab's module, and
+    with it the heavy automation libraries it needs, is imported and the
+    tab is built the first time its page is selected.
+    """
 
     def __init__(self):
-        """ウィンドウと各タブを作成し、マウス監視を開始します。"""
+        """ウィンドウと各タブのページを作成します。タブの中身は初めて選択されたときに作ります。"""
 
         self.root = tk.Tk()
         self.root.title("Automation Recorder")
@@ -28,22 +41,75 @@ class AutomationRecorderApp:
         self.root.minsize(600, 400)
 
         self.backend_var = tk.StringVar(value="win32")
+        self._window_registry = None
 
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(expand=True, fill="both")
 
-        self.click_tab = ClickTab(self)
-        self.key_tab = KeyTab(self)
-        self.window_tab = WindowTab(self)
-        self.control_tab = ControlTab(self)
-        self.ui_inspector_tab = UIInspectorTab(self)
+        # タブのページ（フレーム）→ (属性名, モジュール名, クラス名)
+        self.tab_pages = {}
+        for attr, module, class_name, title in TAB_SPECS:
+            setattr(self, attr, None)
+            page = ttk.Frame(self.notebook)
+            self.notebook.add(page, text=title)
+            self.tab_pages[str(page)] = (attr, module, class_name, page)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        self._first_paint_recorded = False
+        self.root.bind("<Map>", self._on_root_mapped, add="+")
+        startup_timer.mark("app_created")
+
+    @property
+    def window_registry(self):
+        """ウィンドウ一覧の共有レジストリを返します。初めて使われたときに監視を開始します。"""
+        if self._window_registry is None:
+            with startup_timer.timed_import("src.utils.window_registry"):
+                from ..utils.window_registry import WindowRegistry
+            self._window_registry = WindowRegistry()
+            self._window_registry.start()
+        return self._window_registry
+
+    def _on_tab_changed(self, _event):
+        """選択されたタブがまだ作られていなければ作ります。"""
+        self.build_tab(self.notebook.select())
+
+    def build_tab(self, page_name):
+        """タブのモジュールを読み込み、ページの中身を作ります。"""
+        spec = self.tab_pages.get(str(page_name))
+        if spec is None:
+            return None
+        attr, module, class_name, page = spec
+        tab = getattr(self, attr)
+        if tab is not None:
+            return tab
+        try:
+            started = time.perf_counter()
+            with startup_timer.timed_import(f"src.gui.tabs.{module}"):
+                tab_module = importlib.import_module(f".tabs.{module}", __package__)
+            tab = getattr(tab_module, class_name)(self, page)
+            setattr(self, attr, tab)
+            startup_timer.record_tab(attr, (time.perf_counter() - started) * 1000)
+            if "first_paint" in startup_timer.marks:
+                startup_timer.write(event=f"tab_built:{attr}")
+        except Exception:
+            logging.error(f"An error occurred while building the tab {attr}", exc_info=True)
+        return tab
+
+    def _on_root_mapped(self, event):
+        """ウィンドウが表示されたら、描画が終わった時点を最初の描画時刻として記録します。"""
+        if event.widget is self.root and not self._first_paint_recorded:
+            self._first_paint_recorded = True
+            self.root.after_idle(self._record_first_paint)
 
-        self.listener = mouse.Listener(on_click=self.click_tab.on_click)
-        self.listener.start()
+    def _record_first_paint(self):
+        """最初の描画までの時間を記録し、起動時間のレポートを書き出します。"""
+        startup_timer.mark("first_paint")
+        startup_timer.write()
 
     def run(self):
         """アプリケーションのメインループを開始します。"""
 
+        startup_timer.mark("mainloop")
         self.root.mainloop()
 
 
@@ -1,18 +1,50 @@
 import tkinter as tk
-from tkinter import ttk
-import pyautogui
+from tkinter import ttk, filedialog, messagebox
+import os
+import time
 import logging
+from pynput import mouse
+from ...utils.codegen import call, render_step
+from ...utils.event_timeline import EventTimeline
+from ...utils.helpers import is_own_window_active
+from ...utils.input_ingest import ClickIngestor
+from ...utils.key_names import pynput_key_name
+from ...utils.session_journal import (
+    JOURNAL_SUFFIX,
+    SessionJournal,
+    prune_journals,
+    seal_journal,
+    unfinished_journals,
+)
+from ...utils.tracing import tracer
+from ...utils.session_script import (
+    CLICK_TOLERANCE_PX,
+    DEFAULT_PATH_TOLERANCE_PX,
+    drag_to_steps,
+    timeline_to_script,
+    timeline_to_steps,
+)
+
+# フックから受け取ったクリックをメインループで取り出す間隔（ミリ秒）
+CLICK_DRAIN_INTERVAL_MS = 30
+# 再生速度の選択肢（None は最速）
+REPLAY_SPEEDS = {"0.5x": 0.5, "1x": 1.0, "2x": 2.0, "5x": 5.0, "10x": 10.0, "最速": None}
+# クリック位置の画像を保存するフォルダ
+TEMPLATE_DIR = "templates"
+# セッション記録中のスクリーンショットを保存するフォルダ
+SCREENSHOT_DIR = "screenshots"
+# 記録中のイベントを逐次書き出すジャーナルのフォルダ（異常終了からの復元用）
+JOURNAL_DIR = os.path.join("logs", "sessions")
 
 
 class ClickTab:
     """Tab for recording mouse click positions."""
 
-    def __init__(self, app):
+    def __init__(self, app, frame):
         """クリック操作用のウィジェットを準備します。"""
 
         self.app = app
-        self.frame = ttk.Frame(app.notebook)
-        app.notebook.add(self.frame, text='クリック操作')
+        self.frame = frame
 
         self.text_widget_click = tk.Text(self.frame, wrap=tk.WORD, font=("Arial", 14), height=2)
         self.text_widget_click.pack(pady=20)
@@ -29,6 +61,7 @@ class ClickTab:
             "Double Click",
             "Move to",
             "Drag and Drop",
+            "Image Click",
         )
         self.operations_menu_click.pack(pady=10)
 
@@ -42,30 +75,174 @@ class ClickTab:
         )
         self.operation_label_click.pack(pady=5)
 
+        record_frame = tk.LabelFrame(self.frame, text="セッション記録", font=("Arial", 10))
+        record_frame.pack(pady=10)
+        self.record_button = tk.Button(record_frame, text="記録開始", command=self.toggle_recording)
+        self.record_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.save_script_button = tk.Button(record_frame, text="スクリプトを保存", command=self.save_session_script)
+        self.save_script_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.record_status_label = tk.Label(record_frame, text="記録していません", font=("Arial", 10))
+        self.record_status_label.pack(side=tk.LEFT, padx=5, pady=5)
+        self.screenshot_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            record_frame, text="クリックごとにスクリーンショットを保存", variable=self.screenshot_var
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+
+        path_frame = tk.Frame(self.frame)
+        path_frame.pack(pady=5)
+        self.record_moves_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            path_frame,
+            text="マウスの移動軌跡も記録",
+            variable=self.record_moves_var,
+            command=self._on_record_moves_changed,
+        ).pack(side=tk.LEFT, padx=5)
+        tk.Label(path_frame, text="軌跡の許容誤差（px）:", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.path_tolerance_var = tk.DoubleVar(value=DEFAULT_PATH_TOLERANCE_PX)
+        tk.Spinbox(
+            path_frame, from_=0.5, to=50.0, increment=0.5, width=5, textvariable=self.path_tolerance_var
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.capture_template_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.frame,
+            text="クリック位置の画像を記録（Image Click 用）",
+            variable=self.capture_template_var,
+            command=self._on_capture_template_changed,
+        ).pack(pady=5)
+        # オンの間、クリック前の画面をテンプレート用に撮影しておく
+        self.template_prefetcher = None
+        # 直近のクリック位置のまわりを切り出した画像のパス
+        self.last_template_path = None
+
+        replay_frame = tk.LabelFrame(self.frame, text="記録の再生", font=("Arial", 10))
+        replay_frame.pack(pady=5)
+        self.replay_speed_var = tk.StringVar(value="1x")
+        ttk.Combobox(
+            replay_frame, textvariable=self.replay_speed_var, values=list(REPLAY_SPEEDS), width=6, state="readonly"
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+        self.replay_button = tk.Button(replay_frame, text="再生", command=self.toggle_replay)
+        self.replay_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.pause_button = tk.Button(replay_frame, text="一時停止", command=self.toggle_replay_pause, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.step_button = tk.Button(replay_frame, text="1ステップ", command=self.step_replay, state=tk.DISABLED)
+        self.step_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.replay_status_label = tk.Label(replay_frame, text="", font=("Arial", 10))
+        self.replay_status_label.pack(side=tk.LEFT, padx=5, pady=5)
+        self.replay_engine = None
+
         self.screen_x = None
         self.screen_y = None
+        # 直近のドラッグ（ボタン名と押下から解放までの軌跡）
+        self.last_drag = None
+        self._drag_path = None
+        self._drag_button = None
+
+        self.timeline = EventTimeline()
+        self.recording = False
+        self._recording_started = 0.0
+        self.key_listener = None
+        self._record_status_after_id = None
+        self.screenshot_pipeline = None
+
+        self.ingestor = ClickIngestor()
+        app.root.bind("<Configure>", self._on_root_configure, add="+")
+        self._drain_click_events()
 
+        # マウスフックはこのタブを開いたときに初めて開始する
+        self.listener = mouse.Listener(on_click=self.on_click, on_move=self.on_move)
+        self.listener.daemon = True
+        self.listener.start()
+
+        # 前回の記録が異常終了していたら、画面の表示後に復元を提案する
+        app.root.after_idle(self.recover_unfinished_session)
+
+    @tracer.traced("recorder.click_hook")
     def on_click(self, x, y, button, pressed):
-        """ウィンドウ外でのマウスクリック位置を取得して表示します。"""
+        """マウスフックのコールバック。イベントをキューに入れるだけで、Tk には触れません。"""
+        self.ingestor.on_click(x, y, button, pressed)
+        prefetcher = self.template_prefetcher
+        if prefetcher is not None:
+            prefetcher.on_click(x, y, pressed)
+
+    def on_move(self, x, y):
+        """マウス移動フックのコールバック。必要なときだけキューに入れます。"""
+        self.ingestor.on_move(x, y)
+        prefetcher = self.template_prefetcher
+        if prefetcher is not None:
+            prefetcher.on_move(x, y)
+
+    def _on_record_moves_changed(self):
+        """移動軌跡を記録するかどうかをフック側に反映します。"""
+        self.ingestor.capture_moves = self.recording and self.record_moves_var.get()
+
+    def _on_capture_template_changed(self):
+        """クリック位置の画像の記録をオンにしたら、クリック前の画面の撮影を始めます。"""
         try:
-            if pressed:
-                self.app.root.update_idletasks()
-                screen_x, screen_y = pyautogui.position()
-                if not (
-                    self.app.root.winfo_rootx()
-                    <= screen_x
-                    <= self.app.root.winfo_rootx() + self.app.root.winfo_width()
-                    and self.app.root.winfo_rooty()
-                    <= screen_y
-                    <= self.app.root.winfo_rooty() + self.app.root.winfo_height()
-                ):
-                    self.screen_x, self.screen_y = screen_x, screen_y
-                    self.text_widget_click.config(state=tk.NORMAL)
-                    self.text_widget_click.delete("1.0", tk.END)
-                    self.text_widget_click.insert(tk.END, f"Clicked at: ({screen_x}, {screen_y})")
-                    self.text_widget_click.config(state=tk.DISABLED)
+            if self.capture_template_var.get():
+                if self.template_prefetcher is None:
+                    from ...utils.template_capture import TemplatePrefetcher
+
+                    self.template_prefetcher = TemplatePrefetcher()
+            elif self.template_prefetcher is not None:
+                self.template_prefetcher.close()
+                self.template_prefetcher = None
+        except Exception:
+            logging.error("An error occurred while starting the template capture", exc_info=True)
+
+    def _path_tolerance(self):
+        """入力された軌跡の許容誤差を返します。"""
+        try:
+            return max(0.0, float(self.path_tolerance_var.get()))
+        except (tk.TclError, ValueError):
+            return DEFAULT_PATH_TOLERANCE_PX
+
+    def _on_root_configure(self, event):
+        """アプリのウィンドウが移動・リサイズされたら、フックが使う位置情報を更新します。"""
+        if event.widget is self.app.root:
+            root = self.app.root
+            self.ingestor.update_geometry(root.winfo_rootx(), root.winfo_rooty(), root.winfo_width(), root.winfo_height())
+
+    @tracer.traced("recorder.click_drain")
+    def _drain_click_events(self):
+        """キューにたまったクリックを取り出し、記録と表示を行います（メインループ上で定期実行）。"""
+        try:
+            last_press = None
+            for x, y, button, pressed, timestamp in self.ingestor.drain():
+                recording = self.recording and timestamp >= self._recording_started
+                if button is None:
+                    # マウス移動
+                    if recording and self.record_moves_var.get():
+                        self.timeline.append_move(x, y, timestamp)
+                    if self._drag_path is not None:
+                        self._drag_path.append((x, y, timestamp))
+                    continue
+                if recording:
+                    self.timeline.append_mouse(button.name, pressed, x, y, timestamp)
+                    if pressed and self.screenshot_pipeline is not None:
+                        self.screenshot_pipeline.request(len(self.timeline) - 1, x, y, timestamp)
+                if pressed:
+                    last_press = (x, y, timestamp)
+                    self._drag_path = [(x, y, timestamp)]
+                    self._drag_button = button.name
+                elif self._drag_path is not None and button.name == self._drag_button:
+                    start_x, start_y, _ = self._drag_path[0]
+                    if max(abs(x - start_x), abs(y - start_y)) > CLICK_TOLERANCE_PX:
+                        self._drag_path.append((x, y, timestamp))
+                        self.last_drag = (self._drag_button, self._drag_path)
+                    self._drag_path = None
+            if last_press is not None:
+                self.screen_x, self.screen_y, pressed_at = last_press
+                if self.capture_template_var.get():
+                    self.save_click_template(self.screen_x, self.screen_y, pressed_at)
+                self.text_widget_click.config(state=tk.NORMAL)
+                self.text_widget_click.delete("1.0", tk.END)
+                self.text_widget_click.insert(tk.END, f"Clicked at: ({self.screen_x}, {self.screen_y})")
+                self.text_widget_click.config(state=tk.DISABLED)
         except Exception:
             logging.error("Error detecting click position", exc_info=True)
+        finally:
+            self.app.root.after(CLICK_DRAIN_INTERVAL_MS, self._drain_click_events)
 
     def generate_click_code(self):
         """選択した操作に対応するPyAutoGUIコードを生成します。"""
@@ -76,15 +253,23 @@ class ClickTab:
 
             code = ""
             if operation == "Left Click":
-                code = f"pyautogui.click({self.screen_x}, {self.screen_y})"
+                code = call("pyautogui.click", self.screen_x, self.screen_y)
             elif operation == "Right Click":
-                code = f"pyautogui.rightClick({self.screen_x}, {self.screen_y})"
+                code = call("pyautogui.rightClick", self.screen_x, self.screen_y)
             elif operation == "Double Click":
-                code = f"pyautogui.doubleClick({self.screen_x}, {self.screen_y})"
+                code = call("pyautogui.doubleClick", self.screen_x, self.screen_y)
             elif operation == "Move to":
-                code = f"pyautogui.moveTo({self.screen_x}, {self.screen_y})"
+                code = call("pyautogui.moveTo", self.screen_x, self.screen_y)
+            elif operation == "Image Click":
+                code = self.generate_image_click_code()
             elif operation == "Drag and Drop":
-                code = f"pyautogui.dragTo({self.screen_x}, {self.screen_y}, duration=1)"
+                if self.last_drag is not None:
+                    # 記録したドラッグの始点から、簡略化した軌跡どおりにドラッグする
+                    button, path = self.last_drag
+                    steps = drag_to_steps(path, button, self._path_tolerance())
+                    code = "\n".join(render_step(step) for _, step, _ in steps)
+                else:
+                    code = call("pyautogui.dragTo", self.screen_x, self.screen_y, duration=1)
 
             self.text_widget_click.config(state=tk.NORMAL)
             self.text_widget_click.delete("1.0", tk.END)
@@ -94,3 +279,220 @@ class ClickTab:
             self.app.root.clipboard_append(code)
         except Exception:
             logging.error("An error occurred while generating the click code", exc_info=True)
+
+    def save_click_template(self, x, y, pressed_at):
+        """クリック位置のまわりの画像を保存し、そのパスを記録します。
+
+        押す前の見た目を残すため、できるだけクリック直前に撮影しておいた画像から切り出します。
+        """
+        try:
+            os.makedirs(TEMPLATE_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(TEMPLATE_DIR, f"click_{stamp}_{x}_{y}.png")
+            if self.template_prefetcher is not None:
+                image = self.template_prefetcher.template(x, y, pressed_at)
+            else:
+                from ...utils.template_match import DEFAULT_TEMPLATE_SIZE, capture_template
+
+                image = capture_template(x, y, DEFAULT_TEMPLATE_SIZE)
+            image.save(path)
+            self.last_template_path = path
+        except Exception:
+            self.last_template_path = None
+            logging.error("An error occurred while capturing the click template", exc_info=True)
+
+    def generate_image_click_code(self):
+        """記録した画像を画面上で探してクリックするコードを返します。見つからなければ記録した座標をクリックします。"""
+        if self.last_template_path is None:
+            return "# 「クリック位置の画像を記録」をオンにしてからクリックしてください"
+        locate = call(
+            "template_match.locate_on_screen",
+            os.path.abspath(self.last_template_path),
+            near=(self.screen_x, self.screen_y),
+        )
+        return "\n".join([
+            "# src/utils/template_match.py をスクリプトと同じフォルダにコピーして使います",
+            "import template_match",
+            f"position = {locate} or {(self.screen_x, self.screen_y)!r}",
+            "pyautogui.click(*position)",
+        ])
+
+    def toggle_recording(self):
+        """セッション記録の開始・停止を切り替えます。"""
+        try:
+            if self.recording:
+                self.recording = False
+                self._on_record_moves_changed()
+                if self.key_listener is not None:
+                    self.key_listener.stop()
+                    self.key_listener = None
+                if self.screenshot_pipeline is not None:
+                    self.screenshot_pipeline.close()
+                journal, self.timeline.journal = self.timeline.journal, None
+                if journal is not None:
+                    journal.close()
+                self.record_button.config(text="記録開始")
+                self._update_record_status()
+            else:
+                self.timeline.clear()
+                self.screenshot_pipeline = None
+                if self.screenshot_var.get():
+                    from ...utils.screenshot_pipeline import ScreenshotPipeline
+
+                    session_dir = os.path.join(SCREENSHOT_DIR, time.strftime("session_%Y%m%d_%H%M%S"))
+                    self.screenshot_pipeline = ScreenshotPipeline(session_dir)
+                prune_journals(JOURNAL_DIR)
+                journal_path = os.path.join(JOURNAL_DIR, time.strftime("session_%Y%m%d_%H%M%S") + JOURNAL_SUFFIX)
+                self.timeline.journal = SessionJournal(journal_path)
+                from pynput import keyboard
+
+                self.key_listener = keyboard.Listener(on_press=self.on_key_press, on_release=self.on_key_release)
+                self.key_listener.daemon = True
+                self.key_listener.start()
+                self._recording_started = time.monotonic()
+                self.recording = True
+                self._on_record_moves_changed()
+                self.record_button.config(text="記録停止")
+                self._update_record_status()
+        except Exception:
+            logging.error("An error occurred while toggling the session recording", exc_info=True)
+
+    def recover_unfinished_session(self):
+        """正常に終了しなかった記録のジャーナルがあれば、最新のものを復元するか確認します。"""
+        try:
+            unfinished = unfinished_journals(JOURNAL_DIR)
+            if not unfinished:
+                return
+            path, contents = unfinished[-1]
+            if contents.events and not self.recording:
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(contents.started or 0))
+                if messagebox.askyesno(
+                    "記録の復元",
+                    f"{started} に開始した記録が正常に終了していません。\n"
+                    f"最後に保存された {len(contents.events)} イベントを復元しますか？",
+                ):
+                    self.timeline.clear()
+                    for event in contents.events:
+                        self.timeline.append(*event)
+                    self._update_record_status()
+            # 復元したか、不要と判断したジャーナルは次回から対象にしない
+            for path, contents in unfinished:
+                seal_journal(path, contents.valid_bytes)
+        except Exception:
+            logging.error("An error occurred while recovering the recording session", exc_info=True)
+
+    def on_key_press(self, key):
+        """記録中のキー押下をタイムラインに追加します。"""
+        self._record_key(key, True)
+
+    def on_key_release(self, key):
+        """記録中のキー解放をタイムラインに追加します。"""
+        self._record_key(key, False)
+
+    def _record_key(self, key, pressed):
+        """他のアプリへのキー入力だけを記録します。"""
+        try:
+            if not self.recording or is_own_window_active():
+                return
+            name = pynput_key_name(key)
+            if name is not None:
+                self.timeline.append_key(name, pressed, time.monotonic())
+        except Exception:
+            logging.error("Error recording key event", exc_info=True)
+
+    def _update_record_status(self):
+        """記録件数と使用メモリを表示し、記録中は定期的に更新します。"""
+        if self._record_status_after_id is not None:
+            self.app.root.after_cancel(self._record_status_after_id)
+            self._record_status_after_id = None
+        count = len(self.timeline)
+        size_kb = self.timeline.nbytes() / 1024
+        shots = ""
+        if self.screenshot_pipeline is not None:
+            stats = self.screenshot_pipeline.stats()
+            shots = (
+                f" / 画像 {stats['captured']} 枚 (重複 {stats['duplicates']}, 破棄 {stats['dropped']},"
+                f" {stats['disk_bytes'] / (1024 * 1024):.1f} MB)"
+            )
+        if self.recording:
+            self.record_status_label.config(text=f"記録中: {count} イベント ({size_kb:.1f} KB){shots}")
+            self._record_status_after_id = self.app.root.after(500, self._update_record_status)
+        else:
+            self.record_status_label.config(text=f"記録済み: {count} イベント ({size_kb:.1f} KB){shots}")
+
+    def save_session_script(self):
+        """記録したセッション全体を1本のPyAutoGUIスクリプトとして保存します。"""
+        try:
+            if not len(self.timeline):
+                return
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".py",
+                filetypes=[("Python files", "*.py"), ("All files", "*.*")],
+            )
+            if file_path:
+                with open(file_path, "w", encoding="utf-8") as file:
+                    file.write(timeline_to_script(self.timeline, self._path_tolerance()))
+        except Exception:
+            logging.error("An error occurred while saving the session script", exc_info=True)
+
+    def toggle_replay(self):
+        """記録したセッションの再生を開始・中止します。"""
+        try:
+            if self.replay_engine is not None and self.replay_engine.is_running():
+                self.replay_engine.stop()
+                return
+            if self.recording or not len(self.timeline):
+                return
+            from ...automation.backends import PyAutoGUIBackend
+            from ...automation.replay import ReplayEngine
+
+            steps = timeline_to_steps(self.timeline, self._path_tolerance())
+            self.replay_engine = ReplayEngine(
+                PyAutoGUIBackend(),
+                REPLAY_SPEEDS.get(self.replay_speed_var.get(), 1.0),
+                on_step=lambda index, jitter: self.app.root.after(0, self._on_replay_step, index, len(steps)),
+                on_done=lambda report: self.app.root.after(0, self._on_replay_done, report),
+            )
+            self.replay_button.config(text="中止")
+            self.pause_button.config(text="一時停止", state=tk.NORMAL)
+            self.step_button.config(state=tk.DISABLED)
+            self.replay_engine.start(steps)
+        except Exception:
+            logging.error("An error occurred while starting the replay", exc_info=True)
+
+    def toggle_replay_pause(self):
+        """再生の一時停止と再開を切り替えます。"""
+        engine = self.replay_engine
+        if engine is None or not engine.is_running():
+            return
+        if engine.is_paused():
+            engine.resume()
+            self.pause_button.config(text="一時停止")
+            self.step_button.config(state=tk.DISABLED)
+        else:
+            engine.pause()
+            self.pause_button.config(text="再開")
+            self.step_button.config(state=tk.NORMAL)
+
+    def step_replay(self):
+        """一時停止中の再生を1ステップだけ進めます。"""
+        if self.replay_engine is not None and self.replay_engine.is_paused():
+            self.replay_engine.step()
+
+    def _on_replay_step(self, index, total):
+        """再生の進み具合を表示します。"""
+        self.replay_status_label.config(text=f"再生中: {index + 1} / {total}")
+
+    def _on_replay_done(self, report):
+        """再生結果と、スケジュールからのずれ（ジッタ）を表示します。"""
+        summary = report.summary()
+        state = {"done": "再生完了", "stopped": "中止しました"}.get(report.status, "エラーが発生しました")
+        self.replay_status_label.config(
+            text=(
+                f"{state}: {summary['steps']} 操作, ジッタ p50 {summary['p50_ms']:.1f} ms"
+                f" / p95 {summary['p95_ms']:.1f} ms / 最大 {summary['max_ms']:.1f} ms"
+            )
+        )
+        self.replay_button.config(text="再生")
+        self.pause_button.config(text="一時停止", state=tk.DISABLED)
+        self.step_button.config(state=tk.DISABLED)
@@ -1,21 +1,30 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import logging
-import io
-from contextlib import redirect_stdout
-import pygetwindow as gw
-from pywinauto.application import Application
+import queue
+import threading
+from ...utils.control_dump import ControlDumpWorker
+from ...utils.control_index import ControlIndex
+from ...utils.control_tree import ControlTreeLoader
+from ...utils.locator_profiler import profile_in_background
+from ..widgets.virtual_text import VirtualTextView
+
+# レジストリの差分キューを確認する間隔（ミリ秒）
+WINDOW_DRAIN_INTERVAL_MS = 100
+# ツリー表示で未取得の子要素の代わりに置く項目のiid接尾辞
+TREE_PLACEHOLDER_SUFFIX = "::placeholder"
+# 絞り込み結果のリストに表示する最大件数
+MAX_FILTER_RESULTS = 1000
 
 
 class ControlTab:
     """Tab for listing and saving window controls."""
 
-    def __init__(self, app):
+    def __init__(self, app, frame):
         """ウィンドウコントロール取得タブを初期化します。"""
 
         self.app = app
-        self.frame = ttk.Frame(app.notebook)
-        app.notebook.add(self.frame, text='ウィンドウコントロール')
+        self.frame = frame
 
         self.update_windows_button = tk.Button(self.frame, text="ウィンドウリストを更新", command=self.update_window_list)
         self.update_windows_button.pack(pady=10)
@@ -29,67 +38,524 @@ class ControlTab:
         tk.Radiobutton(backend_frame, text="win32", variable=app.backend_var, value="win32").pack(side=tk.LEFT, padx=10)
         tk.Radiobutton(backend_frame, text="uia", variable=app.backend_var, value="uia").pack(side=tk.LEFT, padx=10)
 
-        self.get_control_button = tk.Button(self.frame, text="コントロールを取得", command=self.get_window_controls)
-        self.get_control_button.pack(pady=10)
+        view_mode_frame = tk.LabelFrame(self.frame, text="表示形式", font=("Arial", 10))
+        view_mode_frame.pack(pady=5)
+        self.view_mode_var = tk.StringVar(value="text")
+        tk.Radiobutton(
+            view_mode_frame, text="テキスト", variable=self.view_mode_var, value="text", command=self.switch_view_mode
+        ).pack(side=tk.LEFT, padx=10)
+        tk.Radiobutton(
+            view_mode_frame, text="ツリー", variable=self.view_mode_var, value="tree", command=self.switch_view_mode
+        ).pack(side=tk.LEFT, padx=10)
+
+        dump_frame = tk.Frame(self.frame)
+        dump_frame.pack(pady=10)
+        self.get_control_button = tk.Button(dump_frame, text="コントロールを取得", command=self.get_window_controls)
+        self.get_control_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button_control = tk.Button(
+            dump_frame, text="キャンセル", command=self.cancel_control_dump, state=tk.DISABLED
+        )
+        self.cancel_button_control.pack(side=tk.LEFT, padx=5)
+
+        self.progress_label_control = tk.Label(self.frame, text="", font=("Arial", 10))
+        self.progress_label_control.pack()
+
+        self.text_view_frame = tk.Frame(self.frame)
+        self.text_view_frame.pack(fill="both", expand=True)
+
+        filter_frame = tk.Frame(self.text_view_frame)
+        filter_frame.pack(fill="x", padx=10)
+        tk.Label(filter_frame, text="絞り込み:", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var, width=40)
+        self.filter_entry.pack(side=tk.LEFT, padx=5)
+        self.filter_status = tk.Label(filter_frame, text="", font=("Arial", 10))
+        self.filter_status.pack(side=tk.LEFT, padx=5)
+        self.filter_var.trace_add("write", lambda *_: self.apply_control_filter())
+        self.filter_entry.bind("<Return>", lambda e: self._jump_to_filter_result(0))
+        self.filter_entry.bind("<Down>", lambda e: self._focus_filter_results())
+
+        results_frame = tk.Frame(self.text_view_frame)
+        results_frame.pack(fill="x", padx=10)
+        self.filter_results = tk.Listbox(results_frame, height=6, font=("Arial", 10), activestyle="none")
+        results_scroll = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.filter_results.yview)
+        self.filter_results.configure(yscrollcommand=results_scroll.set)
+        self.filter_results.pack(side=tk.LEFT, fill="x", expand=True)
+        results_scroll.pack(side=tk.RIGHT, fill="y")
+        self.filter_results.bind("<<ListboxSelect>>", self._on_filter_result_selected)
+
+        # 数MBのダンプでも重くならないよう、表示範囲の行だけを描画するビューアを使う
+        self.text_widget_control = VirtualTextView(self.text_view_frame, font=("Arial", 14), height=14)
+        self.text_widget_control.pack(pady=20, padx=10, fill="both", expand=True)
+
+        save_frame = tk.Frame(self.text_view_frame)
+        save_frame.pack(pady=10)
+        self.save_button_control = tk.Button(save_frame, text="コントロールを保存", command=self.save_controls_to_file)
+        self.save_button_control.pack(side=tk.LEFT, padx=5)
+        self.stream_save_button_control = tk.Button(
+            save_frame, text="直接ファイルに保存", command=self.stream_controls_to_file
+        )
+        self.stream_save_button_control.pack(side=tk.LEFT, padx=5)
+        tk.Button(save_frame, text="保存したファイルを開く", command=self.open_controls_file).pack(side=tk.LEFT, padx=5)
+        self.profile_button_control = tk.Button(
+            save_frame, text="選択範囲のロケーターを計測", command=self.profile_selected_locators
+        )
+        self.profile_button_control.pack(side=tk.LEFT, padx=5)
+
+        self.tree_view_frame = tk.Frame(self.frame)
+        tree_frame = tk.Frame(self.tree_view_frame)
+        tree_frame.pack(pady=20, fill="both", expand=True)
+        self.tree_control = ttk.Treeview(
+            tree_frame, columns=("control_type", "automation_id", "rect"), height=14
+        )
+        self.tree_control.heading("#0", text="タイトル")
+        self.tree_control.heading("control_type", text="コントロールタイプ")
+        self.tree_control.heading("automation_id", text="オートメーションID")
+        self.tree_control.heading("rect", text="矩形")
+        self.tree_control.column("#0", width=320)
+        self.tree_control.column("control_type", width=140)
+        self.tree_control.column("automation_id", width=180)
+        self.tree_control.column("rect", width=200)
+        tree_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree_control.yview)
+        self.tree_control.configure(yscrollcommand=tree_scroll.set)
+        self.tree_control.pack(side=tk.LEFT, fill="both", expand=True)
+        tree_scroll.pack(side=tk.RIGHT, fill="y")
+        self.tree_control.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.tree_control.bind("<Double-Button-1>", self._on_tree_double_click)
 
-        self.text_widget_control = tk.Text(self.frame, wrap=tk.WORD, font=("Arial", 14), height=14)
-        self.text_widget_control.pack(pady=20)
+        export_frame = tk.Frame(self.tree_view_frame)
+        export_frame.pack(pady=10)
+        tk.Button(
+            export_frame, text="選択したノードをJSONで出力", command=lambda: self.export_selected_subtree("json")
+        ).pack(side=tk.LEFT, padx=5)
+        tk.Button(
+            export_frame, text="選択したノードをJSONLで出力", command=lambda: self.export_selected_subtree("jsonl")
+        ).pack(side=tk.LEFT, padx=5)
 
-        self.save_button_control = tk.Button(self.frame, text="コントロールを保存", command=self.save_controls_to_file)
-        self.save_button_control.pack(pady=10)
+        # ドロップダウンの各項目に対応するウィンドウハンドル（項目と同じ順序）
+        self.menu_hwnds = []
+        self.window_changes = queue.Queue()
+        snapshot = app.window_registry.subscribe(self._on_windows_changed)
+        self.apply_window_changes(snapshot, [], [])
+        self._drain_window_changes()
+
+        self.dump_worker = None
+        self.tree_loader = ControlTreeLoader(app.root)
+        self.tree_nodes = {}
+        self.tree_loaded = set()
+
+        # 表示中のダンプの索引。ダンプが変わるたびに作り直す
+        self.control_index = None
+        self.filter_matches = []
+        self._index_generation = 0
 
     def update_window_list(self):
-        """現在開いているウィンドウのリストを更新します。"""
+        """ウィンドウ一覧を列挙し直し、変化した項目だけを更新します。"""
+        try:
+            self.app.window_registry.refresh()
+        except Exception:
+            logging.error("An error occurred while updating the window list", exc_info=True)
+
+    def _on_windows_changed(self, added, removed, changed):
+        """レジストリからの差分をキューに積みます（Tk は呼び出しません）。"""
+        self.window_changes.put((added, removed, changed))
+
+    def _drain_window_changes(self):
+        """キューに溜まった差分をメインループで反映します。"""
+        try:
+            while True:
+                self.apply_window_changes(*self.window_changes.get_nowait())
+        except queue.Empty:
+            pass
+        finally:
+            self.app.root.after(WINDOW_DRAIN_INTERVAL_MS, self._drain_window_changes)
+
+    def apply_window_changes(self, added, removed, changed):
+        """ウィンドウの追加・削除・タイトル変更をドロップダウンに反映します。"""
         try:
-            windows = [w for w in gw.getAllTitles() if w.strip()]
             menu = self.window_list_menu["menu"]
-            menu.delete(0, "end")
-            for window in windows:
-                menu.add_command(label=window, command=lambda value=window: self.window_list_var.set(value))
-            if windows:
-                self.window_list_var.set(windows[0])
+            if not self.menu_hwnds and not self.window_list_var.get():
+                # 初期状態の空項目を取り除く
+                menu.delete(0, "end")
+            for info in removed:
+                if info.hwnd in self.menu_hwnds:
+                    index = self.menu_hwnds.index(info.hwnd)
+                    menu.delete(index)
+                    del self.menu_hwnds[index]
+            for info in changed:
+                if info.hwnd in self.menu_hwnds:
+                    menu.entryconfigure(
+                        self.menu_hwnds.index(info.hwnd),
+                        label=info.title,
+                        command=lambda value=info.title: self.window_list_var.set(value),
+                    )
+                else:
+                    added = list(added) + [info]
+            for info in added:
+                menu.add_command(label=info.title, command=lambda value=info.title: self.window_list_var.set(value))
+                self.menu_hwnds.append(info.hwnd)
+            if self.menu_hwnds and not self.window_list_var.get():
+                self.window_list_var.set(menu.entrycget(0, "label"))
         except Exception:
             logging.error("An error occurred while updating the window list", exc_info=True)
 
+    def switch_view_mode(self):
+        """テキスト表示とツリー表示を切り替えます。"""
+        if self.view_mode_var.get() == "tree":
+            self.text_view_frame.pack_forget()
+            self.tree_view_frame.pack(fill="both", expand=True)
+        else:
+            self.tree_view_frame.pack_forget()
+            self.text_view_frame.pack(fill="both", expand=True)
+
     def get_window_controls(self):
-        """選択されたウィンドウからコントロール情報を取得して表示します。"""
+        """選択されたウィンドウのコントロール情報をバックグラウンドで取得し、順次表示します。"""
+        if self.view_mode_var.get() == "tree":
+            self.load_control_tree()
+            return
+
         # Always clear the text widget when attempting to get controls
-        self.text_widget_control.config(state=tk.NORMAL)
-        self.text_widget_control.delete("1.0", tk.END)
-        self.text_widget_control.config(state=tk.DISABLED)
+        self.text_widget_control.clear()
+        self._invalidate_control_index()
 
         try:
             selected_window = self.window_list_var.get()
-            if not selected_window:
+            if not selected_window or self.dump_worker is not None:
                 return
-            backend = self.app.backend_var.get()
-            app = Application(backend=backend).connect(title=selected_window)
-            window = app.window(title=selected_window)
-            f = io.StringIO()
-            with redirect_stdout(f):
-                window.print_control_identifiers()
-            output = f.getvalue()
-            self.text_widget_control.config(state=tk.NORMAL)
-            self.text_widget_control.insert(tk.END, output)
-            self.text_widget_control.config(state=tk.DISABLED)
+            self._start_dump(ControlDumpWorker(
+                self.app.root,
+                selected_window,
+                self.app.backend_var.get(),
+                on_done=self._on_dump_done,
+                on_chunk=self._append_control_chunk,
+            ))
         except Exception:
             logging.error("An error occurred while getting window controls", exc_info=True)
-            self.text_widget_control.config(state=tk.NORMAL)
-            self.text_widget_control.delete("1.0", tk.END)
-            self.text_widget_control.insert(tk.END, "コントロールを取得できません")
-            self.text_widget_control.config(state=tk.DISABLED)
+            self._show_control_error()
+
+    def stream_controls_to_file(self):
+        """選択されたウィンドウのコントロール情報を、画面に表示せず直接ファイルへ書き出します。"""
+        try:
+            selected_window = self.window_list_var.get()
+            if not selected_window or self.dump_worker is not None:
+                return
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".txt",
+                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            )
+            if not file_path:
+                return
+            self._start_dump(ControlDumpWorker(
+                self.app.root,
+                selected_window,
+                self.app.backend_var.get(),
+                on_done=self._on_dump_done,
+                on_progress=self._on_dump_progress,
+                file_path=file_path,
+            ))
+        except Exception:
+            logging.error("An error occurred while saving controls to file", exc_info=True)
+
+    def cancel_control_dump(self):
+        """実行中のコントロール取得を中止します。"""
+        if self.dump_worker is not None:
+            self.dump_worker.cancel()
+            self.progress_label_control.config(text="キャンセルしています...")
+
+    def _start_dump(self, worker):
+        """ダンプを開始し、ボタンの状態を切り替えます。"""
+        self.dump_worker = worker
+        self._dump_lines = 0
+        self.get_control_button.config(state=tk.DISABLED)
+        self.stream_save_button_control.config(state=tk.DISABLED)
+        self.cancel_button_control.config(state=tk.NORMAL)
+        self.progress_label_control.config(text="取得中...")
+        worker.start()
+
+    def _append_control_chunk(self, chunk):
+        """受信したダンプの一部をテキストウィジェットの末尾に追加します。"""
+        self.text_widget_control.append(chunk)
+        self._dump_lines += chunk.count("\n")
+        self.progress_label_control.config(text=f"取得中... {self._dump_lines} 行")
+
+    def _on_dump_progress(self, chars, lines):
+        """ファイルへの書き出し状況を表示します。"""
+        self.progress_label_control.config(text=f"保存中... {lines} 行 ({chars // 1024} KB)")
+
+    def _on_dump_done(self, status, chars, lines):
+        """ダンプ終了時に結果を表示し、ボタンの状態を戻します。"""
+        to_file = self.dump_worker.file_path is not None
+        self.dump_worker = None
+        self.get_control_button.config(state=tk.NORMAL)
+        self.stream_save_button_control.config(state=tk.NORMAL)
+        self.cancel_button_control.config(state=tk.DISABLED)
+        if status == "error":
+            if to_file:
+                self.progress_label_control.config(text="保存に失敗しました")
+            else:
+                self.progress_label_control.config(text="")
+                self._show_control_error()
+        elif status == "cancelled":
+            self.progress_label_control.config(text=f"キャンセルしました（{lines} 行まで取得）")
+        else:
+            destination = "保存" if to_file else "取得"
+            self.progress_label_control.config(text=f"{destination}完了: {lines} 行")
+        if not to_file and status != "error":
+            self.build_control_index()
+
+    def _show_control_error(self):
+        """コントロールを取得できなかったことを表示します。"""
+        self.text_widget_control.set_text("コントロールを取得できません")
+
+    def load_control_tree(self):
+        """選択されたウィンドウの最上位だけを取得し、ツリーに表示します。"""
+        self.tree_control.delete(*self.tree_control.get_children())
+        self.tree_nodes.clear()
+        self.tree_loaded.clear()
+        selected_window = self.window_list_var.get()
+        if not selected_window:
+            return
+        self.progress_label_control.config(text="取得中...")
+        self.tree_loader.load_window(
+            selected_window, self.app.backend_var.get(), self._on_tree_root_loaded, self._on_tree_error
+        )
+
+    def _insert_tree_node(self, parent, wrapper, node):
+        """ノードを追加し、子要素は展開時に取得するよう仮の項目を置きます。"""
+        rect = node["rect"]
+        iid = self.tree_control.insert(
+            parent,
+            tk.END,
+            text=node["title"] or f"({node['class_name'] or '無題'})",
+            values=(node["control_type"], node["automation_id"], str(tuple(rect)) if rect else ""),
+        )
+        self.tree_nodes[iid] = (wrapper, node)
+        self.tree_control.insert(iid, tk.END, iid=iid + TREE_PLACEHOLDER_SUFFIX, text="読み込み中...")
+        return iid
+
+    def _on_tree_root_loaded(self, result):
+        """ルート要素を表示し、その直下の子要素を取得します。"""
+        wrapper, node = result
+        iid = self._insert_tree_node("", wrapper, node)
+        self.tree_control.item(iid, open=True)
+        self._load_tree_children(iid)
+
+    def _on_tree_open(self, _event):
+        """ノードが初めて展開されたときに子要素を取得します。"""
+        iid = self.tree_control.focus()
+        if iid and iid not in self.tree_loaded and iid in self.tree_nodes:
+            self._load_tree_children(iid)
+
+    def _on_tree_double_click(self, _event):
+        """取得に失敗した子要素の行をダブルクリックしたら、取得し直します。"""
+        iid = self.tree_control.focus()
+        if iid.endswith(TREE_PLACEHOLDER_SUFFIX):
+            parent = self.tree_control.parent(iid)
+            if parent not in self.tree_loaded and parent in self.tree_nodes:
+                self._load_tree_children(parent)
+                return "break"
+
+    def _load_tree_children(self, iid):
+        """ノードの直下の子要素をバックグラウンドで取得します。"""
+        self.tree_loaded.add(iid)
+        wrapper, _ = self.tree_nodes[iid]
+        placeholder = iid + TREE_PLACEHOLDER_SUFFIX
+        if self.tree_control.exists(placeholder):
+            self.tree_control.item(placeholder, text="読み込み中...")
+        self.progress_label_control.config(text="取得中...")
+        self.tree_loader.load_children(
+            wrapper,
+            lambda children: self._on_tree_children_loaded(iid, children),
+            lambda error: self._on_tree_children_error(iid, error),
+        )
+
+    def _on_tree_children_loaded(self, iid, children):
+        """取得した子要素をツリーに追加します。"""
+        if not self.tree_control.exists(iid):
+            return
+        placeholder = iid + TREE_PLACEHOLDER_SUFFIX
+        if self.tree_control.exists(placeholder):
+            self.tree_control.delete(placeholder)
+        for wrapper, node in children:
+            self._insert_tree_node(iid, wrapper, node)
+        self.progress_label_control.config(text=f"{len(children)} 件の子要素を取得しました")
+
+    def _on_tree_children_error(self, iid, error):
+        """子要素を取得できなかったノードを、もう一度取得できる状態に戻します。"""
+        self.tree_loaded.discard(iid)
+        placeholder = iid + TREE_PLACEHOLDER_SUFFIX
+        if self.tree_control.exists(placeholder):
+            self.tree_control.item(placeholder, text="取得できませんでした（ダブルクリックで再試行）")
+        self._on_tree_error(error)
+
+    def _on_tree_error(self, _error):
+        """ツリーの取得に失敗したことを表示します。"""
+        self.progress_label_control.config(text="コントロールを取得できません")
+
+    def export_selected_subtree(self, fmt):
+        """選択したノード以下の部分木を JSON または JSONL で保存します。"""
+        try:
+            iid = self.tree_control.focus()
+            if not iid or iid not in self.tree_nodes:
+                return
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=f".{fmt}",
+                filetypes=[("JSON files", f"*.{fmt}"), ("All files", "*.*")],
+            )
+            if not file_path:
+                return
+            wrapper, _ = self.tree_nodes[iid]
+            self.progress_label_control.config(text="出力中...")
+            self.tree_loader.export(
+                wrapper,
+                file_path,
+                fmt,
+                lambda count: self.progress_label_control.config(text=f"出力完了: {count} ノード"),
+                self._on_tree_error,
+            )
+        except Exception:
+            logging.error("An error occurred while exporting the control tree", exc_info=True)
+
+    def profile_selected_locators(self):
+        """選択した行の ``child_window(...)`` を、選択中のウィンドウで繰り返し解決して計測します。"""
+        try:
+            window_title = self.window_list_var.get()
+            if not window_title:
+                return
+            text = self.text_widget_control.selected_text()
+            if text is None:
+                self.progress_label_control.config(text="計測する行を選択してください")
+                return
+            count = profile_in_background(
+                self.app.root, window_title, self.app.backend_var.get(), text, self._show_profile_report
+            )
+            if count:
+                self.profile_button_control.config(state=tk.DISABLED)
+                self.progress_label_control.config(text=f"{count} 件のロケーターを計測中...")
+        except Exception:
+            logging.error("An error occurred while profiling locators", exc_info=True)
+
+    def _show_profile_report(self, report):
+        """ロケーターの計測結果を表示します。"""
+        self.profile_button_control.config(state=tk.NORMAL)
+        self.progress_label_control.config(text="ロケーターの計測が完了しました")
+        self.text_widget_control.append("\n" + report + "\n")
+        self.text_widget_control.see_end()
 
     def save_controls_to_file(self):
         """表示中のコントロール情報をテキストファイルに保存します。"""
         try:
-            controls = self.text_widget_control.get("1.0", tk.END)
-            if controls.strip():
+            if self.text_widget_control.buffer.nbytes:
                 file_path = filedialog.asksaveasfilename(
                     defaultextension=".txt",
                     filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
                 )
                 if file_path:
-                    with open(file_path, "w", encoding="utf-8") as file:
-                        file.write(controls)
+                    self.text_widget_control.save(file_path)
         except Exception:
             logging.error("An error occurred while saving controls to file", exc_info=True)
+
+    def open_controls_file(self):
+        """保存したコントロール情報のファイルを開いて表示します（メモリマップで読み込みます）。"""
+        try:
+            if self.dump_worker is not None:
+                return
+            file_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+            if file_path:
+                self.text_widget_control.load_file(file_path)
+                self.progress_label_control.config(text=f"{self.text_widget_control.line_count()} 行を読み込みました")
+                self.build_control_index()
+        except Exception:
+            logging.error("An error occurred while opening a controls file", exc_info=True)
+
+    def _invalidate_control_index(self):
+        """索引と絞り込み結果を破棄します（作成中の索引も使わないようにします）。"""
+        self._index_generation += 1
+        self.control_index = None
+        self.filter_matches = []
+        self.filter_results.delete(0, tk.END)
+        self.filter_status.config(text="")
+
+    def build_control_index(self):
+        """表示中のダンプからコントロールの索引をバックグラウンドで作成します。"""
+        self._invalidate_control_index()
+        generation = self._index_generation
+        buffer = self.text_widget_control.buffer
+        lines = buffer.lines(0, len(buffer))
+        self.filter_status.config(text="索引を作成中...")
+
+        def build():
+            """索引を作成し、メインループへ渡します（作成スレッド）。"""
+            try:
+                index = ControlIndex.from_lines(lines)
+            except Exception:
+                logging.error("An error occurred while indexing controls", exc_info=True)
+                index = None
+            self.app.root.after(0, self._on_control_index_built, generation, index)
+
+        threading.Thread(target=build, name="ControlIndex", daemon=True).start()
+
+    def _on_control_index_built(self, generation, index):
+        """作成した索引を使えるようにし、入力済みの条件で絞り込みます。"""
+        if generation != self._index_generation:
+            return
+        self.control_index = index
+        if index is None:
+            self.filter_status.config(text="索引を作成できません")
+            return
+        self.filter_status.config(text=f"{len(index)} 件のコントロール")
+        self.apply_control_filter()
+
+    def apply_control_filter(self):
+        """入力に一致するコントロールを索引から探し、結果のリストを更新します。"""
+        try:
+            if self.control_index is None:
+                return
+            query = self.filter_var.get()
+            self.filter_results.delete(0, tk.END)
+            if not query.strip():
+                self.filter_matches = []
+                self.filter_status.config(text=f"{len(self.control_index)} 件のコントロール")
+                return
+            self.filter_matches = self.control_index.search(query)
+            controls = self.control_index.controls
+            shown = self.filter_matches[:MAX_FILTER_RESULTS]
+            self.filter_results.insert(tk.END, *(self._format_filter_result(controls[number]) for number in shown))
+            if len(self.filter_matches) > len(shown):
+                self.filter_status.config(text=f"{len(self.filter_matches)} 件一致（先頭 {len(shown)} 件を表示）")
+            else:
+                self.filter_status.config(text=f"{len(self.filter_matches)} 件一致")
+        except Exception:
+            logging.error("An error occurred while filtering controls", exc_info=True)
+
+    def _format_filter_result(self, control):
+        """絞り込み結果のリストに表示する文字列を返します。"""
+        kind = control.control_type or control.class_name
+        text = f"{control.line + 1}: {kind} '{control.title}'"
+        if control.automation_id:
+            text += f"  id={control.automation_id}"
+        return text
+
+    def _focus_filter_results(self):
+        """絞り込み結果のリストにフォーカスを移します。"""
+        if self.filter_matches:
+            self.filter_results.focus_set()
+            self.filter_results.selection_clear(0, tk.END)
+            self.filter_results.selection_set(0)
+            self.filter_results.activate(0)
+            self._jump_to_filter_result(0)
+        return "break"
+
+    def _on_filter_result_selected(self, _event):
+        """リストで選んだコントロールへ移動します。"""
+        selection = self.filter_results.curselection()
+        if selection:
+            self._jump_to_filter_result(selection[0])
+
+    def _jump_to_filter_result(self, position):
+        """絞り込み結果の ``position`` 番目のコントロールの行を選択して表示します。"""
+        if position >= len(self.filter_matches) or self.control_index is None:
+            return "break"
+        control = self.control_index.controls[self.filter_matches[position]]
+        self.text_widget_control.select_lines(control.line, control.last_line)
+        return "break"
@@ -1,19 +1,26 @@
 import tkinter as tk
-from tkinter import ttk
 import webbrowser
 import logging
-import pyautogui
+import time
+from collections import deque
+from ...utils.codegen import call
+from ...utils.helpers import is_own_window_active
+from ...utils.key_coalescer import KeyCoalescer, key_step_code
+from ...utils.key_names import pynput_key_name
+from ...utils.tracing import tracer
+
+# フックから受け取ったキー入力をメインループで取り出す間隔（ミリ秒）
+KEY_DRAIN_INTERVAL_MS = 30
 
 
 class KeyTab:
     """Tab for recording keyboard operations."""
 
-    def __init__(self, app):
+    def __init__(self, app, frame):
         """キーボード操作タブのウィジェットを初期化します。"""
 
         self.app = app
-        self.frame = ttk.Frame(app.notebook)
-        app.notebook.add(self.frame, text='キー操作')
+        self.frame = frame
 
         self.text_widget_key = tk.Text(self.frame, wrap=tk.WORD, font=("Arial", 14), height=2)
         self.text_widget_key.pack(pady=20)
@@ -96,6 +103,27 @@ class KeyTab:
         )
         self.operation_label_key3.pack(pady=5)
 
+        capture_frame = tk.LabelFrame(self.frame, text="キー入力の記録", font=("Arial", 10))
+        capture_frame.pack(pady=10, fill=tk.X, padx=10)
+        capture_buttons = tk.Frame(capture_frame)
+        capture_buttons.pack(fill=tk.X)
+        self.capture_button = tk.Button(capture_buttons, text="キー入力を記録", command=self.toggle_key_capture)
+        self.capture_button.pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Button(capture_buttons, text="コピー", command=self.copy_captured_code).pack(side=tk.LEFT, padx=5, pady=5)
+        self.capture_stats_label = tk.Label(capture_buttons, text="記録していません", font=("Arial", 10))
+        self.capture_stats_label.pack(side=tk.LEFT, padx=5, pady=5)
+        self.captured_code_text = tk.Text(capture_frame, wrap=tk.NONE, font=("Consolas", 11), height=8)
+        self.captured_code_text.pack(fill=tk.X, padx=5, pady=5)
+
+        # フックのスレッドは deque に追加するだけで、変換と表示はメインループで行う
+        self._key_events = deque()
+        self.capture_listener = None
+        self.capturing = False
+        self._captured_events = 0
+        self._captured_lines = 0
+        self._capture_drain_after_id = None
+        self.coalescer = KeyCoalescer(self._append_captured_step)
+
     def generate_key_code(self):
         """入力内容からキーボード操作用コードを作成します。"""
         try:
@@ -113,17 +141,15 @@ class KeyTab:
             if operation == "Press Key":
                 if keys:
                     if len(keys) == 1:
-                        code = f"pyautogui.press('{keys[0]}')"
+                        code = call("pyautogui.press", keys[0])
                     else:
-                        keys_str = "', '".join(keys)
-                        code = f"pyautogui.hotkey('{keys_str}')"
+                        code = call("pyautogui.hotkey", *keys)
             elif operation == "Write Text":
                 if key_value:
-                    code = f"pyautogui.write('{key_value}')"
+                    code = call("pyautogui.write", key_value)
             elif operation == "Hotkey":
                 if keys:
-                    keys_str = "', '".join(keys)
-                    code = f"pyautogui.hotkey('{keys_str}')"
+                    code = call("pyautogui.hotkey", *keys)
 
             self.text_widget_key.config(state=tk.NORMAL)
             self.text_widget_key.delete("1.0", tk.END)
@@ -140,3 +166,97 @@ class KeyTab:
             webbrowser.open_new(url)
         except Exception:
             logging.error("An error occurred while opening the URL", exc_info=True)
+
+    def toggle_key_capture(self):
+        """キー入力の記録を開始・停止します。"""
+        try:
+            if self.capturing:
+                self.capturing = False
+                if self.capture_listener is not None:
+                    self.capture_listener.stop()
+                    self.capture_listener = None
+                if self._capture_drain_after_id is not None:
+                    self.app.root.after_cancel(self._capture_drain_after_id)
+                    self._capture_drain_after_id = None
+                self._drain_key_events()
+                self.coalescer.flush()
+                self.capture_button.config(text="キー入力を記録")
+                self._update_capture_stats()
+            else:
+                self._key_events.clear()
+                self.coalescer = KeyCoalescer(self._append_captured_step)
+                self._captured_events = 0
+                self._captured_lines = 0
+                self.captured_code_text.delete("1.0", tk.END)
+                from pynput import keyboard
+
+                self.capture_listener = keyboard.Listener(
+                    on_press=self.on_capture_press, on_release=self.on_capture_release
+                )
+                self.capture_listener.daemon = True
+                self.capture_listener.start()
+                self.capturing = True
+                self.capture_button.config(text="記録停止")
+                self._update_capture_stats()
+                self._schedule_key_drain()
+        except Exception:
+            logging.error("An error occurred while toggling the key capture", exc_info=True)
+
+    def on_capture_press(self, key):
+        """キーボードフックのコールバック。キューに入れるだけで、Tk には触れません。"""
+        self._key_events.append((key, True, time.monotonic()))
+
+    def on_capture_release(self, key):
+        """キーボードフックのコールバック。キューに入れるだけで、Tk には触れません。"""
+        self._key_events.append((key, False, time.monotonic()))
+
+    def _schedule_key_drain(self):
+        """キーイベントを取り出して、次回の取り出しを予約します。"""
+        self._drain_key_events()
+        if self.capturing:
+            self._capture_drain_after_id = self.app.root.after(KEY_DRAIN_INTERVAL_MS, self._schedule_key_drain)
+
+    @tracer.traced("recorder.key_drain")
+    def _drain_key_events(self):
+        """キューにたまったキー入力をまとめてコードに変換します（メインループ上で実行）。"""
+        try:
+            if not self._key_events:
+                return
+            own_window = is_own_window_active()
+            while self._key_events:
+                key, pressed, timestamp = self._key_events.popleft()
+                if own_window:
+                    continue
+                name = pynput_key_name(key)
+                if name is None:
+                    continue
+                self._captured_events += 1
+                self.coalescer.feed(name, pressed, timestamp)
+            self._update_capture_stats()
+        except Exception:
+            logging.error("Error converting captured key events", exc_info=True)
+
+    def _append_captured_step(self, step):
+        """まとめられた操作を1行のコードとして出力欄に追加します。"""
+        self.captured_code_text.insert(tk.END, key_step_code(step) + "\n")
+        self.captured_code_text.see(tk.END)
+        self._captured_lines += 1
+
+    def _update_capture_stats(self):
+        """記録したキーイベント数と生成した行数を表示します。"""
+        state = "記録中" if self.capturing else "記録済み"
+        self.capture_stats_label.config(
+            text=f"{state}: {self._captured_events} キーイベント → {self._captured_lines} 行"
+        )
+
+    def copy_captured_code(self):
+        """記録したキー入力のコードをクリップボードにコピーします。"""
+        try:
+            if self.capturing:
+                self._drain_key_events()
+            code = self.captured_code_text.get("1.0", tk.END).rstrip("\n")
+            if code:
+                self.app.root.clipboard_clear()
+                self.app.root.clipboard_append(code)
+        except Exception:
+            logging.error("An error occurred while copying the captured key code", exc_info=True)
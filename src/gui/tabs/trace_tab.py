@@ -0,0 +1,100 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+import logging
+from ...utils.tracing import DEFAULT_DUMP_PATH, TRACE_ENV, tracer
+
+# 統計表を更新する間隔（ミリ秒）
+TRACE_REFRESH_MS = 1000
+TRACE_COLUMNS = (
+    ("count", "回数", 70),
+    ("mean_ms", "平均 (ms)", 90),
+    ("p50_ms", "p50 (ms)", 90),
+    ("p95_ms", "p95 (ms)", 90),
+    ("p99_ms", "p99 (ms)", 90),
+    ("max_ms", "最大 (ms)", 90),
+)
+
+
+class TraceTab:
+    """Tab showing per-span latency statistics of the inspector and recorders."""
+
+    def __init__(self, app, frame):
+        """トレースの有効化と、スパンごとの統計表を表示するタブを設定します。"""
+
+        self.app = app
+        self.frame = frame
+
+        label = tk.Label(
+            self.frame,
+            text=f"検査や記録の各処理の所要時間を計測します（環境変数 {TRACE_ENV}=1 でも有効になります）。",
+            font=("Arial", 12),
+        )
+        label.pack(pady=5)
+
+        control_frame = tk.Frame(self.frame)
+        control_frame.pack(pady=(0, 5))
+        self.enabled_var = tk.BooleanVar(value=tracer.enabled)
+        tk.Checkbutton(
+            control_frame, text="トレースを有効にする", variable=self.enabled_var, command=self.toggle_tracing
+        ).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="リセット", command=self.reset_stats).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="JSONで保存", command=self.save_stats).pack(side=tk.LEFT, padx=5)
+
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _, _ in TRACE_COLUMNS])
+        self.tree.heading("#0", text="スパン")
+        self.tree.column("#0", width=260)
+        for name, heading, width in TRACE_COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, anchor=tk.E)
+        self.tree.pack(padx=10, pady=10, fill="both", expand=True)
+
+        self.status_label = tk.Label(self.frame, text="", font=("Arial", 10))
+        self.status_label.pack(pady=(0, 5))
+
+        self._refresh_after_id = None
+        self._refresh()
+
+    def toggle_tracing(self):
+        """トレースの有効・無効を切り替えます。"""
+        tracer.enabled = self.enabled_var.get()
+        self._refresh()
+
+    def reset_stats(self):
+        """記録した統計を消去します。"""
+        tracer.reset()
+        self._refresh()
+
+    def save_stats(self):
+        """統計を JSON ファイルに保存します。"""
+        try:
+            path = filedialog.asksaveasfilename(
+                defaultextension=".json", initialfile="trace.json", filetypes=[("JSON", "*.json")]
+            )
+            if path:
+                saved = tracer.dump(path)
+                self.status_label.config(text=f"{saved} に保存しました" if saved else "保存する記録がありません")
+        except Exception:
+            logging.error("An error occurred while saving trace stats", exc_info=True)
+
+    def _refresh(self):
+        """統計表を更新し、トレースが有効な間は次の更新を予約します。"""
+        if self._refresh_after_id is not None:
+            self.app.root.after_cancel(self._refresh_after_id)
+            self._refresh_after_id = None
+        try:
+            spans = tracer.snapshot()
+            for name, summary in spans.items():
+                values = [summary[column] for column, _, _ in TRACE_COLUMNS]
+                if self.tree.exists(name):
+                    self.tree.item(name, values=values)
+                else:
+                    self.tree.insert("", tk.END, iid=name, text=name, values=values)
+            for name in self.tree.get_children():
+                if name not in spans:
+                    self.tree.delete(name)
+            state = "有効" if tracer.enabled else "無効"
+            self.status_label.config(text=f"トレース: {state}  スパン: {len(spans)} 種類（終了時に {DEFAULT_DUMP_PATH} に保存）")
+        except Exception:
+            logging.error("An error occurred while refreshing trace stats", exc_info=True)
+        if tracer.enabled:
+            self._refresh_after_id = self.app.root.after(TRACE_REFRESH_MS, self._refresh)
@@ -1,34 +1,77 @@
 import tkinter as tk
-from tkinter import ttk
 import logging
-import pygetwindow as gw
+import queue
+
+# レジストリの差分キューを確認する間隔（ミリ秒）
+WINDOW_DRAIN_INTERVAL_MS = 100
 
 
 class WindowTab:
     """Tab for listing all open windows."""
 
-    def __init__(self, app):
+    def __init__(self, app, frame):
         """開いているウィンドウ一覧を表示するタブを設定します。"""
 
         self.app = app
-        self.frame = ttk.Frame(app.notebook)
-        app.notebook.add(self.frame, text='ウィンドウ一覧')
+        self.frame = frame
 
         self.text_widget_window = tk.Text(self.frame, wrap=tk.WORD, font=("Arial", 14), height=14)
         self.text_widget_window.pack(pady=20)
+        self.text_widget_window.config(state=tk.DISABLED)
 
         self.execute_button_window = tk.Button(self.frame, text="ウィンドウを取得", command=self.get_windows)
         self.execute_button_window.pack(pady=10)
 
+        # ウィンドウ一覧は共有レジストリから差分で受け取る
+        self.window_changes = queue.Queue()
+        snapshot = app.window_registry.subscribe(self._on_windows_changed)
+        self.apply_window_changes(snapshot, [], [])
+        self._drain_window_changes()
+
     def get_windows(self):
-        """現在開いているウィンドウのタイトルを取得して表示します。"""
+        """ウィンドウ一覧を列挙し直し、変化した行だけを更新します。"""
         try:
-            windows = gw.getAllTitles()
-            self.text_widget_window.config(state=tk.NORMAL)
-            self.text_widget_window.delete("1.0", tk.END)
-            for window in windows:
-                if window.strip():
-                    self.text_widget_window.insert(tk.END, f"{window}\n")
-            self.text_widget_window.config(state=tk.DISABLED)
+            self.app.window_registry.refresh()
         except Exception:
             logging.error("An error occurred while getting window titles", exc_info=True)
+
+    def _on_windows_changed(self, added, removed, changed):
+        """レジストリからの差分をキューに積みます（Tk は呼び出しません）。"""
+        self.window_changes.put((added, removed, changed))
+
+    def _drain_window_changes(self):
+        """キューに溜まった差分をメインループで反映します。"""
+        try:
+            while True:
+                self.apply_window_changes(*self.window_changes.get_nowait())
+        except queue.Empty:
+            pass
+        finally:
+            self.app.root.after(WINDOW_DRAIN_INTERVAL_MS, self._drain_window_changes)
+
+    def apply_window_changes(self, added, removed, changed):
+        """ウィンドウの追加・削除・タイトル変更をテキストに反映します。
+
+        各行にはウィンドウハンドルのタグを付け、変化した行だけを書き換えます。
+        """
+        try:
+            text = self.text_widget_window
+            text.config(state=tk.NORMAL)
+            for info in removed:
+                ranges = text.tag_ranges(f"hwnd_{info.hwnd}")
+                if ranges:
+                    text.delete(ranges[0], ranges[1])
+            for info in changed:
+                tag = f"hwnd_{info.hwnd}"
+                ranges = text.tag_ranges(tag)
+                if ranges:
+                    start = ranges[0]
+                    text.delete(start, ranges[1])
+                    text.insert(start, f"{info.title}\n", tag)
+                else:
+                    text.insert(tk.END, f"{info.title}\n", tag)
+            for info in added:
+                text.insert(tk.END, f"{info.title}\n", f"hwnd_{info.hwnd}")
+            text.config(state=tk.DISABLED)
+        except Exception:
+            logging.error("An error occurred while updating window titles", exc_info=True)
@@ -0,0 +1 @@
+"""Reusable Tk widgets shared by the tabs."""
@@ -0,0 +1,339 @@
+import tkinter as tk
+from tkinter import ttk
+import logging
+import re
+from ...utils.line_buffer import LineBuffer, compile_search
+
+# 行番号の余白（文字数）
+MIN_GUTTER_DIGITS = 4
+# マウスホイール1ノッチでスクロールする行数
+WHEEL_LINES = 3
+
+
+class VirtualTextView(tk.Frame):
+    """Read-only text viewer that renders only the lines currently visible.
+
+    The content lives in a ``LineBuffer``; the inner ``tk.Text`` only ever
+    holds one screenful of lines, so appending, scrolling and searching
+    cost the same for a 10 MB dump as for a short message. Selection works
+    on whole lines (click, drag or Shift+click, Ctrl+A, Ctrl+C) and is kept
+    as line numbers, so it can span far more than one screen. The search
+    bar finds matches incrementally while typing (Enter / Shift+Enter for
+    next / previous).
+    """
+
+    def __init__(self, master, font=("Arial", 12), height=15, search=True, **kwargs):
+        """表示用の Text、スクロールバー、検索バーを作成します。"""
+        super().__init__(master, **kwargs)
+        self.buffer = LineBuffer()
+        self.top = 0
+        # 末尾を表示している間は、追加された行に追従する
+        self.follow = False
+        self.sel_anchor = None
+        self.sel_end = None
+        self.match = None
+        self._pattern = None
+        self._render_pending = False
+
+        if search:
+            search_frame = tk.Frame(self)
+            search_frame.pack(side=tk.TOP, fill="x")
+            tk.Label(search_frame, text="検索:", font=("Arial", 10)).pack(side=tk.LEFT)
+            self.search_var = tk.StringVar()
+            self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=30)
+            self.search_entry.pack(side=tk.LEFT, padx=5)
+            self.regex_var = tk.BooleanVar(value=False)
+            tk.Checkbutton(
+                search_frame, text="正規表現", variable=self.regex_var, command=self._on_search_changed
+            ).pack(side=tk.LEFT)
+            tk.Button(search_frame, text="前へ", command=lambda: self.find_next(backward=True)).pack(side=tk.LEFT, padx=2)
+            tk.Button(search_frame, text="次へ", command=self.find_next).pack(side=tk.LEFT, padx=2)
+            self.search_status = tk.Label(search_frame, text="", font=("Arial", 10))
+            self.search_status.pack(side=tk.LEFT, padx=5)
+            self.search_var.trace_add("write", lambda *_: self._on_search_changed())
+            self.search_entry.bind("<Return>", lambda e: self.find_next())
+            self.search_entry.bind("<Shift-Return>", lambda e: self.find_next(backward=True))
+
+        body = tk.Frame(self)
+        body.pack(side=tk.TOP, fill="both", expand=True)
+        self.text = tk.Text(body, wrap=tk.NONE, font=font, height=height, cursor="arrow")
+        self.vscroll = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.hscroll = ttk.Scrollbar(body, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.hscroll.set)
+        self.vscroll.pack(side=tk.RIGHT, fill="y")
+        self.hscroll.pack(side=tk.BOTTOM, fill="x")
+        self.text.pack(side=tk.LEFT, fill="both", expand=True)
+        self.text.tag_configure("gutter", foreground="gray")
+        self.text.tag_configure("line_sel", background="#cce4ff")
+        self.text.tag_configure("match", background="#ffd54f")
+        self.text.config(state=tk.DISABLED)
+
+        self.text.bind("<Configure>", lambda e: self._schedule_render())
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll_lines(-WHEEL_LINES))
+        self.text.bind("<Button-5>", lambda e: self.scroll_lines(WHEEL_LINES))
+        self.text.bind("<Button-1>", self._on_click)
+        self.text.bind("<Shift-Button-1>", self._on_shift_click)
+        self.text.bind("<B1-Motion>", self._on_drag)
+        self.text.bind("<Prior>", lambda e: self.scroll_lines(-self.visible_lines()))
+        self.text.bind("<Next>", lambda e: self.scroll_lines(self.visible_lines()))
+        self.text.bind("<Up>", lambda e: self.scroll_lines(-1))
+        self.text.bind("<Down>", lambda e: self.scroll_lines(1))
+        self.text.bind("<Control-Home>", lambda e: self.scroll_to(0))
+        self.text.bind("<Control-End>", lambda e: self.see_end())
+        self.text.bind("<Control-a>", self._on_select_all)
+        self.text.bind("<Control-c>", self._on_copy)
+        if search:
+            self.text.bind("<Control-f>", lambda e: self.search_entry.focus_set())
+
+    # 内容の操作
+
+    def set_text(self, text):
+        """内容を置き換えます。"""
+        self.buffer.clear()
+        self.buffer.append(text)
+        self._reset_view()
+
+    def append(self, text):
+        """末尾に追加します。末尾を表示していれば、追加した行まで自動でスクロールします。"""
+        self.buffer.append(text)
+        if self.follow:
+            self.top = self._max_top()
+        self._schedule_render()
+
+    def clear(self):
+        """内容を消去します。"""
+        self.buffer.clear()
+        self._reset_view()
+
+    def load_file(self, path):
+        """保存済みのファイルをメモリマップで開いて表示します。"""
+        self.buffer.close()
+        self.buffer = LineBuffer.from_file(path)
+        self._reset_view()
+
+    def get_text(self):
+        """内容全体を文字列で返します。"""
+        return self.buffer.text()
+
+    def save(self, path):
+        """内容をそのままファイルに書き出します。"""
+        with open(path, "wb") as file:
+            self.buffer.write_to(file)
+
+    def line_count(self):
+        """行数を返します。"""
+        return len(self.buffer)
+
+    def selected_text(self):
+        """選択中の行を文字列で返します。選択がなければ ``None`` です。"""
+        if self.sel_anchor is None:
+            return None
+        first, last = sorted((self.sel_anchor, self.sel_end))
+        return self.buffer.text(first, last + 1)
+
+    def select_lines(self, first, last):
+        """``first`` 行目から ``last`` 行目までを選択し、表示範囲に入るようにスクロールします。"""
+        self.sel_anchor, self.sel_end = first, last
+        self.see_line(first)
+        self._schedule_render()
+
+    def _reset_view(self):
+        """スクロール位置、選択、検索結果を初期状態に戻します。"""
+        self.top = 0
+        self.follow = False
+        self.sel_anchor = self.sel_end = None
+        self.match = None
+        self._schedule_render()
+
+    # スクロール
+
+    def visible_lines(self):
+        """表示できる行数を返します。"""
+        height = self.text.winfo_height()
+        linespace = self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace")
+        if height <= 1:
+            return int(self.text.cget("height"))
+        return max(1, int(height) // max(1, int(linespace)))
+
+    def _max_top(self):
+        """先頭に表示できる最大の行番号を返します。"""
+        return max(0, len(self.buffer) - self.visible_lines())
+
+    def scroll_to(self, line):
+        """``line`` 行目が先頭に来るようにスクロールします。"""
+        self.top = min(max(0, int(line)), self._max_top())
+        self.follow = self.top >= self._max_top()
+        self._schedule_render()
+        return "break"
+
+    def scroll_lines(self, count):
+        """``count`` 行スクロールします（負の値で上へ）。"""
+        return self.scroll_to(self.top + count)
+
+    def see_line(self, line):
+        """``line`` 行目が表示範囲に入るようにスクロールします。"""
+        rows = self.visible_lines()
+        if line < self.top or line >= self.top + rows:
+            self.scroll_to(line - rows // 2)
+
+    def see_end(self):
+        """末尾までスクロールします。"""
+        return self.scroll_to(len(self.buffer))
+
+    def _on_scrollbar(self, action, *args):
+        """スクロールバーの操作を行番号に変換します。"""
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.buffer))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_lines(amount * (self.visible_lines() if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        """マウスホイールでスクロールします。"""
+        return self.scroll_lines(-WHEEL_LINES if event.delta > 0 else WHEEL_LINES)
+
+    # 描画
+
+    def _schedule_render(self):
+        """次のアイドル時に1回だけ描画します（連続した追加をまとめるため）。"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _gutter_width(self):
+        """行番号の桁数を返します。"""
+        return max(MIN_GUTTER_DIGITS, len(str(len(self.buffer))))
+
+    def _render(self):
+        """表示範囲の行だけを Text に描画します。"""
+        self._render_pending = False
+        try:
+            rows = self.visible_lines()
+            self.top = min(self.top, self._max_top())
+            lines = self.buffer.lines(self.top, self.top + rows)
+            digits = self._gutter_width()
+            xview = self.text.xview()[0]
+            text = self.text
+            text.config(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            for offset, line in enumerate(lines):
+                if offset:
+                    text.insert(tk.END, "\n")
+                text.insert(tk.END, f"{self.top + offset + 1:>{digits}} ", "gutter")
+                text.insert(tk.END, line)
+            self._apply_tags(len(lines), digits + 1)
+            text.config(state=tk.DISABLED)
+            text.xview_moveto(xview)
+            total = max(1, len(self.buffer))
+            self.vscroll.set(self.top / total, min(1.0, (self.top + rows) / total))
+        except Exception:
+            logging.error("VirtualTextView render error", exc_info=True)
+
+    def _apply_tags(self, rendered, gutter):
+        """表示中の行に選択と検索結果の色を付けます。"""
+        if self.sel_anchor is not None:
+            first, last = sorted((self.sel_anchor, self.sel_end))
+            first = max(first, self.top)
+            last = min(last, self.top + rendered - 1)
+            if first <= last:
+                self.text.tag_add("line_sel", f"{first - self.top + 1}.0", f"{last - self.top + 1}.end")
+        if self.match is not None:
+            line, column, length = self.match
+            if self.top <= line < self.top + rendered:
+                row = line - self.top + 1
+                self.text.tag_add("match", f"{row}.{gutter + column}", f"{row}.{gutter + column + length}")
+
+    # 選択
+
+    def _line_at(self, event):
+        """マウス位置の行番号を返します。"""
+        row = int(self.text.index(f"@{event.x},{event.y}").split(".")[0])
+        return min(self.top + row - 1, len(self.buffer) - 1)
+
+    def _on_click(self, event):
+        """クリックした行を選択します。"""
+        self.text.focus_set()
+        self.sel_anchor = self.sel_end = self._line_at(event)
+        self._schedule_render()
+        return "break"
+
+    def _on_shift_click(self, event):
+        """Shift+クリックで選択範囲を広げます。"""
+        line = self._line_at(event)
+        if self.sel_anchor is None:
+            self.sel_anchor = line
+        self.sel_end = line
+        self._schedule_render()
+        return "break"
+
+    def _on_drag(self, event):
+        """ドラッグで選択範囲を広げ、表示範囲の外へ出たらスクロールします。"""
+        if self.sel_anchor is None:
+            return "break"
+        if event.y < 0:
+            self.scroll_lines(-1)
+        elif event.y > self.text.winfo_height():
+            self.scroll_lines(1)
+        self.sel_end = self._line_at(event)
+        self._schedule_render()
+        return "break"
+
+    def _on_select_all(self, _event):
+        """すべての行を選択します。"""
+        self.sel_anchor, self.sel_end = 0, len(self.buffer) - 1
+        self._schedule_render()
+        return "break"
+
+    def _on_copy(self, _event):
+        """選択中の行をクリップボードにコピーします。"""
+        text = self.selected_text()
+        if text is not None:
+            self.clipboard_clear()
+            self.clipboard_append(text)
+        return "break"
+
+    # 検索
+
+    def _on_search_changed(self):
+        """入力のたびに、現在の一致位置から探し直します（インクリメンタル検索）。"""
+        query = self.search_var.get()
+        if not query:
+            self._pattern = self.match = None
+            self.search_status.config(text="")
+            self._schedule_render()
+            return
+        try:
+            self._pattern = compile_search(query, regex=self.regex_var.get())
+        except re.error:
+            self._pattern = None
+            self.search_status.config(text="正規表現が正しくありません")
+            return
+        if self.match is not None:
+            line, column = self.match[:2]
+        else:
+            line, column = self.top, 0
+        self._show_match(self.buffer.search(self._pattern, line, column))
+
+    def find_next(self, backward=False):
+        """次（``backward`` なら前）の一致へ移動します。"""
+        if self._pattern is None:
+            return "break"
+        if self.match is None:
+            line, column = self.top, 0
+        elif backward:
+            line, column = self.match[:2]
+        else:
+            line, column = self.match[0], self.match[1] + max(1, self.match[2])
+        self._show_match(self.buffer.search(self._pattern, line, column, backward=backward))
+        return "break"
+
+    def _show_match(self, match):
+        """一致した位置までスクロールして強調表示します。"""
+        self.match = match
+        if match is None:
+            self.search_status.config(text="見つかりません")
+        else:
+            self.search_status.config(text=f"{match[0] + 1} 行目")
+            self.see_line(match[0])
+        self._schedule_render()
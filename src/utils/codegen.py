@@ -0,0 +1,102 @@
+"""Generation of Python source from recorded steps with proper literal escaping."""
+
+from collections import namedtuple
+
+# 1つの関数呼び出しを表す操作。kwargs は順序付きの ``(名前, 値)`` のタプル
+Step = namedtuple("Step", "func args kwargs comment", defaults=((), (), None))
+
+DEFAULT_HEADER = ("import time", "import pyautogui", "")
+
+
+def literal(value):
+    """値を Python のリテラルとして安全に書ける文字列にします。
+
+    文字列は ``repr`` でエスケープするため、引用符や改行、バックスラッシュを
+    含んでいても正しいコードになります。
+    """
+    if isinstance(value, float):
+        return repr(round(value, 2))
+    return repr(value)
+
+
+def call(func, *args, **kwargs):
+    """関数呼び出しのコード ``func(arg, key=value)`` を返します。"""
+    return render_step(Step(func, args, tuple(kwargs.items())))
+
+
+def step(func, *args, comment=None, **kwargs):
+    """引数から ``Step`` を作ります。"""
+    return Step(func, args, tuple(kwargs.items()), comment)
+
+
+def render_step(step):
+    """``Step`` をコード1行にします。"""
+    parts = [literal(arg) for arg in step.args]
+    parts.extend(f"{name}={literal(value)}" for name, value in step.kwargs)
+    code = f"{step.func}({', '.join(parts)})"
+    if step.comment:
+        code += f"  # {step.comment}"
+    return code
+
+
+class ScriptBuilder:
+    """Keeps a list of steps and their rendered source fragments.
+
+    Each step is rendered once and its fragment cached, so replacing,
+    inserting or deleting a step in a long recording only renders that one
+    step; ``source`` then just joins the cached fragments.
+    """
+
+    def __init__(self, steps=(), header=DEFAULT_HEADER):
+        """操作列とスクリプト先頭の行を設定します。"""
+        self.header = list(header)
+        self._steps = []
+        self._fragments = []
+        self.rendered = 0
+        self.extend(steps)
+
+    def __len__(self):
+        """操作の数を返します。"""
+        return len(self._steps)
+
+    def __getitem__(self, index):
+        """指定位置の操作を返します。"""
+        return self._steps[index]
+
+    def _render(self, step):
+        """1つの操作をコードにし、描画回数を数えます。"""
+        self.rendered += 1
+        return render_step(step)
+
+    def append(self, step):
+        """操作を末尾に追加します。"""
+        self._steps.append(step)
+        self._fragments.append(self._render(step))
+
+    def extend(self, steps):
+        """複数の操作を末尾に追加します。"""
+        for item in steps:
+            self.append(item)
+
+    def insert(self, index, step):
+        """指定位置に操作を挿入します。"""
+        self._steps.insert(index, step)
+        self._fragments.insert(index, self._render(step))
+
+    def replace(self, index, step):
+        """指定位置の操作を置き換え、その操作だけを描画し直します。"""
+        self._steps[index] = step
+        self._fragments[index] = self._render(step)
+
+    def delete(self, index):
+        """指定位置の操作を削除します。"""
+        del self._steps[index]
+        del self._fragments[index]
+
+    def fragment(self, index):
+        """指定位置の操作のコードを返します。"""
+        return self._fragments[index]
+
+    def source(self):
+        """スクリプト全体のソースコードを返します。"""
+        return "\n".join(self.header + self._fragments) + "\n"
@@ -0,0 +1,176 @@
+"""Background, chunked streaming of control identifier dumps."""
+
+import logging
+import threading
+import time
+
+from pywinauto.application import Application
+
+# 階層の深さごとに付けるインデント（print_control_identifiers と同じ）
+INDENT = "   | "
+
+
+class DumpCancelled(Exception):
+    """Raised from the output stream to abort a running dump."""
+
+
+def format_control(wrapper, depth):
+    """1つのコントロールを ``print_control_identifiers`` と同じ形式の行にします。
+
+    ``print_control_identifiers`` は全要素から一意な名前を決めてから出力を始めるため、
+    名前の一覧は要素自身の文字列とクラス名だけから作ります（"Button2" のような番号は付きません）。
+    """
+    indent = INDENT * depth
+    info = wrapper.element_info
+    friendly_class = wrapper.friendly_class_name()
+    text = wrapper.window_text() or ""
+    text = text.replace("\n", r"\n").replace("\r", r"\r")
+    names = [text, text + friendly_class, friendly_class] if text else [friendly_class]
+
+    class_name = wrapper.class_name()
+    auto_id = getattr(info, "automation_id", None)
+    control_type = getattr(info, "control_type", None)
+    if control_type:
+        # コントロールタイプがあればクラス名は使わない
+        class_name = None
+    criteria = []
+    if text:
+        criteria.append(f'title="{text}"')
+    if class_name:
+        criteria.append(f'class_name="{class_name}"')
+    if auto_id:
+        criteria.append(f'auto_id="{auto_id}"')
+    if control_type:
+        criteria.append(f'control_type="{control_type}"')
+
+    lines = [indent, f"{indent}{friendly_class} - '{text}'    {wrapper.rectangle()}", f"{indent}{names}"]
+    if text or class_name or auto_id:
+        lines.append(f"{indent}child_window({', '.join(criteria)})")
+    return "\n".join(lines) + "\n"
+
+
+def iter_control_text(wrapper, cancel_event):
+    """ウィンドウ以下を深さ優先でたどり、コントロールごとの出力を順に返します。
+
+    ノードを1つ出力するたびに中止の要求を確認するので、大きなウィンドウでも
+    すぐに止められます。中止されたら ``DumpCancelled`` を送出します。
+    """
+    yield "Control Identifiers:\n"
+    stack = [(wrapper, 0)]
+    while stack:
+        if cancel_event.is_set():
+            raise DumpCancelled()
+        current, depth = stack.pop()
+        yield format_control(current, depth)
+        for child in reversed(current.children()):
+            stack.append((child, depth + 1))
+
+
+class _ChunkWriter:
+    """Buffers written text and hands it to ``sink`` in chunks."""
+
+    def __init__(self, sink, cancel_event, chunk_size, flush_interval):
+        self.sink = sink
+        self.cancel_event = cancel_event
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.chars = 0
+        self.lines = 0
+        self._buffer = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text):
+        if self.cancel_event.is_set():
+            raise DumpCancelled()
+        self._buffer.append(text)
+        self._buffered += len(text)
+        self.chars += len(text)
+        self.lines += text.count("\n")
+        if self._buffered >= self.chunk_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            chunk = "".join(self._buffer)
+            self._buffer = []
+            self._buffered = 0
+            self.sink(chunk)
+        self._last_flush = time.monotonic()
+
+
+class ControlDumpWorker:
+    """Dumps a window's control identifiers on a worker thread.
+
+    Output is delivered in chunks of at most ``chunk_size`` characters via
+    ``on_chunk(text)``, or written straight to ``file_path`` when given, in
+    which case only ``on_progress(chars, lines)`` is reported. Both callbacks
+    and ``on_done(status, chars, lines)`` run on the Tk main loop; ``status``
+    is ``"done"``, ``"cancelled"`` or ``"error"``.
+    """
+
+    def __init__(self, root, window_title, backend, on_done, on_chunk=None, on_progress=None,
+                 file_path=None, chunk_size=64 * 1024, flush_interval=0.1):
+        """ダンプ対象のウィンドウと出力先を設定します。"""
+        self.root = root
+        self.window_title = window_title
+        self.backend = backend
+        self.on_done = on_done
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ControlDump", daemon=True)
+
+    def start(self):
+        """ダンプを開始します。"""
+        self._thread.start()
+
+    def cancel(self):
+        """ダンプの中止を要求します。取得済みの部分はそのまま残ります。"""
+        self._cancel_event.set()
+
+    def _post(self, callback, *args):
+        """メインループ上でコールバックを呼び出します。"""
+        if callback is not None:
+            self.root.after(0, callback, *args)
+
+    def _run(self):
+        """ワーカースレッド上でコントロール識別子を出力します。"""
+        status = "done"
+        out_file = None
+        writer = None
+        try:
+            if self.file_path:
+                out_file = open(self.file_path, "w", encoding="utf-8", newline="\n")
+
+                def sink(chunk):
+                    out_file.write(chunk)
+                    self._post(self.on_progress, writer.chars, writer.lines)
+            else:
+                def sink(chunk):
+                    self._post(self.on_chunk, chunk)
+
+            writer = _ChunkWriter(sink, self._cancel_event, self.chunk_size, self.flush_interval)
+            app = Application(backend=self.backend).connect(title=self.window_title)
+            window = app.window(title=self.window_title).wrapper_object()
+            for text in iter_control_text(window, self._cancel_event):
+                writer.write(text)
+        except DumpCancelled:
+            status = "cancelled"
+        except Exception:
+            logging.error("An error occurred while dumping window controls", exc_info=True)
+            status = "error"
+        finally:
+            try:
+                if writer is not None:
+                    writer.flush()
+            finally:
+                if out_file is not None:
+                    out_file.close()
+            chars = writer.chars if writer is not None else 0
+            lines = writer.lines if writer is not None else 0
+            self._post(self.on_done, status, chars, lines)
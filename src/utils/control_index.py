@@ -0,0 +1,209 @@
+"""Inverted index over ``print_control_identifiers`` output for the control filter."""
+
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+# 絞り込みに使う項目と、検索欄で使える別名
+INDEX_FIELDS = ("title", "class_name", "control_type", "automation_id")
+FIELD_ALIASES = {
+    "title": "title",
+    "name": "title",
+    "class": "class_name",
+    "class_name": "class_name",
+    "type": "control_type",
+    "control_type": "control_type",
+    "id": "automation_id",
+    "auto_id": "automation_id",
+    "automation_id": "automation_id",
+}
+# この文字数以上の語は、トライグラムで部分一致を探す
+TRIGRAM = 3
+
+# 例: "   |    | Button - 'OK'    (L100, T200, R180, B224)"
+_HEADER = re.compile(r"^[\s|]*(?P<kind>[^'|]+?) - '(?P<title>.*)'\s+\(L-?\d+, T-?\d+, R-?\d+, B-?\d+\)\s*$")
+_CHILD_WINDOW = re.compile(r"child_window\((?P<args>.*)\)\s*$")
+_KWARG = re.compile(r"(\w+)=(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|-?\d+)")
+_TOKEN = re.compile(r"\w+")
+# ヘッダー行の後ろで child_window(...) 行を探す行数
+_LOCATOR_LOOKAHEAD = 3
+
+Control = namedtuple("Control", "line last_line title class_name control_type automation_id")
+
+
+def _unquote(value):
+    """``child_window`` の引数の文字列リテラルを取り出します。"""
+    if value[:1] in "\"'":
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def parse_controls(lines):
+    """ダンプの行のリストからコントロールの一覧を作ります。
+
+    各コントロールは、ヘッダー行（``種類 - 'タイトル' (L, T, R, B)``）と、
+    その後ろの ``child_window(...)`` 行から読み取ります。
+    """
+    controls = []
+    count = len(lines)
+    for index, text in enumerate(lines):
+        if "' " not in text or " - '" not in text:
+            continue
+        header = _HEADER.match(text)
+        if header is None:
+            continue
+        fields = {"title": header.group("title"), "kind": header.group("kind").strip()}
+        last_line = index
+        for offset in range(1, _LOCATOR_LOOKAHEAD + 1):
+            if index + offset >= count:
+                break
+            locator = _CHILD_WINDOW.search(lines[index + offset])
+            if locator is not None:
+                last_line = index + offset
+                for name, value in _KWARG.findall(locator.group("args")):
+                    fields[name] = _unquote(value)
+                break
+        controls.append(Control(
+            index,
+            last_line,
+            fields.get("title", ""),
+            fields.get("class_name") or fields["kind"],
+            fields.get("control_type", ""),
+            fields.get("auto_id", ""),
+        ))
+    return controls
+
+
+def tokenize(value):
+    """値を小文字の語に分けます。"""
+    return _TOKEN.findall(value.lower())
+
+
+class ControlIndex:
+    """Inverted index from field tokens to the controls that contain them.
+
+    Every token of every indexed field gets a posting list of control
+    numbers, once per field and once for "any field". The sorted vocabulary
+    answers prefix queries with a binary search, and a trigram index over
+    the vocabulary narrows substring queries to a handful of candidate
+    tokens, so a query touches only the tokens that can match instead of
+    every control. Japanese text is not split by ``\\w+``, so a title such as
+    ``名前を付けて保存`` is a single token; terms shorter than a trigram that
+    contain non-ASCII characters are therefore matched as substrings by
+    scanning only the non-ASCII part of the vocabulary. A query is a
+    space-separated list of terms that must all match; ``field:value``
+    restricts a term to one field.
+    """
+
+    def __init__(self, controls):
+        """コントロールの一覧から索引を作ります。"""
+        self.controls = controls
+        self._postings = {}
+        for number, control in enumerate(controls):
+            for field in INDEX_FIELDS:
+                for token in set(tokenize(getattr(control, field))):
+                    for key in ((None, token), (field, token)):
+                        postings = self._postings.get(key)
+                        if postings is None:
+                            self._postings[key] = [number]
+                        elif postings[-1] != number:
+                            postings.append(number)
+        self._vocabulary = {field: sorted(token for f, token in self._postings if f == field)
+                            for field in (None,) + INDEX_FIELDS}
+        self._trigrams = {}
+        for position, token in enumerate(self._vocabulary[None]):
+            for start in range(len(token) - TRIGRAM + 1):
+                gram = token[start:start + TRIGRAM]
+                grams = self._trigrams.get(gram)
+                if grams is None:
+                    self._trigrams[gram] = [position]
+                elif grams[-1] != position:
+                    grams.append(position)
+        self._wide_tokens = [token for token in self._vocabulary[None] if not token.isascii()]
+
+    @classmethod
+    def from_lines(cls, lines):
+        """ダンプの行のリストから索引を作ります。"""
+        return cls(parse_controls(lines))
+
+    def __len__(self):
+        return len(self.controls)
+
+    def _prefix_tokens(self, field, prefix):
+        """``prefix`` で始まる語を返します。"""
+        vocabulary = self._vocabulary[field]
+        tokens = []
+        for position in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            tokens.append(token)
+        return tokens
+
+    def _substring_tokens(self, field, part):
+        """``part`` を含む語を、トライグラムで候補を絞ってから返します。"""
+        lists = []
+        for start in range(len(part) - TRIGRAM + 1):
+            grams = self._trigrams.get(part[start:start + TRIGRAM])
+            if grams is None:
+                return []
+            lists.append(grams)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for grams in lists[1:]:
+            candidates.intersection_update(grams)
+            if not candidates:
+                return []
+        vocabulary = self._vocabulary[None]
+        tokens = (vocabulary[position] for position in candidates)
+        return [token for token in tokens if part in token and (field is None or (field, token) in self._postings)]
+
+    def _short_substring_tokens(self, field, part):
+        """トライグラムより短い非ASCIIの ``part`` を含む語を、非ASCIIの語を順に調べて返します。"""
+        return [
+            token for token in self._wide_tokens
+            if part in token and (field is None or (field, token) in self._postings)
+        ]
+
+    def _term_matches(self, field, value):
+        """1つの語に一致するコントロール番号の集合を返します。"""
+        matched = None
+        for part in tokenize(value) or [""]:
+            if len(part) >= TRIGRAM:
+                tokens = self._substring_tokens(field, part)
+            elif not part.isascii():
+                tokens = self._short_substring_tokens(field, part)
+            else:
+                tokens = self._prefix_tokens(field, part)
+            part_matches = set()
+            for token in tokens:
+                part_matches.update(self._postings[(field, token)])
+            # "ok-button" のように区切られた語は、すべての部分を含むものだけにする
+            matched = part_matches if matched is None else matched & part_matches
+            if not matched:
+                break
+        return matched
+
+    def search(self, query):
+        """検索文字列に一致するコントロール番号を、ダンプの順に並べて返します。
+
+        空白で区切った語はすべて一致する必要があります。``type:button`` のように
+        ``項目:値`` と書くと、その項目だけを調べます。3文字以上の語と日本語などの
+        非ASCII文字を含む語は部分一致、それより短い英数字の語は前方一致です。
+        """
+        result = None
+        for term in query.split():
+            field = None
+            name, sep, value = term.partition(":")
+            if sep and name.lower() in FIELD_ALIASES:
+                field = FIELD_ALIASES[name.lower()]
+                term = value
+            if not term:
+                continue
+            matches = self._term_matches(field, term)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        if result is None:
+            return []
+        return sorted(result)
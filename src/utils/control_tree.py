@@ -0,0 +1,112 @@
+"""Helpers for browsing a window's control tree one level at a time."""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pywinauto.application import Application
+
+
+def describe_element(wrapper):
+    """pywinauto のラッパーから表示・出力用の情報を取り出します。"""
+    info = wrapper.element_info
+    try:
+        rect = wrapper.rectangle()
+        rect = [rect.left, rect.top, rect.right, rect.bottom]
+    except Exception:
+        rect = None
+    return {
+        "title": info.name or "",
+        "control_type": getattr(info, "control_type", None) or "",
+        "automation_id": getattr(info, "automation_id", None) or "",
+        "class_name": info.class_name or "",
+        "rect": rect,
+    }
+
+
+def iter_subtree(wrapper, cancel_event=None):
+    """部分木を深さ優先でたどり、``(depth, parent_index, node)`` を返します。
+
+    ``parent_index`` は親ノードが何番目に返されたか（ルートは ``None``）です。
+    """
+    stack = [(wrapper, 0, None)]
+    index = 0
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        current, depth, parent_index = stack.pop()
+        yield depth, parent_index, describe_element(current)
+        children = current.children()
+        for child in reversed(children):
+            stack.append((child, depth + 1, index))
+        index += 1
+
+
+def export_subtree(wrapper, file_path, fmt="json", cancel_event=None):
+    """部分木を JSON（入れ子）または JSONL（1行1ノード）で書き出し、ノード数を返します。"""
+    count = 0
+    with open(file_path, "w", encoding="utf-8") as file:
+        if fmt == "jsonl":
+            for depth, parent_index, node in iter_subtree(wrapper, cancel_event):
+                node.update(id=count, parent=parent_index, depth=depth)
+                file.write(json.dumps(node, ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            nodes = []
+            root = None
+            for _, parent_index, node in iter_subtree(wrapper, cancel_event):
+                node["children"] = []
+                if parent_index is None:
+                    root = node
+                else:
+                    nodes[parent_index]["children"].append(node)
+                nodes.append(node)
+                count += 1
+            json.dump(root, file, ensure_ascii=False, indent=2)
+    return count
+
+
+class ControlTreeLoader:
+    """Fetches control tree levels on a single background thread.
+
+    All UI Automation calls go through one worker so requests are served in
+    order; results are posted back to the Tk main loop with ``root.after``.
+    """
+
+    def __init__(self, root):
+        """結果を通知する Tk ルートを設定します。"""
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ControlTree")
+
+    def _submit(self, func, on_done, on_error):
+        """処理をワーカーで実行し、結果をメインループへ通知します。"""
+        def task():
+            try:
+                result = func()
+            except Exception as e:
+                logging.error("ControlTreeLoader task error", exc_info=True)
+                self.root.after(0, on_error, e)
+            else:
+                self.root.after(0, on_done, result)
+        self._executor.submit(task)
+
+    def load_window(self, window_title, backend, on_done, on_error):
+        """ウィンドウに接続し、``(wrapper, node)`` を通知します。"""
+        def func():
+            app = Application(backend=backend).connect(title=window_title)
+            wrapper = app.window(title=window_title).wrapper_object()
+            return wrapper, describe_element(wrapper)
+        self._submit(func, on_done, on_error)
+
+    def load_children(self, wrapper, on_done, on_error):
+        """直下の子要素だけを取得し、``[(wrapper, node), ...]`` を通知します。"""
+        def func():
+            return [(child, describe_element(child)) for child in wrapper.children()]
+        self._submit(func, on_done, on_error)
+
+    def export(self, wrapper, file_path, fmt, on_done, on_error, cancel_event=None):
+        """部分木をファイルに書き出し、ノード数を通知します。"""
+        if cancel_event is None:
+            cancel_event = threading.Event()
+        self._submit(lambda: export_subtree(wrapper, file_path, fmt, cancel_event), on_done, on_error)
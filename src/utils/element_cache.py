@@ -0,0 +1,179 @@
+"""Per-window cache of UI element subtrees used by the inspector."""
+
+import threading
+import time
+from collections import OrderedDict
+
+import win32con
+import win32gui
+from pywinauto import Desktop
+
+from .tracing import tracer
+
+
+def element_key(elem):
+    """Return a stable identity for a pywinauto wrapper, or ``None``.
+
+    UIA elements are identified by their runtime id, Win32 elements by their
+    window handle. Wrappers without either are not cached.
+    """
+    info = getattr(elem, "element_info", None)
+    if info is None:
+        return None
+    runtime_id = getattr(info, "runtime_id", None)
+    if runtime_id:
+        return ("rid",) + tuple(runtime_id)
+    handle = getattr(info, "handle", None)
+    if handle:
+        return ("hwnd", handle)
+    return None
+
+
+class _WindowEntry:
+    """Cached data belonging to one top-level window."""
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.created = time.monotonic()
+        self.children = {}
+        self.rectangles = {}
+        self.data = {}
+
+
+class ElementTreeCache:
+    """Caches ``children()`` / ``rectangle()`` results keyed by top-level HWND.
+
+    An entry is dropped when its TTL expires or when the window's cheap
+    structural signature (rectangle, title, visibility and first child
+    window) changes. UIA-only content that has no HWND of its own cannot be
+    observed this way, so the TTL bounds how stale such subtrees can get.
+    """
+
+    def __init__(self, ttl=30.0, max_windows=32):
+        """キャッシュの有効期間（秒）と保持するウィンドウ数を設定します。"""
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._desktops = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def top_level_handle(hwnd):
+        """子ウィンドウのハンドルからトップレベルウィンドウのハンドルを返します。"""
+        if not hwnd:
+            return 0
+        return win32gui.GetAncestor(hwnd, win32con.GA_ROOT) or hwnd
+
+    @staticmethod
+    def window_signature(top_hwnd):
+        """構造変化の検出に使う軽量なシグネチャを返します。"""
+        try:
+            with tracer.span("win32.window_signature"):
+                return (
+                    win32gui.GetWindowRect(top_hwnd),
+                    win32gui.GetWindowText(top_hwnd),
+                    win32gui.IsWindowVisible(top_hwnd),
+                    win32gui.GetWindow(top_hwnd, win32con.GW_CHILD),
+                )
+        except win32gui.error:
+            return None
+
+    def desktop(self, backend):
+        """バックエンドごとの ``Desktop`` を再利用して返します。"""
+        with self._lock:
+            desktop = self._desktops.get(backend)
+            if desktop is None:
+                desktop = self._desktops[backend] = Desktop(backend=backend)
+            return desktop
+
+    def _entry(self, top_hwnd):
+        """有効なエントリを返します。期限切れや構造変化があれば作り直します。"""
+        signature = self.window_signature(top_hwnd)
+        entry = self._entries.get(top_hwnd)
+        if entry is not None:
+            expired = time.monotonic() - entry.created > self.ttl
+            if expired or signature is None or entry.signature != signature:
+                self.invalidations += 1
+                entry = None
+            else:
+                self._entries.move_to_end(top_hwnd)
+        if entry is None:
+            entry = self._entries[top_hwnd] = _WindowEntry(signature)
+            self._entries.move_to_end(top_hwnd)
+            while len(self._entries) > self.max_windows:
+                self._entries.popitem(last=False)
+        return entry
+
+    def children(self, elem, top_hwnd):
+        """要素の子要素一覧をキャッシュ経由で返します。"""
+        key = element_key(elem)
+        if key is None or not top_hwnd:
+            self.misses += 1
+            with tracer.span("uia.children"):
+                return elem.children()
+        with self._lock:
+            entry = self._entry(top_hwnd)
+            cached = entry.children.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        self.misses += 1
+        with tracer.span("uia.children"):
+            children = elem.children()
+        with self._lock:
+            entry.children[key] = children
+        return children
+
+    def rectangle(self, elem, top_hwnd):
+        """要素の矩形をキャッシュ経由で返します。"""
+        key = element_key(elem)
+        if key is None or not top_hwnd:
+            self.misses += 1
+            with tracer.span("uia.rectangle"):
+                return elem.rectangle()
+        with self._lock:
+            entry = self._entry(top_hwnd)
+            cached = entry.rectangles.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        self.misses += 1
+        with tracer.span("uia.rectangle"):
+            rect = elem.rectangle()
+        with self._lock:
+            entry.rectangles[key] = rect
+        return rect
+
+    def get_or_build(self, top_hwnd, name, builder):
+        """ウィンドウ単位の任意データを取得し、なければ ``builder()`` で作成します。"""
+        with self._lock:
+            entry = self._entry(top_hwnd)
+            if name in entry.data:
+                self.hits += 1
+                return entry.data[name]
+        self.misses += 1
+        value = builder()
+        with self._lock:
+            entry.data[name] = value
+        return value
+
+    def invalidate(self, top_hwnd=None):
+        """指定ウィンドウ（省略時はすべて）のキャッシュを破棄します。"""
+        with self._lock:
+            if top_hwnd is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(top_hwnd, None) is not None:
+                self.invalidations += 1
+
+    def stats(self):
+        """ヒット数・ミス数・無効化数を返します。"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "windows": len(self._entries),
+        }
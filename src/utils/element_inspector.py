@@ -0,0 +1,811 @@
+"""Element lookup and formatting shared by the inspector tab and the batch CLI.
+
+``ElementInspector`` holds the detection strategies, the per-window element
+cache and the locator synthesis, and has no dependency on Tk, so it can be
+driven from the GUI hotkey or from ``inspect_cli.py`` over thousands of
+points in one run.
+"""
+
+import logging
+import time
+
+import win32gui
+from pywinauto.controls.hwndwrapper import HwndWrapper
+from pywinauto.findwindows import ElementNotFoundError
+
+from .codegen import call, literal
+from .element_cache import ElementTreeCache, element_key
+from .inspector_utils import format_inspector_output, get_window_title_with_parent
+from .locator import LocatorIndex
+from .spatial_index import RectGridIndex
+from .strategy_pipeline import DetectionStrategy, InspectionContext, StrategyPipeline
+from .tracing import tracer
+from .uia_client import get_uia_client
+
+# 1回の検査にかける時間の上限（秒）と、検出戦略ごとの時間予算（秒）
+INSPECTION_DEADLINE_S = 5.0
+STRATEGY_BUDGETS_S = {
+    'tkinter_specific': 1.0,
+    'chrome_specific': 1.0,
+    'accessibility': 1.0,
+    'detailed_coordinate': 2.0,
+    'uiautomation': 1.0,
+    'deepest': 2.0,
+    'from_point': 1.0,
+}
+
+
+def grid_points(rect, step):
+    """矩形 ``(left, top, right, bottom)`` を ``step`` ピクセル間隔で区切った各マスの中心座標を返します。"""
+    left, top, right, bottom = rect
+    step = max(1, int(step))
+    return [
+        (x, y)
+        for y in range(top + step // 2, bottom, step)
+        for x in range(left + step // 2, right, step)
+    ]
+
+
+def element_identity(elem_data):
+    """検出結果が同じ要素かどうかを判定するためのキーを返します。見つからなければ ``None`` です。"""
+    if not elem_data:
+        return None
+    kind = elem_data['type']
+    if kind == 'tkinter_specific':
+        return ('hwnd', elem_data['element']['hwnd'])
+    if kind == 'chrome_specific':
+        return ('hwnd', elem_data['element'][0])
+    if kind == 'accessibility':
+        info = elem_data['info']
+        return ('acc', info['name'], info['role'], info['value'])
+    if kind == 'uiautomation':
+        info = elem_data['info']
+        return ('uia', info['automation_id'], info['name'], info['control_type'], tuple(info['bounding_rect']))
+    elem = elem_data['element']
+    key = element_key(elem)
+    if key is not None:
+        return key
+    rect = elem.rectangle()
+    return ('rect', elem.window_text(), rect.left, rect.top, rect.right, rect.bottom)
+
+
+class ElementInspector:
+    """Finds the UI element at a screen point and describes it.
+
+    ``get_element_under_mouse`` runs the time-budgeted strategy pipeline,
+    ``format_result`` renders the text shown by the inspector tab and
+    ``describe`` turns the same result into a JSON-friendly record.
+    ``inspect_points`` walks many points with one shared element cache and
+    reports each element in full only the first time it is hit.
+    """
+
+    def __init__(self, element_cache=None, deadline=INSPECTION_DEADLINE_S, race=False):
+        """要素キャッシュと検出パイプラインを用意します。"""
+        self.element_cache = element_cache if element_cache is not None else ElementTreeCache()
+        self.strategy_pipeline = self.build_strategy_pipeline()
+        self.strategy_pipeline.deadline = deadline
+        self.strategy_pipeline.race = race
+
+    def get_locator_index(self, top):
+        """トップレベルウィンドウの ``LocatorIndex`` をキャッシュ経由で返します。"""
+        top_hwnd = top.handle
+        name = ("locator_index", type(top.element_info).__name__)
+        return self.element_cache.get_or_build(
+            top_hwnd,
+            name,
+            lambda: LocatorIndex(top, children=lambda e: self.element_cache.children(e, top_hwnd)),
+        )
+
+    def find_minimal_locator(self, elem):
+        """ウィンドウ内で要素を一意に特定できる最小のロケーターを返します。見つからなければ ``None`` です。"""
+        try:
+            top = elem.top_level_parent()
+            if not top.handle:
+                return None
+            index = self.get_locator_index(top)
+            position = index.position(elem)
+            if position is None:
+                # ウィンドウの中身が変わっているので作り直す
+                self.element_cache.invalidate(top.handle)
+                index = self.get_locator_index(top)
+                position = index.position(elem)
+            if position is None:
+                return None
+            return index.minimal_locator(position)
+        except Exception:
+            logging.error("find_minimal_locator error", exc_info=True)
+            return None
+
+    @tracer.traced("inspector.locator")
+    def generate_code_example(self, elem):
+        """要素を一意に特定する最小のロケーターでクリックコードを生成します。"""
+        locator = self.find_minimal_locator(elem)
+        if locator is not None:
+            return locator.code() + ".click_input()"
+        props = []
+        title = elem.window_text()
+        ctrl_type = elem.element_info.control_type
+        auto_id = elem.element_info.automation_id
+        if title:
+            props.append(("title", title))
+        if ctrl_type:
+            props.append(("control_type", ctrl_type))
+        if auto_id:
+            props.append(("auto_id", auto_id))
+        if props:
+            return call("dlg.child_window", **dict(props)) + ".click_input()"
+        return "# 要素を特定する情報が不足しています"
+
+    def find_deepest_element_at_point(self, x, y, backend='uia', root_elem=None):
+        """指定された座標で最も深い（具体的な）UI要素を見つけます。
+
+        ``root_elem`` を渡すと、``from_point`` の取得を省略します。
+        """
+        try:
+            # まず基本的な方法で要素を取得
+            if root_elem is None:
+                root_elem = self.element_cache.desktop(backend).from_point(x, y)
+            top_hwnd = self.element_cache.top_level_handle(win32gui.WindowFromPoint((x, y)))
+            
+            if not root_elem:
+                return None
+            
+            # より深い要素を探索
+            current_elem = root_elem
+            max_depth = 10  # 無限ループを防ぐための最大深度
+            depth = 0
+            
+            while depth < max_depth:
+                try:
+                    # 子要素を取得
+                    children = self.element_cache.children(current_elem, top_hwnd)
+                    if not children:
+                        break
+                    
+                    # 指定座標を含む子要素を探す
+                    target_child = None
+                    for child in children:
+                        try:
+                            rect = self.element_cache.rectangle(child, top_hwnd)
+                            if (rect.left <= x <= rect.right and 
+                                rect.top <= y <= rect.bottom):
+                                target_child = child
+                                break
+                        except:
+                            continue
+                    
+                    if target_child is None:
+                        break
+                    
+                    # より具体的な要素が見つかった場合、それを使用
+                    if (hasattr(target_child, 'element_info') and 
+                        target_child.element_info.control_type and
+                        target_child.element_info.control_type not in ['Window', 'Pane']):
+                        current_elem = target_child
+                        depth += 1
+                    else:
+                        break
+                        
+                except:
+                    break
+            
+            return current_elem
+            
+        except Exception as e:
+            logging.error(f"find_deepest_element_at_point error: {e}")
+            return None
+
+    def get_element_with_uiautomation(self, x, y):
+        """UIAutomationを直接使用してより詳細な要素を取得します。"""
+        try:
+            # 共有のUIAutomationクライアントで、要素と全プロパティをまとめて取得
+            return get_uia_client().element_from_point(x, y, with_ancestors=True)
+        except Exception as e:
+            logging.error(f"get_element_with_uiautomation error: {e}")
+            return None, None
+
+    def get_child_window_index(self, parent_hwnd):
+        """親ウィンドウ配下の子ウィンドウ矩形の空間索引を返します。
+
+        索引はトップレベルウィンドウ単位でキャッシュされ、ウィンドウが
+        変化するまで再利用されます。
+        """
+        def build():
+            items = []
+
+            def enum_callback(hwnd, results):
+                try:
+                    results.append((win32gui.GetWindowRect(hwnd), (hwnd, win32gui.GetClassName(hwnd))))
+                except win32gui.error:
+                    pass
+                return True
+
+            win32gui.EnumChildWindows(parent_hwnd, enum_callback, items)
+            return RectGridIndex(items)
+
+        top_hwnd = self.element_cache.top_level_handle(parent_hwnd)
+        return self.element_cache.get_or_build(top_hwnd, ('child_index', parent_hwnd), build)
+
+    def get_tkinter_specific_elements(self, x, y):
+        """Tkinter専用の詳細な要素探索を行います。"""
+        try:
+            # Tkinterウィンドウのすべての子要素を詳細に探索
+            root_hwnd = win32gui.WindowFromPoint((x, y))
+            
+            # 親ウィンドウを取得
+            parent_hwnd = root_hwnd
+            while True:
+                temp_parent = win32gui.GetParent(parent_hwnd)
+                if temp_parent:
+                    parent_hwnd = temp_parent
+                else:
+                    break
+            
+            # 子ウィンドウの空間索引から、座標を含む最小の要素を探す
+            # （10x10ピクセル以下の要素は、他に候補がない場合のみ採用）
+            index = self.get_child_window_index(parent_hwnd)
+            hit = index.smallest_at(x, y, min_area=100)
+            if hit is None:
+                return None
+            area, rect, (hwnd, class_name) = hit
+            return {
+                'hwnd': hwnd,
+                'class_name': class_name,
+                'window_text': win32gui.GetWindowText(hwnd),
+                'rect': rect,
+                'area': area
+            }
+            
+        except Exception as e:
+            logging.error(f"get_tkinter_specific_elements error: {e}")
+            return None
+
+    def get_detailed_element_at_coordinate(self, x, y, backend='uia', root_element=None):
+        """座標における詳細な要素情報を段階的に取得します。
+
+        ``root_element`` を渡すと、``from_point`` の取得を省略します。
+        """
+        try:
+            top_hwnd = self.element_cache.top_level_handle(win32gui.WindowFromPoint((x, y)))
+            
+            # レベル1: 基本的な要素取得
+            try:
+                if root_element is None:
+                    root_element = self.element_cache.desktop(backend).from_point(x, y)
+                if not root_element:
+                    return None
+            except:
+                return None
+            
+            # レベル2: より詳細な子要素の探索
+            candidates = [root_element]
+            
+            # 3レベルまで子要素を探索
+            for level in range(3):
+                new_candidates = []
+                for candidate in candidates:
+                    try:
+                        children = self.element_cache.children(candidate, top_hwnd)
+                        for child in children:
+                            try:
+                                rect = self.element_cache.rectangle(child, top_hwnd)
+                                # 座標が子要素の範囲内にある場合
+                                if (rect.left <= x <= rect.right and 
+                                    rect.top <= y <= rect.bottom):
+                                    new_candidates.append(child)
+                            except:
+                                continue
+                    except:
+                        continue
+                
+                if new_candidates:
+                    candidates = new_candidates
+                else:
+                    break
+            
+            # 最も具体的な要素を選択（面積が最小のもの）
+            if candidates:
+                best_candidate = None
+                min_area = float('inf')
+                
+                for candidate in candidates:
+                    try:
+                        rect = self.element_cache.rectangle(candidate, top_hwnd)
+                        area = (rect.right - rect.left) * (rect.bottom - rect.top)
+                        
+                        # 要素に有用な情報があるかチェック
+                        has_useful_info = (
+                            candidate.window_text() or
+                            (hasattr(candidate, 'element_info') and 
+                             candidate.element_info.automation_id) or
+                            (hasattr(candidate, 'element_info') and 
+                             candidate.element_info.control_type not in ['Window', 'Pane', ''])
+                        )
+                        
+                        if area < min_area and (has_useful_info or area < 10000):
+                            min_area = area
+                            best_candidate = candidate
+                    except:
+                        continue
+                
+                return best_candidate if best_candidate else candidates[0]
+            
+            return root_element
+            
+        except Exception as e:
+            logging.error(f"get_detailed_element_at_coordinate error: {e}")
+            return None
+
+    def get_chrome_specific_element(self, x, y):
+        """Chrome専用の要素取得を試行します。"""
+        try:
+            # より精密な座標での要素検索
+            hwnd = win32gui.WindowFromPoint((x, y))
+
+            # 親ウィンドウ配下の子ウィンドウ索引から、座標を含む要素を探す
+            parent_hwnd = win32gui.GetParent(hwnd)
+            if not parent_hwnd:
+                return None
+            hits = self.get_child_window_index(parent_hwnd).query(x, y)
+
+            # 座標に最も近い要素を探す
+            closest_element = None
+            min_distance = float('inf')
+
+            for _, rect, (child_hwnd, class_name) in hits:
+                if not class_name:
+                    continue
+                # 要素の中心からの距離を計算
+                center_x = (rect[0] + rect[2]) // 2
+                center_y = (rect[1] + rect[3]) // 2
+                distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
+
+                if distance < min_distance:
+                    min_distance = distance
+                    closest_element = (child_hwnd, class_name, rect)
+
+            return closest_element
+
+        except Exception as e:
+            logging.error(f"get_chrome_specific_element error: {e}")
+            return None
+
+    def get_accessibility_info(self, x, y):
+        """アクセシビリティ情報を取得します。"""
+        try:
+            # IAccessibleインターフェースを使用
+            import comtypes.client
+            import comtypes.gen.Accessibility as Accessibility
+            
+            hwnd = win32gui.WindowFromPoint((x, y))
+            
+            # アクセシビリティオブジェクトを取得
+            try:
+                import oleacc
+                pacc, child_id = oleacc.AccessibleObjectFromWindow(
+                    hwnd, oleacc.OBJID_CLIENT, oleacc.IAccessible
+                )
+                
+                if pacc:
+                    # 座標からアクセシブル要素を取得
+                    acc_element = pacc.accHitTest(x, y)
+                    if acc_element:
+                        acc_info = {
+                            'name': pacc.get_accName(acc_element) if hasattr(pacc, 'get_accName') else 'N/A',
+                            'description': pacc.get_accDescription(acc_element) if hasattr(pacc, 'get_accDescription') else 'N/A',
+                            'role': pacc.get_accRole(acc_element) if hasattr(pacc, 'get_accRole') else 'N/A',
+                            'state': pacc.get_accState(acc_element) if hasattr(pacc, 'get_accState') else 'N/A',
+                            'value': pacc.get_accValue(acc_element) if hasattr(pacc, 'get_accValue') else 'N/A'
+                        }
+                        return acc_info
+            except ImportError:
+                # oleaccが利用できない場合はスキップ
+                pass
+                
+        except Exception as e:
+            logging.error(f"get_accessibility_info error: {e}")
+        
+        return None
+
+    def build_strategy_pipeline(self):
+        """要素検出戦略を優先順に登録したパイプラインを作成します。"""
+        pipeline = StrategyPipeline(deadline=INSPECTION_DEADLINE_S)
+
+        def tkinter_specific(ctx):
+            tk_element = self.get_tkinter_specific_elements(ctx.x, ctx.y)
+            if tk_element:
+                return {'type': 'tkinter_specific', 'element': tk_element, 'info': None}
+
+        def chrome_specific(ctx):
+            chrome_element = self.get_chrome_specific_element(ctx.x, ctx.y)
+            if chrome_element:
+                return {'type': 'chrome_specific', 'element': chrome_element, 'info': None}
+
+        def accessibility(ctx):
+            acc_info = self.get_accessibility_info(ctx.x, ctx.y)
+            if acc_info:
+                return {'type': 'accessibility', 'element': None, 'info': acc_info}
+
+        def detailed_coordinate(ctx):
+            elem = self.get_detailed_element_at_coordinate(ctx.x, ctx.y, ctx.backend, ctx.from_point())
+            if elem:
+                return {'type': 'detailed_coordinate', 'element': elem, 'info': None}
+
+        def uiautomation(ctx):
+            uia_element, uia_info = self.get_element_with_uiautomation(ctx.x, ctx.y)
+            if uia_element and uia_info:
+                return {'type': 'uiautomation', 'element': uia_element, 'info': uia_info}
+
+        def deepest(ctx):
+            elem = self.find_deepest_element_at_point(ctx.x, ctx.y, ctx.backend, ctx.from_point())
+            if elem:
+                return {'type': 'pywinauto', 'element': elem, 'info': None}
+
+        def from_point(ctx):
+            elem = ctx.from_point()
+            if elem:
+                return {'type': 'pywinauto', 'element': elem, 'info': None}
+
+        budgets = STRATEGY_BUDGETS_S
+        # Tkinter専用処理
+        pipeline.register(DetectionStrategy(
+            'tkinter_specific', tkinter_specific, budgets['tkinter_specific'], ('Tk',), independent=True))
+        # Chrome等のブラウザの場合は特別な処理
+        pipeline.register(DetectionStrategy(
+            'chrome_specific', chrome_specific, budgets['chrome_specific'], ('Chrome', 'Browser'), independent=True))
+        pipeline.register(DetectionStrategy(
+            'accessibility', accessibility, budgets['accessibility'], ('Chrome', 'Browser'), independent=True))
+        # 詳細な座標ベース探索
+        pipeline.register(DetectionStrategy(
+            'detailed_coordinate', detailed_coordinate, budgets['detailed_coordinate']))
+        # UIAutomationを直接使用
+        pipeline.register(DetectionStrategy(
+            'uiautomation', uiautomation, budgets['uiautomation'], independent=True))
+        # 最も深い要素の探索
+        pipeline.register(DetectionStrategy('deepest', deepest, budgets['deepest']))
+        # それでも見つからない場合は従来の方法を使用
+        pipeline.register(DetectionStrategy('from_point', from_point, budgets['from_point']))
+        return pipeline
+
+    def get_element_under_mouse(self, x, y, backend, job=None):
+        """指定座標（マウス位置）にある要素を取得します。
+
+        ウィンドウクラスに応じた検出戦略を、時間予算の範囲内で順に試します。
+        ``job`` を渡すと、各戦略の間でキャンセルを確認します。
+        """
+        try:
+            # ウィンドウクラスを確認
+            with tracer.span("win32.WindowFromPoint"):
+                hwnd = win32gui.WindowFromPoint((x, y))
+                window_class = win32gui.GetClassName(hwnd)
+            context = InspectionContext(
+                x, y, backend, hwnd, window_class, self.element_cache.desktop(backend), job
+            )
+            with tracer.span("inspector.detect"):
+                return self.strategy_pipeline.run(context)
+        except ElementNotFoundError:
+            return None
+
+    @tracer.traced("win32.ChildWindowFromPoint")
+    def get_alternative_element_info(self, x, y):
+        """Win32 APIを使った代替の要素取得方法"""
+        try:
+            # より詳細なWin32情報を取得
+            point = (x, y)
+            hwnd = win32gui.WindowFromPoint(point)
+            
+            # 子ウィンドウを探す
+            child_hwnd = win32gui.ChildWindowFromPoint(hwnd, point)
+            if child_hwnd and child_hwnd != hwnd:
+                hwnd = child_hwnd
+            
+            # さらに深い子ウィンドウを探す
+            while True:
+                deeper_child = win32gui.ChildWindowFromPoint(hwnd, 
+                    (x - win32gui.GetWindowRect(hwnd)[0], 
+                     y - win32gui.GetWindowRect(hwnd)[1]))
+                if deeper_child and deeper_child != hwnd:
+                    hwnd = deeper_child
+                else:
+                    break
+            
+            return hwnd
+            
+        except Exception as e:
+            logging.error(f"get_alternative_element_info error: {e}")
+            return win32gui.WindowFromPoint((x, y))
+
+    @tracer.traced("inspector.format")
+    def format_result(self, x, y, elem_data, backend):
+        """検出結果から表示用テキストを作ります。``(テキスト, ウィンドウタイトル)`` を返します。"""
+        window_title = None
+        if not elem_data:
+            result = "要素が見つかりませんでした。"
+        else:
+            # より詳細なHWND取得
+            hwnd = self.get_alternative_element_info(x, y)
+            window_title = get_window_title_with_parent(hwnd)
+            
+            dlg_code = f"""【dlg設定サンプル】
+from pywinauto.application import Application
+# backend は 'uia' または 'win32' から選べます
+app = {call("Application", backend=backend)}.connect(title={literal(window_title)})
+dlg = {call("app.window", title=window_title)}
+# ↓このdlg変数を使って下のコード例をそのまま利用できます！
+"""
+            
+            # 座標情報
+            coord_info = f"\n【マウス座標】\nX: {x}, Y: {y}\n"
+            
+            # 要素の種類に応じて情報を取得
+            if elem_data['type'] == 'tkinter_specific':
+                # Tkinter専用取得の場合
+                tk_elem = elem_data['element']
+                tk_result = f"""
+【Tkinter専用取得結果】
+ウィンドウハンドル: {tk_elem['hwnd']}
+クラス名: {tk_elem['class_name']}
+ウィンドウテキスト: {tk_elem['window_text']}
+座標: {tk_elem['rect']}
+面積: {tk_elem['area']}
+
+【推奨操作コード】
+# ハンドルを使用した操作
+dlg.child_window(handle={tk_elem['hwnd']}).click()
+
+# クラス名とテキストを組み合わせた操作
+{call("dlg.child_window", class_name=tk_elem['class_name'], title=tk_elem['window_text'])}.click()
+
+# 座標ベースの直接操作（最も確実）
+import pyautogui
+pyautogui.click({x}, {y})
+"""
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{tk_result}"
+            
+            elif elem_data['type'] == 'detailed_coordinate':
+                # 詳細座標探索の場合
+                elem = elem_data['element']
+                detailed_info = {
+                    "name": elem.window_text() if elem.window_text() else 'N/A',
+                    "class_name": elem.element_info.class_name if hasattr(elem, 'element_info') and elem.element_info.class_name else 'N/A',
+                    "control_type": elem.element_info.control_type if hasattr(elem, 'element_info') and elem.element_info.control_type else 'N/A',
+                    "automation_id": elem.element_info.automation_id if hasattr(elem, 'element_info') and elem.element_info.automation_id else 'N/A',
+                    "rectangle": str(elem.rectangle()),
+                    "code_example": self.generate_code_example(elem),
+                }
+                
+                detailed_result = f"""
+【詳細座標探索結果】
+名前: {detailed_info['name']}
+クラス名: {detailed_info['class_name']}
+コントロールタイプ: {detailed_info['control_type']}
+オートメーションID: {detailed_info['automation_id']}
+矩形: {detailed_info['rectangle']}
+
+【推奨コード】
+{detailed_info['code_example']}
+
+【代替コード】
+# より具体的な特定方法
+{call("dlg.child_window", class_name=detailed_info['class_name'], title=detailed_info['name'])}.click_input()
+"""
+                
+                # Win32情報も併せて表示
+                with tracer.span("win32.HwndWrapper"):
+                    win32_wrap = HwndWrapper(hwnd)
+                    win32_info = {
+                        "window_text": win32_wrap.window_text(),
+                        "class_name": win32_wrap.friendly_class_name(),
+                        "handle": win32_wrap.handle,
+                        "rectangle": str(win32_wrap.rectangle()),
+                    }
+                
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{detailed_result}\n{format_inspector_output(detailed_info, win32_info)}"
+            
+            elif elem_data['type'] == 'chrome_specific':
+                # Chrome専用取得の場合
+                hwnd, class_name, rect = elem_data['element']
+                chrome_result = f"""
+【Chrome専用取得結果】
+ウィンドウハンドル: {hwnd}
+クラス名: {class_name}
+座標: {rect}
+
+【注意】
+Chromeの内部要素は通常のUI自動化では取得困難です。
+以下の代替手段を検討してください：
+
+1. Chrome拡張機能の使用
+2. Seleniumによるブラウザ自動化
+3. 座標ベースのクリック操作
+4. Chrome DevTools Protocolの使用
+
+【座標ベースの操作例】
+import pyautogui
+pyautogui.click({x}, {y})  # 直接座標をクリック
+"""
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{chrome_result}"
+            
+            elif elem_data['type'] == 'accessibility':
+                # アクセシビリティ取得の場合
+                acc_info = elem_data['info']
+                acc_result = f"""
+【アクセシビリティ情報】
+名前: {acc_info['name']}
+説明: {acc_info['description']}
+ロール: {acc_info['role']}
+状態: {acc_info['state']}
+値: {acc_info['value']}
+
+【推奨操作方法】
+# 座標ベースでの操作を推奨
+import pyautogui
+pyautogui.click({x}, {y})
+"""
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{acc_result}"
+            
+            elif elem_data['type'] == 'uiautomation':
+                # UIAutomation直接取得の場合
+                uia_info = elem_data['info']
+                ancestor_path = " > ".join(
+                    a['name'] or a['class_name'] for a in uia_info.get('ancestors', [])
+                ) or 'N/A'
+                uia_result = f"""
+【UIAutomation直接取得結果】
+名前: {uia_info['name']}
+コントロールタイプ: {uia_info['control_type']}
+オートメーションID: {uia_info['automation_id']}
+クラス名: {uia_info['class_name']}
+ヘルプテキスト: {uia_info['help_text']}
+境界矩形: {uia_info['bounding_rect']}
+親要素: {ancestor_path}
+
+【推奨コード例】
+# UIAutomationIDが利用可能な場合
+{call("dlg.child_window", auto_id=uia_info['automation_id'])}.click_input()
+# または名前で特定
+{call("dlg.child_window", title=uia_info['name'])}.click_input()
+"""
+                
+                # Win32情報も併せて取得
+                with tracer.span("win32.HwndWrapper"):
+                    win32_wrap = HwndWrapper(hwnd)
+                    win32_info = {
+                        "window_text": win32_wrap.window_text(),
+                        "class_name": win32_wrap.friendly_class_name(),
+                        "handle": win32_wrap.handle,
+                        "rectangle": str(win32_wrap.rectangle()),
+                        "code_example": call(
+                            "dlg.child_window",
+                            title=win32_wrap.window_text(),
+                            class_name=win32_wrap.friendly_class_name(),
+                            handle=win32_wrap.handle,
+                        ) + ".click()",
+                    }
+                
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{uia_result}\n{format_inspector_output({}, win32_info)}"
+                
+            else:
+                # pywinauto取得の場合（従来の処理）
+                elem = elem_data['element']
+                uia_info = {
+                    "name": elem.window_text(),
+                    "class_name": elem.element_info.class_name if hasattr(elem, 'element_info') else 'N/A',
+                    "control_type": elem.element_info.control_type if hasattr(elem, 'element_info') else 'N/A',
+                    "automation_id": elem.element_info.automation_id if hasattr(elem, 'element_info') else 'N/A',
+                    "rectangle": str(elem.rectangle()),
+                    "code_example": self.generate_code_example(elem),
+                }
+                
+                with tracer.span("win32.HwndWrapper"):
+                    win32_wrap = HwndWrapper(hwnd)
+                    win32_info = {
+                        "window_text": win32_wrap.window_text(),
+                        "class_name": win32_wrap.friendly_class_name(),
+                        "handle": win32_wrap.handle,
+                        "rectangle": str(win32_wrap.rectangle()),
+                        "code_example": call(
+                            "dlg.child_window",
+                            title=win32_wrap.window_text(),
+                            class_name=win32_wrap.friendly_class_name(),
+                            handle=win32_wrap.handle,
+                        ) + ".click()",
+                    }
+                
+                result = f"{dlg_code}\n画面名: {window_title}\n{coord_info}\n{format_inspector_output(uia_info, win32_info)}"
+        return result, window_title
+
+    def element_rect(self, elem_data):
+        """検査結果から要素の矩形 ``(left, top, right, bottom)`` を取り出します。"""
+        if not elem_data:
+            return None
+        try:
+            if elem_data['type'] == 'tkinter_specific':
+                return tuple(elem_data['element']['rect'])
+            if elem_data['type'] == 'chrome_specific':
+                return tuple(elem_data['element'][2])
+            if elem_data['type'] == 'uiautomation':
+                return tuple(elem_data['info']['bounding_rect'])
+            if elem_data['element'] is not None:
+                rect = elem_data['element'].rectangle()
+                return (rect.left, rect.top, rect.right, rect.bottom)
+        except Exception:
+            logging.error("_element_rect error", exc_info=True)
+        return None
+
+    def describe(self, x, y, elem_data):
+        """検出結果を JSON に変換できる辞書にします。"""
+        kind = elem_data['type']
+        record = {"strategy": kind}
+        if kind == 'tkinter_specific':
+            tk_elem = elem_data['element']
+            record.update(
+                name=tk_elem['window_text'],
+                class_name=tk_elem['class_name'],
+                handle=tk_elem['hwnd'],
+                code=call("dlg.child_window", class_name=tk_elem['class_name'], title=tk_elem['window_text']) + ".click()",
+            )
+        elif kind == 'chrome_specific':
+            hwnd, class_name, _ = elem_data['element']
+            record.update(class_name=class_name, handle=hwnd, code=call("pyautogui.click", x, y))
+        elif kind == 'accessibility':
+            acc_info = elem_data['info']
+            record.update(
+                name=acc_info['name'],
+                role=acc_info['role'],
+                value=acc_info['value'],
+                code=call("pyautogui.click", x, y),
+            )
+        elif kind == 'uiautomation':
+            uia_info = elem_data['info']
+            criteria = {"auto_id": uia_info['automation_id']} if uia_info['automation_id'] else {"title": uia_info['name']}
+            record.update(
+                name=uia_info['name'],
+                class_name=uia_info['class_name'],
+                control_type=uia_info['control_type'],
+                automation_id=uia_info['automation_id'],
+                code=call("dlg.child_window", **criteria) + ".click_input()",
+            )
+        else:
+            elem = elem_data['element']
+            info = elem.element_info
+            record.update(
+                name=elem.window_text(),
+                class_name=info.class_name,
+                control_type=info.control_type,
+                automation_id=info.automation_id,
+                code=self.generate_code_example(elem),
+            )
+        rect = self.element_rect(elem_data)
+        record["rect"] = list(rect) if rect else None
+        return record
+
+    def inspect_points(self, points, backend, top_hwnd=None):
+        """座標を順に検査し、1点につき1件の記録を返すジェネレーターです。
+
+        同じ要素に当たった点は ``element`` の番号だけを返し、詳細は最初の
+        1回だけ含めます。``top_hwnd`` を渡すと、そのウィンドウが最前面に
+        ない点は検査せずに ``covered`` として返します。
+        """
+        seen = {}
+        for x, y in points:
+            started = time.perf_counter()
+            record = {"x": x, "y": y}
+            try:
+                if top_hwnd and self.element_cache.top_level_handle(win32gui.WindowFromPoint((x, y))) != top_hwnd:
+                    record["covered"] = True
+                    elem_data = None
+                else:
+                    elem_data = self.get_element_under_mouse(x, y, backend)
+                key = element_identity(elem_data)
+                if key is not None:
+                    record["element"] = seen.get(key)
+                    if record["element"] is None:
+                        record["element"] = seen[key] = len(seen)
+                        record.update(self.describe(x, y, elem_data))
+                record["found"] = key is not None
+            except Exception as e:
+                logging.error(f"inspect_points error at ({x}, {y})", exc_info=True)
+                record.update(found=False, error=str(e))
+            record["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            yield record
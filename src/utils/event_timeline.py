@@ -0,0 +1,96 @@
+"""Compact, column-oriented storage for recorded input events."""
+
+import threading
+from array import array
+
+EVENT_MOUSE = 0
+EVENT_KEY = 1
+EVENT_MOVE = 2
+
+FLAG_PRESSED = 0x01
+
+
+class EventTimeline:
+    """Append-only timeline of mouse, move and key events stored as typed arrays.
+
+    Each field lives in its own ``array`` column instead of one dict per
+    event, so an event costs about 20 bytes: kind (1), name code (2),
+    flags (1), x (4), y (4) and a monotonic timestamp (8). Button and key
+    names are interned into a small string table and stored as codes.
+    When ``journal`` is set, every appended event is also handed to it so
+    it reaches the disk while recording.
+    """
+
+    def __init__(self):
+        """空のタイムラインを作成します。"""
+        self._lock = threading.Lock()
+        self._names = []
+        self._name_codes = {}
+        self.journal = None
+        self.clear()
+
+    def clear(self):
+        """記録済みのイベントをすべて破棄します。"""
+        with self._lock:
+            self.kinds = array("B")
+            self.codes = array("H")
+            self.flags = array("B")
+            self.xs = array("i")
+            self.ys = array("i")
+            self.times = array("d")
+
+    def _intern(self, name):
+        """名前を文字列表に登録し、そのコードを返します。"""
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def append(self, kind, name, pressed, x, y, timestamp):
+        """イベントを1件追加します。"""
+        with self._lock:
+            self.kinds.append(kind)
+            self.codes.append(self._intern(name))
+            self.flags.append(FLAG_PRESSED if pressed else 0)
+            self.xs.append(x)
+            self.ys.append(y)
+            self.times.append(timestamp)
+        if self.journal is not None:
+            self.journal.append(kind, name, pressed, x, y, timestamp)
+
+    def append_mouse(self, button, pressed, x, y, timestamp):
+        """マウスボタンの押下・解放を追加します。"""
+        self.append(EVENT_MOUSE, button, pressed, x, y, timestamp)
+
+    def append_key(self, key, pressed, timestamp):
+        """キーの押下・解放を追加します。"""
+        self.append(EVENT_KEY, key, pressed, 0, 0, timestamp)
+
+    def append_move(self, x, y, timestamp):
+        """マウスの移動を追加します。"""
+        self.append(EVENT_MOVE, "", False, x, y, timestamp)
+
+    def __len__(self):
+        # times は最後に追加される列なので、記録中でも揃った件数を返す
+        return len(self.times)
+
+    def event(self, index):
+        """``(kind, name, pressed, x, y, timestamp)`` を返します。"""
+        return (
+            self.kinds[index],
+            self._names[self.codes[index]],
+            bool(self.flags[index] & FLAG_PRESSED),
+            self.xs[index],
+            self.ys[index],
+            self.times[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.event(index)
+
+    def nbytes(self):
+        """イベント列が使用しているバイト数を返します。"""
+        columns = (self.kinds, self.codes, self.flags, self.xs, self.ys, self.times)
+        return sum(column.itemsize * len(column) for column in columns)
@@ -1,2 +1,15 @@
-"""Miscellaneous helper utilities (currently empty)."""
+"""Miscellaneous helper utilities."""
 
+import os
+
+import win32gui
+import win32process
+
+
+def is_own_window_active():
+    """このアプリのウィンドウが前面にあるかどうかを返します。
+
+    グローバルなキーボードフックで、自分自身への入力を記録しないために使います。
+    """
+    _, pid = win32process.GetWindowThreadProcessId(win32gui.GetForegroundWindow())
+    return pid == os.getpid()
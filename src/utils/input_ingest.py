@@ -0,0 +1,85 @@
+"""Low-overhead ingestion of global mouse hook events."""
+
+import time
+from collections import deque
+
+
+class ClickIngestor:
+    """Receives pynput click callbacks and queues them for the Tk main loop.
+
+    The hook callback only compares the hook's own coordinates with a cached
+    copy of the application window geometry and appends a tuple to a bounded
+    ``deque``. ``deque.append``/``popleft`` are atomic in CPython, so the hook
+    and the Tk loop never take a lock; when the consumer falls behind, the
+    oldest events are dropped and counted.
+    """
+
+    def __init__(self, maxlen=4096):
+        """キューの最大長を設定します。"""
+        self.maxlen = maxlen
+        self._queue = deque(maxlen=maxlen)
+        # (left, top, right, bottom)。ウィンドウ表示前は何も含まない矩形にする
+        self._geometry = (0, 0, -1, -1)
+        # 移動イベントは、記録中かボタンを押している間（ドラッグ中）だけ受け取る
+        self.capture_moves = False
+        self._buttons_down = 0
+        self.received = 0
+        self.dropped = 0
+        self.callback_ns_total = 0
+        self.callback_ns_max = 0
+
+    def update_geometry(self, left, top, width, height):
+        """アプリのウィンドウ位置とサイズを更新します（Tk スレッドから呼び出します）。"""
+        self._geometry = (left, top, left + width, top + height)
+
+    def is_inside(self, x, y):
+        """座標がアプリのウィンドウ内かどうかを返します。"""
+        left, top, right, bottom = self._geometry
+        return left <= x <= right and top <= y <= bottom
+
+    def on_click(self, x, y, button, pressed):
+        """マウスフックのコールバック。ウィンドウ外のイベントだけをキューに入れます。"""
+        start = time.perf_counter_ns()
+        self._buttons_down = max(0, self._buttons_down + (1 if pressed else -1))
+        left, top, right, bottom = self._geometry
+        if not (left <= x <= right and top <= y <= bottom):
+            if len(self._queue) == self.maxlen:
+                self.dropped += 1
+            self._queue.append((x, y, button, pressed, time.monotonic()))
+            self.received += 1
+        elapsed = time.perf_counter_ns() - start
+        self.callback_ns_total += elapsed
+        if elapsed > self.callback_ns_max:
+            self.callback_ns_max = elapsed
+
+    def on_move(self, x, y):
+        """マウス移動フックのコールバック。記録中かドラッグ中のときだけキューに入れます。
+
+        移動イベントの ``button`` と ``pressed`` は ``None`` になります。
+        """
+        if not (self.capture_moves or self._buttons_down):
+            return
+        left, top, right, bottom = self._geometry
+        if not (left <= x <= right and top <= y <= bottom):
+            if len(self._queue) == self.maxlen:
+                self.dropped += 1
+            self._queue.append((x, y, None, None, time.monotonic()))
+
+    def drain(self):
+        """キューにたまったイベントをすべて取り出して返します。"""
+        events = []
+        queue = self._queue
+        while True:
+            try:
+                events.append(queue.popleft())
+            except IndexError:
+                return events
+
+    def stats(self):
+        """受信数・破棄数とコールバック処理時間（マイクロ秒）を返します。"""
+        return {
+            "received": self.received,
+            "dropped": self.dropped,
+            "callback_avg_us": self.callback_ns_total / self.received / 1000 if self.received else 0.0,
+            "callback_max_us": self.callback_ns_max / 1000,
+        }
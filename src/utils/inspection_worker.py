@@ -0,0 +1,126 @@
+"""Background worker that runs UI element inspections off the hotkey thread."""
+
+import logging
+import threading
+import time
+
+
+class InspectionCancelled(Exception):
+    """Raised inside an inspection when a newer request has superseded it."""
+
+
+class InspectionJob:
+    """A single inspection request for the point ``(x, y)``."""
+
+    def __init__(self, job_id, x, y, backend, requested_at):
+        """ジョブの座標・バックエンド・要求時刻を保持します。"""
+        self.job_id = job_id
+        self.x = x
+        self.y = y
+        self.backend = backend
+        self.requested_at = requested_at
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """ジョブをキャンセル済みにします。"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """キャンセル済みかどうかを返します。"""
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        """キャンセル済みなら ``InspectionCancelled`` を送出します。"""
+        if self._cancelled.is_set():
+            raise InspectionCancelled()
+
+
+class InspectionWorker:
+    """Runs inspection jobs on a dedicated thread where the latest request wins.
+
+    The queue holds at most one pending job: submitting a new job cancels the
+    pending one and the one currently running, so repeated hotkey presses never
+    pile up. Results are handed back to the Tk main loop with ``root.after``.
+    """
+
+    def __init__(self, root, inspect_func, on_result):
+        """ワーカースレッドを作成して開始します。
+
+        ``inspect_func(job)`` はワーカースレッド上で呼ばれ、結果を返します。
+        ``on_result(job, result)`` は Tk のメインループ上で呼ばれます。
+        """
+        self.root = root
+        self.inspect_func = inspect_func
+        self.on_result = on_result
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = None
+        self._current = None
+        self._latest_id = 0
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="InspectionWorker", daemon=True)
+        self._thread.start()
+
+    def submit(self, x, y, backend):
+        """新しい検査ジョブを投入し、古いジョブをキャンセルします。"""
+        with self._lock:
+            self._latest_id += 1
+            job = InspectionJob(self._latest_id, x, y, backend, time.perf_counter())
+            if self._pending is not None:
+                self._pending.cancel()
+            if self._current is not None:
+                self._current.cancel()
+            self._pending = job
+        self._wakeup.set()
+        return job
+
+    def stop(self):
+        """ワーカースレッドを停止します。"""
+        with self._lock:
+            self._stopped = True
+            if self._pending is not None:
+                self._pending.cancel()
+            if self._current is not None:
+                self._current.cancel()
+        self._wakeup.set()
+
+    def _run(self):
+        """ジョブを1件ずつ取り出して実行します。"""
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                if self._stopped:
+                    return
+                job = self._pending
+                self._pending = None
+                self._current = job
+                self._wakeup.clear()
+            if job is None or job.is_cancelled():
+                continue
+
+            try:
+                result = self.inspect_func(job)
+            except InspectionCancelled:
+                continue
+            except Exception:
+                logging.error("InspectionWorker job error", exc_info=True)
+                continue
+            finally:
+                with self._lock:
+                    self._current = None
+
+            if job.is_cancelled():
+                continue
+            try:
+                self.root.after(0, self._deliver, job, result)
+            except RuntimeError:
+                # Tk のメインループが既に終了している
+                return
+
+    def _deliver(self, job, result):
+        """メインループ上で最新ジョブの結果だけを通知します。"""
+        if job.is_cancelled() or job.job_id != self._latest_id:
+            return
+        self.on_result(job, result)
@@ -2,9 +2,23 @@
 
 import win32gui
 
+from .codegen import call
+
 
 def format_inspector_output(uia_info, win32_info):
     """Return a nicely formatted string for UIA and Win32 element info."""
+    uia_path = call(
+        "dlg.child_window",
+        title=uia_info.get("name", ""),
+        control_type=uia_info.get("control_type", ""),
+        auto_id=uia_info.get("automation_id", ""),
+    )
+    win32_path = call(
+        "dlg.child_window",
+        title=win32_info.get("window_text", ""),
+        class_name=win32_info.get("class_name", ""),
+        handle=win32_info.get("handle", ""),
+    )
     uia = f'''[UIA]
 === 要素情報 ===
 タイトル: {uia_info.get("name", "")}
@@ -14,7 +28,7 @@ def format_inspector_output(uia_info, win32_info):
 矩形: {uia_info.get("rectangle", "")}
 
 階層パス例:
-dlg.child_window(title="{uia_info.get("name", "")}", control_type="{uia_info.get("control_type", "")}", automation_id="{uia_info.get("automation_id", "")}")
+{uia_path}
 
 パターン例:
 .click_input()   # クリック
@@ -34,7 +48,7 @@ dlg.child_window(title="{uia_info.get("name", "")}", control_type="{uia_info.get
 矩形: {win32_info.get("rectangle", "")}
 
 階層パス例:
-dlg.child_window(title="{win32_info.get("window_text", "")}", class_name="{win32_info.get("class_name", "")}", handle={win32_info.get("handle", "")})
+{win32_path}
 
 パターン例:
 .click()         # クリック
@@ -0,0 +1,178 @@
+"""Streaming coalescer that turns raw key events into compact PyAutoGUI calls."""
+
+from ..automation import keyboard
+from .codegen import render_step
+from .key_names import MODIFIER_KEYS
+
+STEP_WRITE = "write"
+STEP_HOTKEY = "hotkey"
+STEP_PRESS = "press"
+STEP_KEY_DOWN = "keyDown"
+STEP_KEY_UP = "keyUp"
+
+# これらの修飾キーが押されている間の入力は hotkey にする（Shift は大文字入力にも使うため除く）
+_COMBINING_MODIFIERS = MODIFIER_KEYS - {"shift", "shiftright"}
+
+
+def _as_text(name):
+    """文字として write にまとめられるキーなら、その文字を返します。"""
+    if name == "space":
+        return " "
+    if len(name) == 1 and name.isprintable():
+        return name
+    return None
+
+
+class KeyCoalescer:
+    """Incrementally converts key press/release events into steps.
+
+    Steps are ``(timestamp, kind, value, count)`` tuples passed to ``emit``:
+
+    * consecutive printable keys become one ``write`` step,
+    * keys pressed while Ctrl/Alt/Win (or Shift with a non-printable key)
+      are held become a ``hotkey`` step,
+    * repeats of the same non-printable key, including auto-repeat, become
+      one ``press`` step with ``count`` presses,
+    * a modifier tapped on its own becomes a ``press`` step,
+    * modifiers held while the mouse is used (Ctrl+click, Shift+click) become
+      ``keyDown`` before the mouse step and ``keyUp`` when released; call
+      ``hold_modifiers`` before emitting a mouse step and
+      ``release_modifiers`` at the end of the recording.
+
+    Each event is handled in constant time, and a step is emitted as soon
+    as the next event shows it is complete, so the coalescer keeps up with
+    fast typing. Call ``flush`` to emit whatever is still buffered.
+    """
+
+    def __init__(self, emit):
+        """ステップの出力先を設定します。"""
+        self.emit = emit
+        self._held = []
+        self._modifier_used = False
+        self._text = []
+        self._text_t = None
+        self._pending = None
+        # マウス操作のために keyDown を出力済みの修飾キー
+        self._down = []
+        self._last_t = None
+
+    def feed(self, name, pressed, timestamp):
+        """キーイベントを1件処理します。"""
+        self._last_t = timestamp
+        if pressed:
+            self._on_press(name, timestamp)
+        else:
+            self._on_release(name, timestamp)
+
+    def _on_press(self, name, t):
+        if name in MODIFIER_KEYS:
+            if name not in self._held:
+                self._held.append(name)
+                if len(self._held) == 1:
+                    self._modifier_used = False
+            return
+
+        text = _as_text(name)
+        combining = any(key in _COMBINING_MODIFIERS for key in self._held)
+        if combining or (self._held and text is None):
+            self._flush_text()
+            self._flush_pending()
+            self._modifier_used = True
+            # keyDown 済みの修飾キーを hotkey に含めると、途中で離されてしまう
+            keys = tuple(key for key in self._held if key not in self._down) + (name,)
+            if len(keys) == 1:
+                self.emit((t, STEP_PRESS, name, 1))
+            else:
+                self.emit((t, STEP_HOTKEY, keys, 1))
+            return
+
+        if text is not None:
+            self._flush_pending()
+            if self._held:
+                self._modifier_used = True
+            if not self._text:
+                self._text_t = t
+            self._text.append(text)
+            return
+
+        self._flush_text()
+        if self._pending is not None and self._pending[1] == name:
+            pending_t, _, count = self._pending
+            self._pending = (pending_t, name, count + 1)
+        else:
+            self._flush_pending()
+            self._pending = (t, name, 1)
+
+    def _on_release(self, name, t):
+        if name not in self._held:
+            return
+        self._held.remove(name)
+        if name in self._down:
+            self._flush_text()
+            self._flush_pending()
+            self._down.remove(name)
+            self.emit((t, STEP_KEY_UP, name, 1))
+            return
+        if not self._held and not self._modifier_used:
+            # 修飾キーだけを単独で押して離した
+            self._flush_text()
+            self._flush_pending()
+            self.emit((t, STEP_PRESS, name, 1))
+
+    def _flush_text(self):
+        if self._text:
+            self.emit((self._text_t, STEP_WRITE, "".join(self._text), 1))
+            self._text = []
+            self._text_t = None
+
+    def _flush_pending(self):
+        if self._pending is not None:
+            t, name, count = self._pending
+            self.emit((t, STEP_PRESS, name, count))
+            self._pending = None
+
+    def hold_modifiers(self, timestamp):
+        """マウス操作の前に呼び出し、押されている修飾キーを keyDown として出力します。
+
+        バッファの入力も先に出力します。keyDown した修飾キーは、離されたときに keyUp になります。
+        """
+        self._last_t = timestamp
+        self.flush()
+        for name in self._held:
+            if name not in self._down:
+                self._down.append(name)
+                self.emit((timestamp, STEP_KEY_DOWN, name, 1))
+        if self._held:
+            # 修飾キーをマウス操作に使ったので、離しても単独の press にしない
+            self._modifier_used = True
+
+    def flush(self):
+        """バッファに残っている入力をすべて出力します。"""
+        self._flush_text()
+        self._flush_pending()
+
+    def release_modifiers(self):
+        """keyDown したまま離されていない修飾キーを keyUp します（記録の終わりに呼びます）。"""
+        self.flush()
+        for name in self._down:
+            self.emit((self._last_t, STEP_KEY_UP, name, 1))
+        self._down = []
+
+
+def key_step(key_event):
+    """まとめられたキー操作を ``codegen.Step`` にします。"""
+    _, kind, value, count = key_event
+    if kind == STEP_WRITE:
+        return keyboard.write(value)
+    if kind == STEP_HOTKEY:
+        return keyboard.hotkey(*value)
+    if kind == STEP_KEY_DOWN:
+        return keyboard.key_down(value)
+    if kind == STEP_KEY_UP:
+        return keyboard.key_up(value)
+    return keyboard.press(value, count)
+
+
+def key_step_code(key_event):
+    """まとめられたキー操作を PyAutoGUI のコード1行にします。"""
+    return render_step(key_step(key_event))
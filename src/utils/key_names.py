@@ -0,0 +1,56 @@
+"""Translation of pynput key objects into PyAutoGUI key names."""
+
+# pynput の Key 名と PyAutoGUI のキー名が異なるもの
+_SPECIAL_KEY_NAMES = {
+    "alt_l": "alt",
+    "alt_r": "altright",
+    "alt_gr": "altright",
+    "ctrl_l": "ctrl",
+    "ctrl_r": "ctrlright",
+    "shift_l": "shift",
+    "shift_r": "shiftright",
+    "cmd": "win",
+    "cmd_l": "win",
+    "cmd_r": "winright",
+    "page_up": "pageup",
+    "page_down": "pagedown",
+    "caps_lock": "capslock",
+    "num_lock": "numlock",
+    "scroll_lock": "scrolllock",
+    "print_screen": "printscreen",
+    "menu": "apps",
+    "media_play_pause": "playpause",
+    "media_next": "nexttrack",
+    "media_previous": "prevtrack",
+    "media_volume_up": "volumeup",
+    "media_volume_down": "volumedown",
+    "media_volume_mute": "volumemute",
+}
+
+MODIFIER_KEYS = frozenset(
+    ["ctrl", "ctrlright", "shift", "shiftright", "alt", "altright", "win", "winright"]
+)
+
+
+def pynput_key_name(key):
+    """pynput のキーを PyAutoGUI のキー名に変換します。変換できなければ ``None``。
+
+    Ctrl を押しながらの入力では ``char`` が制御文字になるため、
+    仮想キーコードから英数字を復元します。
+    """
+    name = getattr(key, "name", None)
+    if name:
+        return _SPECIAL_KEY_NAMES.get(name, name)
+
+    char = getattr(key, "char", None)
+    if char and char.isprintable():
+        return char
+
+    vk = getattr(key, "vk", None)
+    if vk is None:
+        return None
+    if 0x30 <= vk <= 0x39 or 0x41 <= vk <= 0x5A:
+        return chr(vk).lower()
+    if 0x60 <= vk <= 0x69:
+        return f"num{vk - 0x60}"
+    return None
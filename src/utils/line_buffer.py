@@ -0,0 +1,203 @@
+"""Line-offset-indexed text buffer backing the virtualized text viewer."""
+
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+
+_NEWLINE = re.compile(rb"\n")
+# 後方検索で一度に調べる行数
+BACKWARD_SEARCH_LINES = 4096
+
+
+class LineBuffer:
+    """UTF-8 text kept as one byte buffer plus the offset of every line start.
+
+    Appending only scans the new bytes for newlines, fetching any line is a
+    slice of the buffer, and a byte offset maps back to its line with a
+    binary search over the offsets. Saved dumps can be opened as a
+    read-only memory map, so a multi-megabyte file is indexed without
+    being copied into memory; the first ``append`` after that copies it
+    into a writable buffer.
+    """
+
+    def __init__(self, text=""):
+        """空のバッファを作成し、``text`` があれば追加します。"""
+        self._data = bytearray()
+        self._mmap = None
+        self._file = None
+        self.starts = array("q", [0])
+        if text:
+            self.append(text)
+
+    @classmethod
+    def from_file(cls, path):
+        """ファイルを読み取り専用のメモリマップとして開き、行の索引を作ります。"""
+        buffer = cls()
+        file = open(path, "rb")
+        try:
+            if file.seek(0, 2) == 0:
+                file.close()
+                return buffer
+            buffer._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            file.close()
+            raise
+        buffer._file = file
+        buffer._data = buffer._mmap
+        buffer._index_from(0)
+        return buffer
+
+    def close(self):
+        """メモリマップを使っていれば閉じます。"""
+        if self._mmap is not None:
+            self._data = bytearray()
+            self.starts = array("q", [0])
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def _index_from(self, offset):
+        """``offset`` 以降の改行を探し、行の開始位置を索引に追加します。"""
+        self.starts.extend(match.end() for match in _NEWLINE.finditer(self._data, offset))
+
+    def append(self, text):
+        """文字列を末尾に追加します。"""
+        if self._mmap is not None:
+            data = bytearray(self._mmap)
+            self.close()
+            self._data = data
+            self.starts = array("q", [0])
+            self._index_from(0)
+        offset = len(self._data)
+        self._data += text.encode("utf-8")
+        self._index_from(offset)
+
+    def clear(self):
+        """内容をすべて消去します。"""
+        self.close()
+        self._data = bytearray()
+        self.starts = array("q", [0])
+
+    def __len__(self):
+        """行数を返します（末尾が改行なら、最後の空行も1行と数えます）。"""
+        return len(self.starts)
+
+    @property
+    def nbytes(self):
+        """内容のバイト数を返します。"""
+        return len(self._data)
+
+    def _line_bounds(self, index):
+        """行の開始と終了（改行を除く）のバイト位置を返します。
+
+        CRLF で保存されたファイルも読めるよう、行末の ``\\r`` も除きます。
+        """
+        start = self.starts[index]
+        if index + 1 < len(self.starts):
+            end = self.starts[index + 1] - 1
+        else:
+            end = len(self._data)
+        if end > start and self._data[end - 1] == 0x0D:
+            end -= 1
+        return start, end
+
+    def line(self, index):
+        """``index`` 行目（0始まり）の文字列を返します。"""
+        start, end = self._line_bounds(index)
+        return bytes(self._data[start:end]).decode("utf-8", "replace")
+
+    def lines(self, first, last):
+        """``first`` 行目から ``last`` 行目の手前までの文字列のリストを返します。"""
+        first = max(0, first)
+        last = min(len(self.starts), last)
+        if first >= last:
+            return []
+        start = self.starts[first]
+        end = self._line_bounds(last - 1)[1]
+        text = bytes(self._data[start:end]).decode("utf-8", "replace")
+        if "\r" in text:
+            return [line[:-1] if line.endswith("\r") else line for line in text.split("\n")]
+        return text.split("\n")
+
+    def text(self, first=0, last=None):
+        """指定した範囲の行（省略時は全体）を1つの文字列で返します。"""
+        if last is None:
+            last = len(self.starts)
+        return "\n".join(self.lines(first, last))
+
+    def write_to(self, file):
+        """内容をそのままバイナリファイルに書き出します。"""
+        file.write(self._data)
+
+    def line_of_offset(self, offset):
+        """バイト位置を含む行の番号を返します。"""
+        return bisect_right(self.starts, offset) - 1
+
+    def position(self, offset):
+        """バイト位置を ``(行, 行内の文字位置)`` に変換します。"""
+        index = self.line_of_offset(offset)
+        start = self.starts[index]
+        return index, len(bytes(self._data[start:offset]).decode("utf-8", "replace"))
+
+    def offset(self, index, column=0):
+        """``(行, 行内の文字位置)`` をバイト位置に変換します。"""
+        index = min(max(0, index), len(self.starts) - 1)
+        start, end = self._line_bounds(index)
+        if not column:
+            return start
+        prefix = bytes(self._data[start:end]).decode("utf-8", "replace")[:column]
+        return start + len(prefix.encode("utf-8"))
+
+    def search(self, pattern, line=0, column=0, backward=False):
+        """コンパイル済みのバイト列の正規表現で、指定位置から次（または前）の一致を探します。
+
+        見つかれば ``(行, 文字位置, 文字数)`` を、なければ ``None`` を返します。
+        末尾（先頭）まで見つからなければ、反対側から折り返して探します。
+        """
+        origin = self.offset(line, column)
+        found = self._search_backward(pattern, origin) if backward else self._search_forward(pattern, origin)
+        if found is None:
+            return None
+        start, end = found
+        index, col = self.position(start)
+        return index, col, len(bytes(self._data[start:end]).decode("utf-8", "replace"))
+
+    def _search_forward(self, pattern, origin):
+        """``origin`` 以降で最初の一致の範囲を返します。なければ先頭から探します。"""
+        for start in (origin, 0):
+            match = pattern.search(self._data, start)
+            if match is not None and match.end() > match.start():
+                return match.span()
+        return None
+
+    def _search_backward(self, pattern, origin):
+        """``origin`` より前で最後の一致の範囲を返します。なければ末尾から探します。
+
+        行単位の区間に分けて後ろから調べるので、巨大な内容でも、近くに一致が
+        あればすぐに終わります。
+        """
+        for limit in (origin, len(self._data)):
+            last_line = self.line_of_offset(limit)
+            while last_line >= 0:
+                first_line = max(0, last_line - BACKWARD_SEARCH_LINES)
+                found = None
+                for match in pattern.finditer(self._data, self.starts[first_line], limit):
+                    if match.end() > match.start():
+                        found = match.span()
+                if found is not None:
+                    return found
+                limit = self.starts[first_line]
+                last_line = first_line - 1
+        return None
+
+
+def compile_search(text, regex=False, ignore_case=True):
+    """検索文字列を、``LineBuffer.search`` に渡すバイト列の正規表現にします。
+
+    正規表現として正しくなければ ``re.error`` を送出します。
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    if regex:
+        return re.compile(text.encode("utf-8"), flags)
+    return re.compile(re.escape(text.encode("utf-8")), flags)
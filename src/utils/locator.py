@@ -0,0 +1,176 @@
+"""Synthesis of minimal unique pywinauto locators."""
+
+from bisect import bisect_left
+from itertools import combinations
+
+from .codegen import call
+from .element_cache import element_key
+
+# 条件に使うプロパティ。組み合わせが同じ大きさなら、この順に優先する
+LOCATOR_FIELDS = ("automation_id", "title", "control_type", "class_name")
+# ``child_window`` での引数名
+CRITERIA_NAMES = {
+    "automation_id": "auto_id",
+    "title": "title",
+    "control_type": "control_type",
+    "class_name": "class_name",
+}
+# 祖先をたどってパスを作るときの最大の深さ
+MAX_ANCESTOR_LEVELS = 8
+
+
+def element_properties(wrapper):
+    """ロケーターに使うプロパティを ``LOCATOR_FIELDS`` の順のタプルで返します。"""
+    info = wrapper.element_info
+    return (
+        getattr(info, "automation_id", None) or "",
+        info.name or "",
+        getattr(info, "control_type", None) or "",
+        info.class_name or "",
+    )
+
+
+def _subsets(mask_fields):
+    """使えるプロパティの組み合わせを、小さい順・優先順に返します。"""
+    for size in range(1, len(mask_fields) + 1):
+        yield from combinations(mask_fields, size)
+
+
+class Locator:
+    """Chain of ``child_window`` criteria, outermost ancestor first."""
+
+    def __init__(self, levels):
+        """各階層の条件（``[(引数名, 値), ...]`` のリスト）を保持します。"""
+        self.levels = levels
+
+    def uses_found_index(self):
+        """順番（``found_index``）に頼ったロケーターかどうかを返します。"""
+        return any(name == "found_index" for level in self.levels for name, _ in level)
+
+    def criteria(self):
+        """最も内側（対象要素）の条件を辞書で返します。"""
+        return dict(self.levels[-1]) if self.levels else {}
+
+    def code(self, parent="dlg"):
+        """``dlg.child_window(...)`` 形式のコードを返します。"""
+        code = parent
+        for level in self.levels:
+            code = call(f"{code}.child_window", **dict(level))
+        return code
+
+
+class LocatorIndex:
+    """Index of a window's descendants for finding unique locators.
+
+    The subtree below ``root`` is walked once in pre-order, which is the
+    order pywinauto reports matches in. Hidden elements are indexed too, so
+    a ``found_index`` counted here is only valid with ``visible_only=False``
+    (pywinauto otherwise applies it after dropping invisible matches). For
+    every property combination that is queried, matching element positions
+    are grouped by value into sorted lists, so the number of matches inside
+    any subtree (a contiguous pre-order range) is two bisections away.
+    """
+
+    def __init__(self, root, children=None):
+        """``root`` の子孫をたどって索引を作ります。``children`` で子要素の取得方法を差し替えられます。"""
+        if children is None:
+            children = lambda elem: elem.children()
+        self.properties = []
+        self.parents = []
+        self.ends = []
+        self._positions = {}
+        self._groups = {}
+
+        stack = [(child, -1) for child in reversed(children(root))]
+        open_nodes = []
+        while stack:
+            elem, parent = stack.pop()
+            index = len(self.properties)
+            # 兄弟やおじの要素に進んだら、閉じた部分木の終端を記録する
+            while open_nodes and open_nodes[-1] != parent:
+                self.ends[open_nodes.pop()] = index
+            open_nodes.append(index)
+            self.properties.append(element_properties(elem))
+            self.parents.append(parent)
+            self.ends.append(None)
+            key = element_key(elem)
+            if key is not None:
+                self._positions[key] = index
+            for child in reversed(children(elem)):
+                stack.append((child, index))
+        for index in open_nodes:
+            self.ends[index] = len(self.properties)
+
+    def __len__(self):
+        """索引に含まれる要素数を返します。"""
+        return len(self.properties)
+
+    def position(self, elem):
+        """要素の先行順での位置を返します。索引にない場合は ``None`` です。"""
+        key = element_key(elem)
+        return self._positions.get(key) if key is not None else None
+
+    def _group(self, fields, values):
+        """指定プロパティの値が一致する要素の位置（昇順）を返します。"""
+        groups = self._groups.get(fields)
+        if groups is None:
+            columns = [LOCATOR_FIELDS.index(field) for field in fields]
+            groups = self._groups[fields] = {}
+            for index, props in enumerate(self.properties):
+                groups.setdefault(tuple(props[c] for c in columns), []).append(index)
+        return groups.get(values, [])
+
+    def _matches(self, fields, position, scope):
+        """``scope`` の部分木の中で、``position`` の要素と条件が一致する要素の位置を返します。"""
+        props = self.properties[position]
+        values = tuple(props[LOCATOR_FIELDS.index(field)] for field in fields)
+        group = self._group(fields, values)
+        if scope < 0:
+            return group
+        return group[bisect_left(group, scope + 1):bisect_left(group, self.ends[scope])]
+
+    def _level(self, fields, position):
+        """条件の組を ``child_window`` の引数のリストにします。"""
+        props = self.properties[position]
+        return [(CRITERIA_NAMES[field], props[LOCATOR_FIELDS.index(field)]) for field in fields]
+
+    def _unique_fields(self, position, scope):
+        """``scope`` の中で一意になる最小の条件の組を返します。なければ ``None`` です。"""
+        props = self.properties[position]
+        usable = [field for field, value in zip(LOCATOR_FIELDS, props) if value]
+        for fields in _subsets(usable):
+            if len(self._matches(fields, position, scope)) == 1:
+                return fields
+        return None
+
+    def minimal_locator(self, position):
+        """位置 ``position`` の要素を一意に特定する最小のロケーターを返します。
+
+        まずウィンドウ全体で一意な条件を探し、なければ一意に特定できる祖先を
+        経由したパスを、それでもだめなら ``found_index`` を付けた条件を返します。
+        ``found_index`` は非表示の要素も数えた順番なので、``visible_only=False`` も付けます。
+        """
+        fields = self._unique_fields(position, -1)
+        if fields is not None:
+            return Locator([self._level(fields, position)])
+
+        ancestor = self.parents[position]
+        for _ in range(MAX_ANCESTOR_LEVELS):
+            if ancestor < 0:
+                break
+            inner = self._unique_fields(position, ancestor)
+            if inner is not None:
+                outer = self._unique_fields(ancestor, -1)
+                if outer is not None:
+                    return Locator([self._level(outer, ancestor), self._level(inner, position)])
+            ancestor = self.parents[ancestor]
+
+        props = self.properties[position]
+        usable = tuple(field for field, value in zip(LOCATOR_FIELDS, props) if value)
+        if not usable:
+            return Locator([[("found_index", position), ("visible_only", False)]])
+        matches = self._matches(usable, position, -1)
+        level = self._level(usable, position)
+        level.append(("found_index", bisect_left(matches, position)))
+        level.append(("visible_only", False))
+        return Locator([level])
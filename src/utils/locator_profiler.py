@@ -0,0 +1,219 @@
+"""Timing of generated ``child_window`` locators against a live window."""
+
+import ast
+import logging
+import re
+import threading
+import time
+
+from pywinauto import findwindows
+from pywinauto.application import Application
+
+from .locator import Locator
+
+# 1つのロケーターを解決する回数
+DEFAULT_REPEAT = 20
+# 一度に計測するロケーターの上限
+MAX_PROFILE_LOCATORS = 50
+# 代替案を提案するのに必要な速度差（倍）
+SUGGESTION_MIN_SPEEDUP = 1.2
+
+_LOCATOR_START = re.compile(r"\b(?:dlg\.)?child_window\(")
+
+
+def _parse_chain(expression):
+    """式から ``child_window`` の呼び出し列を取り出し、各階層の条件を返します。"""
+    node = ast.parse(expression, mode="eval").body
+    levels = []
+    while isinstance(node, (ast.Call, ast.Attribute)):
+        if isinstance(node, ast.Attribute):
+            node = node.value
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if name == "child_window":
+            levels.append([(kw.arg, ast.literal_eval(kw.value)) for kw in node.keywords])
+        node = func
+    levels.reverse()
+    return levels
+
+
+def parse_locators(text, limit=MAX_PROFILE_LOCATORS):
+    """テキスト中の ``dlg.child_window(...)`` や ``child_window(...)`` を ``(code, levels)`` のリストで返します。
+
+    インスペクタのコード例と ``print_control_identifiers`` の出力の両方を読めます。
+    同じロケーターは1回だけ返します。
+    """
+    locators = []
+    seen = set()
+    for line in text.splitlines():
+        match = _LOCATOR_START.search(line)
+        if match is None:
+            continue
+        code = line[match.start():].strip()
+        try:
+            levels = _parse_chain(code)
+        except (SyntaxError, ValueError):
+            continue
+        key = repr(levels)
+        if not levels or key in seen:
+            continue
+        seen.add(key)
+        locators.append((Locator(levels).code(), levels))
+        if len(locators) >= limit:
+            break
+    return locators
+
+
+class LocatorProfile:
+    """Resolution timing of one locator and faster equivalents, if any."""
+
+    def __init__(self, code, levels):
+        """対象のロケーターを設定します。"""
+        self.code = code
+        self.levels = levels
+        self.median_ms = None
+        self.p95_ms = None
+        self.matches = 0
+        self.error = None
+        self.suggestions = []
+
+    def format(self):
+        """計測結果を表示用の文字列にします。"""
+        if self.error is not None:
+            return f"{self.code}\n  エラー: {self.error}"
+        lines = [
+            self.code,
+            f"  中央値 {self.median_ms:.1f} ms / p95 {self.p95_ms:.1f} ms / 一致数 {self.matches}",
+        ]
+        for code, median_ms, note in self.suggestions:
+            lines.append(f"  → より速い候補: {code}  ({median_ms:.1f} ms, {note})")
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values, fraction):
+    """ソート済みの値から百分位数を返します。"""
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LocatorProfiler:
+    """Resolves locators repeatedly under a window and reports their cost.
+
+    Each locator is resolved the way ``WindowSpecification`` does it, one
+    ``findwindows.find_elements`` call per ``child_window`` level, but
+    without the retry loop so a missing element fails immediately instead of
+    waiting for the find timeout.
+    """
+
+    def __init__(self, window, backend, repeat=DEFAULT_REPEAT):
+        """対象ウィンドウ（ラッパー）、バックエンド、繰り返し回数を設定します。"""
+        self.window = window
+        self.backend = backend
+        self.repeat = repeat
+
+    def _resolve(self, levels, count_last=False):
+        """ロケーターを解決し、最後の階層で一致した要素のリストを返します。"""
+        parent = self.window.element_info
+        matches = []
+        for depth, level in enumerate(levels):
+            criteria = dict(level)
+            last = depth == len(levels) - 1
+            if last and count_last:
+                criteria.pop("found_index", None)
+            matches = findwindows.find_elements(
+                parent=parent, top_level_only=False, backend=self.backend, **criteria
+            )
+            if not matches:
+                raise findwindows.ElementNotFoundError(criteria)
+            if not last:
+                if len(matches) > 1:
+                    raise findwindows.ElementAmbiguousError(
+                        f"{len(matches)} 件の要素が {criteria} に一致しました"
+                    )
+                parent = matches[0]
+        return matches
+
+    def _time(self, levels):
+        """ロケーターを繰り返し解決し、``(中央値, p95)`` をミリ秒で返します。"""
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            self._resolve(levels)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        return _percentile(samples, 0.5), _percentile(samples, 0.95)
+
+    def _candidates(self, element_info, levels):
+        """同じ要素を指す、より単純なロケーターの候補を返します。"""
+        candidates = []
+        automation_id = getattr(element_info, "automation_id", None)
+        if automation_id and levels != [[("auto_id", automation_id)]]:
+            candidates.append(([[("auto_id", automation_id)]], "auto_id のみ"))
+        handle = getattr(element_info, "handle", None)
+        if handle:
+            candidates.append(([[("handle", handle)]], "ハンドルは起動ごとに変わります"))
+        return candidates
+
+    def profile(self, code, levels):
+        """1つのロケーターを計測し、``LocatorProfile`` を返します。"""
+        result = LocatorProfile(code, levels)
+        try:
+            matches = self._resolve(levels, count_last=True)
+            result.matches = len(matches)
+            result.median_ms, result.p95_ms = self._time(levels)
+            target = self._resolve(levels)[0]
+            for candidate, note in self._candidates(target, levels):
+                try:
+                    if len(self._resolve(candidate, count_last=True)) != 1:
+                        continue
+                    median_ms, _ = self._time(candidate)
+                except Exception:
+                    continue
+                if median_ms * SUGGESTION_MIN_SPEEDUP <= result.median_ms:
+                    result.suggestions.append((Locator(candidate).code(), median_ms, note))
+        except findwindows.ElementNotFoundError:
+            result.error = "要素が見つかりませんでした"
+        except TypeError as e:
+            result.error = f"child_window に渡せない引数があります ({e})"
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        return result
+
+    def profile_all(self, locators, cancel_event=None):
+        """``parse_locators`` の結果をすべて計測します。"""
+        results = []
+        for code, levels in locators:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            results.append(self.profile(code, levels))
+        return results
+
+
+def format_profile_report(window_title, results):
+    """計測結果全体を、遅い順に並べた表示用の文字列にします。"""
+    ordered = sorted(results, key=lambda r: -1 if r.error else -(r.median_ms or 0))
+    header = f"【ロケーター解決時間】{window_title}（{len(results)} 件）"
+    return "\n".join([header] + [r.format() for r in ordered])
+
+
+def profile_in_background(root, window_title, backend, text, on_done, repeat=DEFAULT_REPEAT):
+    """テキスト中のロケーターを別スレッドで計測し、結果の文字列を ``on_done`` に渡します。"""
+    locators = parse_locators(text)
+
+    def run():
+        try:
+            if not locators:
+                report = "計測できるロケーターが見つかりませんでした。"
+            else:
+                app = Application(backend=backend).connect(title=window_title)
+                window = app.window(title=window_title).wrapper_object()
+                profiler = LocatorProfiler(window, backend, repeat)
+                report = format_profile_report(window_title, profiler.profile_all(locators))
+        except Exception as e:
+            logging.error("Locator profiling error", exc_info=True)
+            report = f"ロケーターの計測に失敗しました: {e}"
+        root.after(0, on_done, report)
+
+    threading.Thread(target=run, name="LocatorProfiler", daemon=True).start()
+    return len(locators)
@@ -0,0 +1,256 @@
+"""Background screenshot capture for recorded clicks."""
+
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# dHash の一辺の大きさ（ビット数はこの2乗）
+HASH_SIZE = 16
+# 近いとみなす dHash のハミング距離
+DEFAULT_HASH_DISTANCE = 6
+# ハッシュが近く、変化した領域が画面のこの割合以下なら重複とみなす（点滅するカーソルや時計など）
+DUPLICATE_MAX_FRACTION = 0.002
+# 保存する画像の合計サイズの上限（バイト）
+DEFAULT_MAX_DISK_BYTES = 500 * 1024 * 1024
+# エンコード待ちの生データの合計サイズの上限（バイト）
+DEFAULT_MAX_MEMORY_BYTES = 128 * 1024 * 1024
+# 変化した領域がこの割合より小さければ、その部分だけを保存する
+CROP_MAX_FRACTION = 0.5
+# 変化した領域を探すときの間引き間隔（ピクセル）
+DIFF_STRIDE = 8
+# 変化した領域のまわりに残す余白（ピクセル）
+CROP_PADDING = 16
+# 差分とみなす画素値の差
+DIFF_THRESHOLD = 12
+MANIFEST_NAME = "index.jsonl"
+
+
+def dhash(image, size=HASH_SIZE):
+    """画像の差分ハッシュ（``size * size`` ビット）を返します。"""
+    small = np.asarray(image.convert("L").resize((size + 1, size)), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    """2つのハッシュのハミング距離を返します。"""
+    return bin(a ^ b).count("1")
+
+
+def changed_region(previous, current):
+    """前の画面から変化した範囲 ``(left, top, right, bottom)`` を返します。変化がなければ ``None`` です。
+
+    画素を ``DIFF_STRIDE`` ごとに間引いて比べるため、4K 画面でも数ミリ秒で済みます。
+    """
+    if previous is None or previous.shape != current.shape:
+        return 0, 0, current.shape[1], current.shape[0]
+    a = previous[::DIFF_STRIDE, ::DIFF_STRIDE].astype(np.int16)
+    b = current[::DIFF_STRIDE, ::DIFF_STRIDE].astype(np.int16)
+    diff = np.abs(a - b).max(axis=-1) > DIFF_THRESHOLD
+    rows = np.flatnonzero(diff.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(diff.any(axis=0))
+    height, width = current.shape[:2]
+    return (
+        max(0, int(cols[0]) * DIFF_STRIDE - CROP_PADDING),
+        max(0, int(rows[0]) * DIFF_STRIDE - CROP_PADDING),
+        min(width, (int(cols[-1]) + 1) * DIFF_STRIDE + CROP_PADDING),
+        min(height, (int(rows[-1]) + 1) * DIFF_STRIDE + CROP_PADDING),
+    )
+
+
+def _area(region):
+    """範囲 ``(left, top, right, bottom)`` の面積を返します。"""
+    left, top, right, bottom = region
+    return (right - left) * (bottom - top)
+
+
+def _encode_png(raw, size, mode, path):
+    """生データを PNG として保存し、ファイルサイズを返します（別プロセスで実行）。"""
+    from PIL import Image
+
+    Image.frombytes(mode, size, raw).save(path, format="PNG", compress_level=3)
+    return os.path.getsize(path)
+
+
+def _grab_screen():
+    """画面全体を撮影します。"""
+    from PIL import ImageGrab
+
+    return ImageGrab.grab()
+
+
+class ScreenshotPipeline:
+    """Captures a screenshot per recorded click without stalling the GUI.
+
+    ``request`` only puts a small record on a queue. A capture thread grabs
+    the screen, drops frames whose perceptual hash (dHash) is within
+    ``hash_distance`` of the last saved frame and whose changed area is
+    negligible, crops to the region that changed since then, and hands the raw buffer to a process pool for PNG
+    encoding. Raw buffers waiting for the pool are capped at
+    ``max_memory_bytes`` (new frames are dropped beyond that), and the
+    oldest images are deleted once the files exceed ``max_disk_bytes``.
+    Every request gets a line in ``index.jsonl`` describing where its image
+    is, or which earlier step it duplicates.
+    """
+
+    def __init__(
+        self,
+        output_dir,
+        max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+        max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES,
+        hash_distance=DEFAULT_HASH_DISTANCE,
+        workers=2,
+        grab=_grab_screen,
+    ):
+        """保存先と上限を設定し、撮影スレッドとエンコード用のプロセスを起動します。"""
+        self.output_dir = output_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.hash_distance = hash_distance
+        self._grab = grab
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.captured = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.disk_bytes = 0
+        self.pending_bytes = 0
+
+        self._lock = threading.Lock()
+        self._files = deque()
+        self._manifest = open(os.path.join(output_dir, MANIFEST_NAME), "a", encoding="utf-8")
+        self._requests = queue.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._last_hash = None
+        self._last_step = None
+        self._last_frame = None
+        self._thread = threading.Thread(target=self._run, name="ScreenshotPipeline", daemon=True)
+        self._thread.start()
+
+    def request(self, step, x, y, timestamp):
+        """記録したステップのスクリーンショットを依頼します（すぐに戻ります）。"""
+        self._requests.put((step, x, y, timestamp))
+
+    def close(self, wait=False):
+        """撮影を終了します。``wait`` が真なら、残りのエンコードの完了まで待ちます。"""
+        self._requests.put(None)
+        if wait:
+            self._thread.join()
+
+    def stats(self):
+        """撮影数、重複数、破棄数、削除数、使用量を返します。"""
+        with self._lock:
+            return {
+                "captured": self.captured,
+                "duplicates": self.duplicates,
+                "dropped": self.dropped,
+                "evicted": self.evicted,
+                "disk_bytes": self.disk_bytes,
+                "pending_bytes": self.pending_bytes,
+            }
+
+    def _write_manifest(self, record):
+        """マニフェストに1行追加します。"""
+        with self._lock:
+            self._manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._manifest.flush()
+
+    def _run(self):
+        """依頼を順に処理します（撮影スレッド）。"""
+        try:
+            while True:
+                item = self._requests.get()
+                if item is None:
+                    break
+                try:
+                    self._capture(*item)
+                except Exception:
+                    logging.error("ScreenshotPipeline capture error", exc_info=True)
+        finally:
+            # 残りのエンコードを待ってからマニフェストを閉じる
+            self._executor.shutdown(wait=True)
+            with self._lock:
+                self._manifest.close()
+
+    def _capture(self, step, x, y, timestamp):
+        """画面を撮影し、重複でなければ変化した領域をエンコードに回します。"""
+        record = {"step": step, "t": timestamp, "x": x, "y": y}
+        image = self._grab()
+        image_hash = dhash(image)
+        frame = np.asarray(image.convert("RGB"))
+        region = changed_region(self._last_frame, frame)
+        screen_area = frame.shape[0] * frame.shape[1]
+        if self._last_hash is not None and (
+            region is None
+            or (
+                hamming(image_hash, self._last_hash) <= self.hash_distance
+                and _area(region) <= DUPLICATE_MAX_FRACTION * screen_area
+            )
+        ):
+            with self._lock:
+                self.duplicates += 1
+            record["duplicate_of"] = self._last_step
+            self._write_manifest(record)
+            return
+
+        if region is None or _area(region) > CROP_MAX_FRACTION * screen_area:
+            region = (0, 0, frame.shape[1], frame.shape[0])
+        left, top, right, bottom = region
+        raw = np.ascontiguousarray(frame[top:bottom, left:right]).tobytes()
+
+        with self._lock:
+            if self.pending_bytes + len(raw) > self.max_memory_bytes:
+                self.dropped += 1
+                record["dropped"] = True
+                accepted = False
+            else:
+                self.pending_bytes += len(raw)
+                self.captured += 1
+                accepted = True
+        if not accepted:
+            self._write_manifest(record)
+            return
+
+        self._last_hash = image_hash
+        self._last_step = step
+        self._last_frame = frame
+        name = f"step_{step:06d}.png"
+        path = os.path.join(self.output_dir, name)
+        record.update(file=name, region=[left, top, right, bottom])
+        future = self._executor.submit(_encode_png, raw, (right - left, bottom - top), "RGB", path)
+        future.add_done_callback(lambda f, size=len(raw), path=path, record=record: self._on_encoded(f, size, path, record))
+
+    def _on_encoded(self, future, raw_size, path, record):
+        """エンコードの完了を記録し、ディスクの上限を超えたら古い画像を削除します。"""
+        try:
+            file_size = future.result()
+        except Exception:
+            logging.error("ScreenshotPipeline encode error", exc_info=True)
+            with self._lock:
+                self.pending_bytes -= raw_size
+            return
+        evict = []
+        with self._lock:
+            self.pending_bytes -= raw_size
+            self._files.append((path, file_size))
+            self.disk_bytes += file_size
+            while self.disk_bytes > self.max_disk_bytes and len(self._files) > 1:
+                old_path, old_size = self._files.popleft()
+                self.disk_bytes -= old_size
+                self.evicted += 1
+                evict.append(old_path)
+        for old_path in evict:
+            try:
+                os.remove(old_path)
+            except OSError:
+                logging.error("ScreenshotPipeline eviction error", exc_info=True)
+        self._write_manifest(record)
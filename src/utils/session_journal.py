@@ -0,0 +1,217 @@
+"""Crash-safe, append-only binary journal of recorded input events."""
+
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+JOURNAL_MAGIC = b"ARJRNL01"
+JOURNAL_SUFFIX = ".journal"
+# これだけのイベントがたまるか、この時間が経ったらディスクに書き出して fsync する
+DEFAULT_SYNC_EVERY = 64
+DEFAULT_SYNC_INTERVAL_MS = 200
+# 残しておくジャーナルの数（古いものから削除する）
+DEFAULT_KEEP_JOURNALS = 20
+
+REC_SESSION = 1
+REC_NAME = 2
+REC_EVENT = 3
+REC_END = 4
+
+# レコードは「種類 (1) + 長さ (2)」のヘッダー、本体、ヘッダーと本体の CRC32 (4)
+_HEADER = struct.Struct("<BH")
+_CRC = struct.Struct("<I")
+_SESSION = struct.Struct("<dd")
+_NAME_CODE = struct.Struct("<H")
+# 種類 (1)、名前コード (2)、押下 (1)、x (4)、y (4)、時刻 (8) の 20 バイト
+_EVENT = struct.Struct("<BHBiid")
+
+JournalContents = namedtuple("JournalContents", "events started closed valid_bytes total_bytes")
+
+
+def _frame(record_type, payload):
+    """ヘッダーと CRC を付けたレコードのバイト列を返します。"""
+    header = _HEADER.pack(record_type, len(payload))
+    return header + payload + _CRC.pack(zlib.crc32(header + payload))
+
+
+class SessionJournal:
+    """Appends recorded events to a journal file from a background thread.
+
+    ``append`` only puts a tuple on a queue, so the input hooks never wait
+    for the disk. The writer thread packs events into 27-byte framed
+    records and commits them in groups: it writes and ``fsync``s once
+    ``sync_every`` events are pending or ``sync_interval_ms`` has passed
+    since the first uncommitted event, whichever comes first. Every record
+    carries a CRC32, so after a crash ``read_journal`` recovers everything
+    up to the last complete record. ``close`` writes an end marker that
+    tells the next start-up the session finished cleanly.
+    """
+
+    def __init__(self, path, sync_every=DEFAULT_SYNC_EVERY, sync_interval_ms=DEFAULT_SYNC_INTERVAL_MS):
+        """ジャーナルファイルを作成し、書き込みスレッドを起動します。"""
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval_ms / 1000
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(JOURNAL_MAGIC + _frame(REC_SESSION, _SESSION.pack(time.time(), time.monotonic())))
+        self._sync()
+
+        self.events = 0
+        self.syncs = 0
+        self.bytes_written = self._file.tell()
+        self._names = {}
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="SessionJournal", daemon=True)
+        self._thread.start()
+
+    def append(self, kind, name, pressed, x, y, timestamp):
+        """イベントを書き込み待ちに追加します（すぐに戻ります）。"""
+        self._queue.put((kind, name, pressed, x, y, timestamp))
+
+    def close(self, wait=True):
+        """残りを書き出し、終了マーカーを書いてファイルを閉じます。"""
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def stats(self):
+        """書き込んだイベント数、fsync の回数、ファイルサイズを返します。"""
+        return {"events": self.events, "syncs": self.syncs, "bytes": self.bytes_written}
+
+    def _sync(self):
+        """バッファをファイルに書き出し、ディスクまで反映させます。"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _encode(self, buffer, item):
+        """イベントをレコードにしてバッファに追加します。新しい名前は先に名前レコードを書きます。"""
+        kind, name, pressed, x, y, timestamp = item
+        code = self._names.get(name)
+        if code is None:
+            code = self._names[name] = len(self._names)
+            buffer += _frame(REC_NAME, _NAME_CODE.pack(code) + name.encode("utf-8"))
+        buffer += _frame(REC_EVENT, _EVENT.pack(kind, code, 1 if pressed else 0, x, y, timestamp))
+
+    def _commit(self, buffer, count):
+        """たまったレコードをまとめて書き込み、fsync します。"""
+        self._file.write(buffer)
+        self._sync()
+        self.events += count
+        self.syncs += 1
+        self.bytes_written += len(buffer)
+
+    def _run(self):
+        """キューからイベントを取り出し、まとめてディスクに書き込みます（書き込みスレッド）。"""
+        buffer = bytearray()
+        pending = 0
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = False
+                if item is None:
+                    break
+                if item is not False:
+                    self._encode(buffer, item)
+                    pending += 1
+                    if deadline is None:
+                        deadline = time.monotonic() + self.sync_interval
+                if pending and (pending >= self.sync_every or time.monotonic() >= deadline):
+                    self._commit(buffer, pending)
+                    buffer.clear()
+                    pending = 0
+                    deadline = None
+            buffer += _frame(REC_END, b"")
+            self._commit(buffer, pending)
+        except Exception:
+            logging.error("SessionJournal write error", exc_info=True)
+        finally:
+            self._file.close()
+
+
+def read_journal(path):
+    """ジャーナルを読み込みます。途中で壊れていれば、最後の完全なレコードまでを返します。
+
+    イベントは ``(kind, name, pressed, x, y, timestamp)`` のリストです。
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    events = []
+    started = None
+    closed = False
+    if not data.startswith(JOURNAL_MAGIC):
+        return JournalContents(events, started, closed, 0, len(data))
+    names = {}
+    offset = valid = len(JOURNAL_MAGIC)
+    while offset + _HEADER.size + _CRC.size <= len(data):
+        record_type, length = _HEADER.unpack_from(data, offset)
+        end = offset + _HEADER.size + length
+        if end + _CRC.size > len(data):
+            break
+        (crc,) = _CRC.unpack_from(data, end)
+        if zlib.crc32(data[offset:end]) != crc:
+            break
+        payload = data[offset + _HEADER.size:end]
+        if record_type == REC_EVENT:
+            kind, code, flags, x, y, timestamp = _EVENT.unpack(payload)
+            events.append((kind, names.get(code, ""), bool(flags), x, y, timestamp))
+        elif record_type == REC_NAME:
+            (code,) = _NAME_CODE.unpack_from(payload)
+            names[code] = payload[_NAME_CODE.size:].decode("utf-8")
+        elif record_type == REC_SESSION:
+            started = _SESSION.unpack(payload)[0]
+        elif record_type == REC_END:
+            closed = True
+        offset = valid = end + _CRC.size
+    return JournalContents(events, started, closed, valid, len(data))
+
+
+def seal_journal(path, valid_bytes):
+    """壊れた末尾を切り捨て、終了マーカーを書いて、次回の起動で復元対象にならないようにします。"""
+    with open(path, "r+b") as file:
+        file.truncate(valid_bytes)
+        file.seek(valid_bytes)
+        file.write(_frame(REC_END, b""))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def journal_paths(directory):
+    """フォルダ内のジャーナルを古い順に返します。"""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory) if name.endswith(JOURNAL_SUFFIX))
+    return [os.path.join(directory, name) for name in names]
+
+
+def unfinished_journals(directory):
+    """正常に終了していない（終了マーカーのない）ジャーナルを古い順に返します。"""
+    unfinished = []
+    for path in journal_paths(directory):
+        try:
+            contents = read_journal(path)
+        except OSError:
+            logging.error(f"Could not read the journal {path}", exc_info=True)
+            continue
+        if not contents.closed and contents.valid_bytes:
+            unfinished.append((path, contents))
+    return unfinished
+
+
+def prune_journals(directory, keep=DEFAULT_KEEP_JOURNALS):
+    """古いジャーナルを削除し、新しいものを ``keep`` 個だけ残します。"""
+    paths = journal_paths(directory)
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            logging.error(f"Could not remove the journal {path}", exc_info=True)
@@ -0,0 +1,162 @@
+"""Conversion of a recorded event timeline into a PyAutoGUI script."""
+
+from ..automation import mouse
+from .codegen import ScriptBuilder, step
+from .event_timeline import EVENT_KEY, EVENT_MOUSE, EVENT_MOVE
+from .key_coalescer import KeyCoalescer, key_step
+from .trajectory import simplify_timed_path
+
+# クリックとみなす押下位置と解放位置のずれ（ピクセル）
+CLICK_TOLERANCE_PX = 3
+# ダブルクリックとみなすクリック間隔（秒）
+DOUBLE_CLICK_INTERVAL_S = 0.4
+# これより短い待ち時間は sleep を出力しない（秒）
+MIN_SLEEP_S = 0.05
+# 軌跡を簡略化するときの既定の許容誤差（ピクセル）
+DEFAULT_PATH_TOLERANCE_PX = 3.0
+# 移動イベントの間隔がこれを超えたら、カーソルが止まっていたとみなす（秒）
+MOVE_PAUSE_S = 0.2
+
+
+def _split_on_pauses(points):
+    """カーソルが止まっていた箇所で軌跡を分割します。"""
+    segments = [[points[0]]]
+    for previous, current in zip(points, points[1:]):
+        if current[2] - previous[2] > MOVE_PAUSE_S:
+            segments.append([current])
+        else:
+            segments[-1].append(current)
+    return segments
+
+
+def _move_steps(points):
+    """簡略化済みの軌跡から、各頂点への ``moveTo`` を ``(t, step, duration)`` で返します。"""
+    steps = []
+    for previous, current in zip(points, points[1:]):
+        duration = current[2] - previous[2]
+        steps.append((previous[2], mouse.move_to(current[0], current[1], duration), duration))
+    return steps
+
+
+def path_to_steps(points, tolerance=DEFAULT_PATH_TOLERANCE_PX):
+    """ホバー中の軌跡 ``[(x, y, t), ...]`` を最小限の ``moveTo`` 列に変換します。"""
+    steps = []
+    if len(points) < 2:
+        return steps
+    for segment in _split_on_pauses(points):
+        if len(segment) >= 2:
+            steps.extend(_move_steps(simplify_timed_path(segment, tolerance)))
+        else:
+            x, y, t = segment[0]
+            steps.append((t, mouse.move_to(x, y), 0.0))
+    return steps
+
+
+def drag_to_steps(points, button="left", tolerance=DEFAULT_PATH_TOLERANCE_PX):
+    """押下から解放までの軌跡を、``dragTo`` または mouseDown/moveTo/mouseUp の列に変換します。
+
+    簡略化した結果が直線1本なら ``moveTo`` + ``dragTo`` の2行になります。
+    """
+    simplified = simplify_timed_path(points, tolerance)
+    (x0, y0, t0), (x1, y1, t1) = simplified[0], simplified[-1]
+    if len(simplified) == 2:
+        duration = t1 - t0
+        return [
+            (t0, mouse.move_to(x0, y0), 0.0),
+            (t0, mouse.drag_to(x1, y1, duration, button), duration),
+        ]
+    steps = [(t0, mouse.mouse_down(x0, y0, button), 0.0)]
+    steps.extend(_move_steps(simplified))
+    steps.append((t1, mouse.mouse_up(x1, y1, button), 0.0))
+    return steps
+
+
+def timeline_to_steps(timeline, tolerance=DEFAULT_PATH_TOLERANCE_PX):
+    """タイムラインを ``(timestamp, step, duration)`` の操作列に変換します。
+
+    同じ位置での押下と解放はクリック（短い間隔で2回ならダブルクリック）に、
+    押下中にカーソルが動いた場合は簡略化したドラッグ軌跡に、それ以外の
+    移動は簡略化した ``moveTo`` 列にまとめます。キー入力は
+    ``KeyCoalescer`` で write/hotkey/press にまとめ、マウス操作中に押されていた
+    修飾キーは keyDown/keyUp で囲みます。
+    """
+    events = list(timeline)
+    steps = []
+    hover = []
+    last_click = None
+    coalescer = KeyCoalescer(lambda key: steps.append((key[0], key_step(key), 0.0)))
+    index = 0
+    while index < len(events):
+        kind, name, pressed, x, y, t = events[index]
+
+        if kind == EVENT_KEY:
+            coalescer.feed(name, pressed, t)
+            index += 1
+            continue
+        if kind == EVENT_MOVE:
+            coalescer.flush()
+            hover.append((x, y, t))
+            index += 1
+            continue
+        # 押されたままの修飾キーは keyDown にして、Ctrl+クリックなどを再現する
+        coalescer.hold_modifiers(t)
+
+        steps.extend(path_to_steps(hover, tolerance))
+        hover = []
+
+        if kind == EVENT_MOUSE and pressed:
+            end = index + 1
+            while end < len(events) and events[end][0] == EVENT_MOVE:
+                end += 1
+            release = events[end] if end < len(events) else None
+            if release is not None and release[0] == EVENT_MOUSE and release[1] == name and not release[2]:
+                path = [(x, y, t)] + [(e[3], e[4], e[5]) for e in events[index + 1:end]]
+                path.append((release[3], release[4], release[5]))
+                if all(
+                    abs(px - x) <= CLICK_TOLERANCE_PX and abs(py - y) <= CLICK_TOLERANCE_PX
+                    for px, py, _ in path
+                ):
+                    if (
+                        last_click is not None
+                        and last_click[1:] == (name, x, y)
+                        and steps and steps[-1][0] == last_click[0]
+                        and t - last_click[0] <= DOUBLE_CLICK_INTERVAL_S
+                    ):
+                        steps[-1] = (last_click[0], mouse.click(x, y, name, clicks=2), 0.0)
+                        last_click = None
+                    else:
+                        steps.append((t, mouse.click(x, y, name), 0.0))
+                        last_click = (t, name, x, y)
+                else:
+                    steps.extend(drag_to_steps(path, name, tolerance))
+                    last_click = None
+                index = end + 1
+                continue
+            steps.append((t, mouse.mouse_down(x, y, name), 0.0))
+        else:
+            steps.append((t, mouse.mouse_up(x, y, name), 0.0))
+        index += 1
+    coalescer.release_modifiers()
+    return steps
+
+
+def with_sleeps(timed_steps):
+    """``(t, step, duration)`` の列から、間に ``time.sleep`` を挟んだ操作列を返します。"""
+    steps = []
+    previous_end = None
+    for t, item, duration in timed_steps:
+        if previous_end is not None and t - previous_end >= MIN_SLEEP_S:
+            steps.append(step("time.sleep", t - previous_end))
+        steps.append(item)
+        previous_end = t + duration
+    return steps
+
+
+def timeline_to_builder(timeline, tolerance=DEFAULT_PATH_TOLERANCE_PX):
+    """タイムライン全体を、待ち時間付きの操作列を持つ ``ScriptBuilder`` にします。"""
+    return ScriptBuilder(with_sleeps(timeline_to_steps(timeline, tolerance)))
+
+
+def timeline_to_script(timeline, tolerance=DEFAULT_PATH_TOLERANCE_PX):
+    """タイムライン全体を、待ち時間付きの1本の PyAutoGUI スクリプトにします。"""
+    return timeline_to_builder(timeline, tolerance).source()
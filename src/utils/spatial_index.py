@@ -0,0 +1,70 @@
+"""Uniform-grid spatial index for point hit-testing over window rectangles."""
+
+from collections import defaultdict
+
+
+class RectGridIndex:
+    """Indexes ``(left, top, right, bottom)`` rectangles for point queries.
+
+    Rectangles are bucketed into square grid cells sized from the median
+    rectangle, so a point query only looks at the handful of rectangles
+    registered in its cell. Very large rectangles (e.g. full-window panes)
+    would touch most cells and are kept in a small separate list instead.
+    Bounds are inclusive, matching the checks used by the inspector.
+    """
+
+    MAX_CELLS_PER_RECT = 256
+
+    def __init__(self, items, cell_size=None):
+        """``(rect, payload)`` の組から索引を構築します。"""
+        entries = []
+        for rect, payload in items:
+            left, top, right, bottom = rect
+            if right - left <= 0 or bottom - top <= 0:
+                continue
+            entries.append(((right - left) * (bottom - top), tuple(rect), payload))
+        # 面積の小さい順に並べておくと、検索結果の並べ替えが不要になる
+        entries.sort(key=lambda entry: entry[0])
+        self._entries = entries
+
+        if cell_size is None:
+            sizes = sorted(max(r[2] - r[0], r[3] - r[1]) for _, r, _ in entries)
+            cell_size = max(16, sizes[len(sizes) // 2]) if sizes else 64
+        self.cell_size = cell_size
+
+        self._cells = defaultdict(list)
+        self._large = []
+        for index, (_, (left, top, right, bottom), _) in enumerate(entries):
+            cx0, cy0 = left // cell_size, top // cell_size
+            cx1, cy1 = right // cell_size, bottom // cell_size
+            if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.MAX_CELLS_PER_RECT:
+                self._large.append(index)
+                continue
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self._cells[(cx, cy)].append(index)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def query(self, x, y):
+        """座標を含む要素を面積の小さい順に ``(area, rect, payload)`` で返します。"""
+        cell = self._cells.get((x // self.cell_size, y // self.cell_size), ())
+        hits = []
+        for index in sorted(set(cell).union(self._large)) if self._large else cell:
+            entry = self._entries[index]
+            left, top, right, bottom = entry[1]
+            if left <= x <= right and top <= y <= bottom:
+                hits.append(entry)
+        return hits
+
+    def smallest_at(self, x, y, min_area=0):
+        """座標を含む要素のうち、面積が ``min_area`` を超える最小のものを返します。
+
+        該当がなければ、座標を含む最小の要素を返します。
+        """
+        hits = self.query(x, y)
+        for entry in hits:
+            if entry[0] > min_area:
+                return entry
+        return hits[0] if hits else None
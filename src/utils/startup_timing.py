@@ -0,0 +1,81 @@
+"""Startup timing report: per-import cost, tab construction and time to first paint."""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# 読み込みに時間のかかるモジュール。どの import で読み込まれたかを記録する
+HEAVY_MODULES = ("pyautogui", "pywinauto", "comtypes", "win32gui", "pynput", "numpy", "PIL")
+DEFAULT_REPORT_PATH = os.path.join("logs", "startup.jsonl")
+
+
+class StartupTimer:
+    """Collects startup timings relative to process start.
+
+    ``timed_import`` wraps import statements and records how long they took
+    and which heavy third-party packages they pulled in; ``mark`` records
+    milestones such as the first paint. ``write`` appends the report as one
+    JSON line so regressions show up when comparing runs.
+    """
+
+    def __init__(self):
+        """計測の起点を記録します。"""
+        self.started = time.perf_counter()
+        self.imports = []
+        self.marks = {}
+        self.tabs = {}
+
+    def elapsed_ms(self):
+        """起点からの経過時間（ミリ秒）を返します。"""
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def timed_import(self, name):
+        """``with`` ブロック内の import にかかった時間と、新たに読み込まれた重いモジュールを記録します。"""
+        before = {module for module in HEAVY_MODULES if module in sys.modules}
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            loaded = [module for module in HEAVY_MODULES if module in sys.modules and module not in before]
+            self.imports.append({
+                "module": name,
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "at_ms": round(self.elapsed_ms(), 1),
+                "loaded": loaded,
+            })
+
+    def mark(self, name):
+        """節目の時刻を記録します。"""
+        self.marks[name] = round(self.elapsed_ms(), 1)
+
+    def record_tab(self, name, ms):
+        """タブの作成にかかった時間を記録します。"""
+        self.tabs[name] = round(ms, 1)
+
+    def report(self):
+        """計測結果を辞書で返します。"""
+        return {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "marks": dict(self.marks),
+            "imports": list(self.imports),
+            "tabs": dict(self.tabs),
+            "heavy_modules_loaded": [module for module in HEAVY_MODULES if module in sys.modules],
+        }
+
+    def write(self, path=DEFAULT_REPORT_PATH, event="startup"):
+        """計測結果を JSON 1行としてファイルに追記します。"""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            record = dict(self.report(), event=event)
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            logging.error("Could not write the startup timing report", exc_info=True)
+
+
+# アプリ全体で共有するタイマー（main.py が最初に import する）
+startup_timer = StartupTimer()
@@ -0,0 +1,241 @@
+"""Time-budgeted pipeline of element detection strategies for the inspector."""
+
+import logging
+import queue
+import threading
+import time
+
+from .tracing import tracer
+
+
+class InspectionContext:
+    """State shared by all strategies of one inspection.
+
+    ``from_point`` is memoized so strategies that start from
+    ``Desktop.from_point`` share a single cross-process lookup.
+    """
+
+    def __init__(self, x, y, backend, hwnd, window_class, desktop, job=None):
+        """検査対象の座標とウィンドウ情報を保持します。"""
+        self.x = x
+        self.y = y
+        self.backend = backend
+        self.hwnd = hwnd
+        self.window_class = window_class
+        self.desktop = desktop
+        self.job = job
+        self._lock = threading.Lock()
+        self._from_point = None
+        self._from_point_done = False
+
+    def from_point(self):
+        """``Desktop.from_point`` の結果を1回だけ取得して共有します。"""
+        with self._lock:
+            if not self._from_point_done:
+                try:
+                    with tracer.span("uia.from_point"):
+                        self._from_point = self.desktop.from_point(self.x, self.y)
+                finally:
+                    self._from_point_done = True
+            return self._from_point
+
+    def check_cancelled(self):
+        """ジョブがキャンセルされていれば例外を送出します。"""
+        if self.job is not None:
+            self.job.check_cancelled()
+
+
+class DetectionStrategy:
+    """One way of finding the element at a point.
+
+    ``func(context)`` returns a result dict or ``None``. ``window_classes``
+    restricts the strategy to windows whose class name contains one of the
+    given substrings (``None`` means every window). ``independent``
+    strategies do not depend on earlier ones and may race in parallel.
+    """
+
+    def __init__(self, name, func, budget, window_classes=None, independent=False):
+        """戦略の名前・関数・時間予算（秒）・対象クラスを設定します。"""
+        self.name = name
+        self.func = func
+        self.budget = budget
+        self.window_classes = tuple(window_classes) if window_classes else None
+        self.independent = independent
+        self.span_name = f"strategy.{name}"
+
+    def matches(self, window_class):
+        """ウィンドウクラスがこの戦略の対象かどうかを返します。"""
+        if self.window_classes is None:
+            return True
+        return any(part in window_class for part in self.window_classes)
+
+
+class _StrategyRun:
+    """One strategy call running on its own daemon thread.
+
+    ``started_at`` is set by the thread itself, so a strategy's budget is
+    measured from the moment it actually starts. When ``done_queue`` is
+    given the run puts itself on it after finishing.
+    """
+
+    def __init__(self, strategy, call, context, done_queue=None):
+        """実行する戦略と完了通知先を設定します。"""
+        self.strategy = strategy
+        self.result = None
+        self.started_at = None
+        self.done = threading.Event()
+        self._started = threading.Event()
+        self._call = call
+        self._context = context
+        self._done_queue = done_queue
+        self._thread = threading.Thread(
+            target=self._run, name=f"InspectStrategy-{strategy.name}", daemon=True
+        )
+
+    def start(self):
+        """スレッドを開始し、戦略が走り始めるまで待ちます。"""
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def wait(self, deadline):
+        """戦略の予算か ``deadline`` のどちらか早い方まで完了を待ちます。完了すれば ``True``。"""
+        limit = min(self.started_at + self.strategy.budget, deadline)
+        return self.done.wait(max(0.0, limit - time.monotonic()))
+
+    def _run(self):
+        """戦略を呼び出し、結果を保存して完了を通知します。"""
+        self.started_at = time.monotonic()
+        self._started.set()
+        try:
+            self.result = self._call(self.strategy, self._context)
+        finally:
+            self.done.set()
+            if self._done_queue is not None:
+                self._done_queue.put(self)
+
+
+class StrategyPipeline:
+    """Runs registered strategies in order under per-strategy and total budgets.
+
+    The strategies applicable to a window class are resolved once and kept
+    in a dispatch table. Each strategy runs on its own daemon thread and is
+    abandoned when its budget, counted from when it started, expires, so the
+    whole inspection never takes longer than ``deadline`` seconds. With
+    ``race`` enabled, independent strategies are started together and the
+    first one returning a result wins; the remaining strategies run in order
+    only if none of them succeeds. Abandoned strategies cannot be interrupted
+    and finish in the background; until they do, later inspections skip them
+    rather than piling more calls onto a hung target application.
+    """
+
+    def __init__(self, deadline=5.0, race=False):
+        """全体の上限時間（秒）と並列実行の有無を設定します。"""
+        self.deadline = deadline
+        self.race = race
+        self._strategies = []
+        self._dispatch = {}
+        self._busy = set()
+        self._busy_lock = threading.Lock()
+        self.timeouts = {}
+        self.skips = {}
+
+    def register(self, strategy):
+        """戦略を末尾に登録し、ディスパッチ表を作り直します。"""
+        self._strategies.append(strategy)
+        self._dispatch.clear()
+        return strategy
+
+    def strategies_for(self, window_class):
+        """ウィンドウクラスに適用する戦略の一覧を返します。"""
+        chain = self._dispatch.get(window_class)
+        if chain is None:
+            chain = tuple(s for s in self._strategies if s.matches(window_class))
+            self._dispatch[window_class] = chain
+        return chain
+
+    def run(self, context):
+        """戦略を実行し、最初に得られた結果を返します。見つからなければ ``None``。"""
+        deadline = time.monotonic() + self.deadline
+        chain = self.strategies_for(context.window_class)
+
+        if self.race:
+            racers = [s for s in chain if s.independent]
+            result = self._run_race(racers, context, deadline)
+            if result is not None:
+                return result
+            chain = [s for s in chain if not s.independent]
+
+        for strategy in chain:
+            context.check_cancelled()
+            if time.monotonic() >= deadline:
+                break
+            run = self._start(strategy, context)
+            if run is None:
+                continue
+            if not run.wait(deadline):
+                self._record_timeout(strategy)
+                continue
+            if run.result:
+                return run.result
+        context.check_cancelled()
+        return None
+
+    def _run_race(self, strategies, context, deadline):
+        """独立した戦略を同時に実行し、最初に結果を返したものを採用します。"""
+        done_queue = queue.Queue()
+        pending = set()
+        for strategy in strategies:
+            run = self._start(strategy, context, done_queue)
+            if run is not None:
+                pending.add(run)
+        while pending:
+            context.check_cancelled()
+            now = time.monotonic()
+            limits = {run: min(run.started_at + run.strategy.budget, deadline) for run in pending}
+            for run in [r for r in pending if limits[r] <= now and not r.done.is_set()]:
+                pending.discard(run)
+                self._record_timeout(run.strategy)
+            if not pending:
+                break
+            try:
+                run = done_queue.get(timeout=max(0.0, min(limits[r] for r in pending) - now))
+            except queue.Empty:
+                continue
+            if run in pending:
+                pending.discard(run)
+                if run.result:
+                    return run.result
+        return None
+
+    def _start(self, strategy, context, done_queue=None):
+        """戦略を専用スレッドで開始します。前回の呼び出しがまだ実行中なら ``None``。"""
+        with self._busy_lock:
+            if strategy.name in self._busy:
+                self.skips[strategy.name] = self.skips.get(strategy.name, 0) + 1
+                return None
+            self._busy.add(strategy.name)
+        return _StrategyRun(strategy, self._call_and_release, context, done_queue).start()
+
+    def _call_and_release(self, strategy, context):
+        """戦略を呼び出し、終わったら実行中の印を外します。"""
+        try:
+            return self._call(strategy, context)
+        finally:
+            with self._busy_lock:
+                self._busy.discard(strategy.name)
+
+    @staticmethod
+    def _call(strategy, context):
+        """戦略を呼び出し、例外はログに記録して ``None`` とみなします。"""
+        try:
+            with tracer.span(strategy.span_name):
+                return strategy.func(context)
+        except Exception:
+            logging.error(f"strategy {strategy.name} error", exc_info=True)
+            return None
+
+    def _record_timeout(self, strategy):
+        """時間切れになった戦略を記録します。"""
+        self.timeouts[strategy.name] = self.timeouts.get(strategy.name, 0) + 1
+        logging.warning(f"strategy {strategy.name} exceeded its time budget")
@@ -0,0 +1,92 @@
+"""Pre-click capture of the area around the cursor for image-click templates."""
+
+import logging
+import threading
+import time
+
+from .template_match import DEFAULT_TEMPLATE_SIZE, capture_template, grab_screen, template_bbox
+
+# カーソルのまわりを撮り直す間隔（秒）
+PREFETCH_INTERVAL_S = 0.2
+# クリック直前の画像として使える古さの上限（秒）
+PREFETCH_MAX_AGE_S = 0.6
+
+
+class TemplatePrefetcher:
+    """Keeps a recent capture of the area around the cursor, taken before clicks.
+
+    By the time the Tk loop sees a click, the control under the cursor is
+    already drawn pressed, and a template grabbed then often fails to match
+    at the default threshold later. A capture thread re-grabs a square of
+    twice the template size around the last cursor position every
+    ``interval`` seconds while no button is held. ``template`` then cuts the
+    click template out of the newest frame that finished before the press.
+    It falls back to grabbing the screen after the click when that frame is
+    too old or does not cover the template. A hover highlight can still be
+    captured, because the cursor is already over the control.
+    """
+
+    def __init__(self, size=DEFAULT_TEMPLATE_SIZE, interval=PREFETCH_INTERVAL_S,
+                 max_age=PREFETCH_MAX_AGE_S, grab=grab_screen):
+        """撮影範囲と間隔を設定し、撮影スレッドを起動します。"""
+        self.size = size
+        self.interval = interval
+        self.max_age = max_age
+        self._grab = grab
+        self._cursor = None
+        self._buttons_down = 0
+        # (撮影が終わった時刻, 左, 上, 画像)
+        self._frame = None
+        self.prefetched = 0
+        self.fallbacks = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="TemplatePrefetch", daemon=True)
+        self._thread.start()
+
+    def on_move(self, x, y):
+        """マウス移動フックから呼び出し、カーソル位置を覚えます。"""
+        self._cursor = (x, y)
+
+    def on_click(self, x, y, pressed):
+        """マウスクリックフックから呼び出します。ボタンを押している間は撮影しません。"""
+        self._cursor = (x, y)
+        self._buttons_down = max(0, self._buttons_down + (1 if pressed else -1))
+
+    def close(self):
+        """撮影スレッドを止めます。"""
+        self._stop_event.set()
+
+    def _run(self):
+        """一定間隔でカーソルのまわりを撮影します（撮影スレッド）。"""
+        while not self._stop_event.wait(self.interval):
+            cursor = self._cursor
+            if cursor is None or self._buttons_down:
+                continue
+            left, top = cursor[0] - self.size, cursor[1] - self.size
+            try:
+                image = self._grab((left, top, left + 2 * self.size, top + 2 * self.size))
+            except Exception:
+                logging.error("TemplatePrefetcher grab error", exc_info=True)
+                continue
+            if not self._buttons_down:
+                self._frame = (time.monotonic(), left, top, image)
+
+    def template(self, x, y, pressed_at):
+        """押下の直前に撮影した画像から、``(x, y)`` を中心としたテンプレートを切り出します。
+
+        使える画像がなければ、今の画面から切り出します。``pressed_at`` は押下時の ``time.monotonic()`` です。
+        """
+        box = template_bbox(x, y, self.size)
+        frame = self._frame
+        if frame is not None:
+            captured, left, top, image = frame
+            fresh = captured <= pressed_at and pressed_at - captured <= self.max_age
+            inside = (
+                left <= box[0] and top <= box[1]
+                and box[2] <= left + image.width and box[3] <= top + image.height
+            )
+            if fresh and inside:
+                self.prefetched += 1
+                return image.crop((box[0] - left, box[1] - top, box[2] - left, box[3] - top))
+        self.fallbacks += 1
+        return capture_template(x, y, self.size)
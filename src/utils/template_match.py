@@ -0,0 +1,284 @@
+"""Fast template matching used to click on-screen images instead of fixed coordinates.
+
+This module only depends on NumPy and Pillow (plus pywin32, when installed,
+to capture just the needed region), so generated scripts can copy it next
+to themselves and call ``locate_on_screen``.
+"""
+
+import numpy as np
+
+# テンプレートの短辺がこれより小さくなるまで縮小しない（ピクセル）
+MIN_PYRAMID_SIDE = 8
+# 一致とみなす正規化相互相関の下限
+DEFAULT_THRESHOLD = 0.8
+# 記録位置のまわりで最初に探す範囲（ピクセル）
+DEFAULT_SEARCH_MARGIN = 200
+# 細かい段で探し直す範囲（ピクセル）
+REFINE_RADIUS = 2
+# 最も粗い段から細かい段へ持ち越す候補の数
+COARSE_CANDIDATES = 16
+# クリック位置のまわりに切り出すテンプレートの大きさ（ピクセル）
+DEFAULT_TEMPLATE_SIZE = 48
+# BitBlt で重ねて表示されたウィンドウも撮影するフラグ
+CAPTUREBLT = 0x40000000
+
+_GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def to_gray(image):
+    """画像（PIL 画像または配列）を float32 のグレースケール配列にします。"""
+    array = np.asarray(image)
+    if array.ndim == 3:
+        return array[..., :3].astype(np.float32) @ _GRAY_WEIGHTS
+    return array.astype(np.float32)
+
+
+def downsample(gray):
+    """2x2 の平均で縦横半分に縮小します。"""
+    h = gray.shape[0] // 2 * 2
+    w = gray.shape[1] // 2 * 2
+    g = gray[:h, :w]
+    return (g[0::2, 0::2] + g[1::2, 0::2] + g[0::2, 1::2] + g[1::2, 1::2]) * 0.25
+
+
+def pyramid_levels(template_shape):
+    """テンプレートの大きさから、縮小する段数を返します。"""
+    side = min(template_shape)
+    levels = 0
+    while side // 2 >= MIN_PYRAMID_SIDE:
+        side //= 2
+        levels += 1
+    return levels
+
+
+def match_scores(image, template):
+    """画像上の各位置での正規化相互相関（-1〜1）を返します。
+
+    相関は FFT で、各窓の平均と分散は積分画像で求めるため、画像の大きさに
+    ほぼ比例した時間で計算できます。テンプレートが単色のときは ``None`` です。
+    """
+    th, tw = template.shape
+    ih, iw = image.shape
+    if ih < th or iw < tw:
+        return None
+    t = template - template.mean()
+    t_norm = float(np.sqrt((t * t).sum()))
+    if t_norm < 1e-6:
+        return None
+
+    shape = (ih, iw)
+    correlation = np.fft.irfft2(np.fft.rfft2(image, shape) * np.conj(np.fft.rfft2(t, shape)), shape)
+    numerator = correlation[: ih - th + 1, : iw - tw + 1]
+
+    n = th * tw
+    sums = _window_sums(image, th, tw)
+    squares = _window_sums(image * image, th, tw)
+    variance = np.maximum(squares - sums * sums / n, 0.0)
+    denominator = np.sqrt(variance) * t_norm
+    scores = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=scores, where=denominator > 1e-3 * t_norm)
+    return scores
+
+
+def _window_sums(image, th, tw):
+    """積分画像から、各位置の ``th x tw`` の窓の合計を返します。"""
+    integral = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(image, axis=0, dtype=np.float64), axis=1, out=integral[1:, 1:])
+    return (
+        integral[th:, tw:] - integral[:-th, tw:] - integral[th:, :-tw] + integral[:-th, :-tw]
+    )
+
+
+def _best(scores):
+    """スコアが最大の位置 ``(x, y, score)`` を返します。"""
+    y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return int(x), int(y), float(scores[y, x])
+
+
+def _candidates(scores, count, radius):
+    """スコアの高い位置を、互いに ``radius`` 以上離れたものだけ最大 ``count`` 個返します。"""
+    scores = scores.copy()
+    found = []
+    for _ in range(count):
+        x, y, score = _best(scores)
+        if found and score < found[0][2] - 0.5:
+            break
+        found.append((x, y, score))
+        scores[max(0, y - radius): y + radius + 1, max(0, x - radius): x + radius + 1] = -np.inf
+    return found
+
+
+def find_template(image, template):
+    """画像の中でテンプレートに最も一致する左上の位置 ``(x, y, score)`` を返します。
+
+    縮小画像（ピラミッド）の最も粗い段で全体を探し、細かい段では前の段の
+    候補のまわり数ピクセルだけを探し直します。見つからなければ ``None`` です。
+    """
+    image = to_gray(image)
+    template = to_gray(template)
+    levels = pyramid_levels(template.shape)
+    images = [image]
+    templates = [template]
+    for _ in range(levels):
+        images.append(downsample(images[-1]))
+        templates.append(downsample(templates[-1]))
+
+    scores = match_scores(images[-1], templates[-1])
+    if scores is None:
+        return None
+    best = None
+    radius = max(1, min(templates[-1].shape) // 2)
+    for x, y, score in _candidates(scores, COARSE_CANDIDATES, radius):
+        for level in range(levels - 1, -1, -1):
+            img = images[level]
+            th, tw = templates[level].shape
+            left = max(0, 2 * x - REFINE_RADIUS)
+            top = max(0, 2 * y - REFINE_RADIUS)
+            right = min(img.shape[1], 2 * x + tw + REFINE_RADIUS + 1)
+            bottom = min(img.shape[0], 2 * y + th + REFINE_RADIUS + 1)
+            refined = match_scores(img[top:bottom, left:right], templates[level])
+            if refined is None:
+                break
+            dx, dy, score = _best(refined)
+            x, y = left + dx, top + dy
+        else:
+            if best is None or score > best[2]:
+                best = (x, y, score)
+    return best
+
+
+def locate(screen, template, near=None, threshold=DEFAULT_THRESHOLD, margin=DEFAULT_SEARCH_MARGIN, origin=(0, 0)):
+    """スクリーン画像の中でテンプレートの中心座標 ``(x, y)`` を探します。
+
+    ``near`` を渡すと、まずそのまわり ``margin`` ピクセルだけを探し、
+    見つからないときだけ画面全体を探します。見つからなければ ``None`` です。
+    ``origin`` はスクリーン画像の左上の画面座標です（主画面より左や上にモニターがあると負になります）。
+    """
+    screen = np.asarray(screen)
+    ox, oy = origin
+    if near is not None:
+        bounds = (ox, oy, ox + screen.shape[1], oy + screen.shape[0])
+        left, top, right, bottom = search_region(near, np.asarray(template).shape, margin, bounds)
+        found = _locate_in(screen[top - oy:bottom - oy, left - ox:right - ox], template, threshold, left, top)
+        if found is not None:
+            return found
+    return _locate_in(screen, template, threshold, ox, oy)
+
+
+def search_region(near, template_shape, margin=DEFAULT_SEARCH_MARGIN, bounds=None):
+    """記録位置のまわりで最初に探す範囲 ``(left, top, right, bottom)`` を返します。
+
+    ``bounds`` を渡すと、その範囲（画面全体など）に収めます。
+    """
+    th, tw = template_shape[:2]
+    left = int(near[0]) - tw // 2 - margin
+    top = int(near[1]) - th // 2 - margin
+    right = left + tw + 2 * margin
+    bottom = top + th + 2 * margin
+    if bounds is not None:
+        left, top = max(left, bounds[0]), max(top, bounds[1])
+        right, bottom = min(right, bounds[2]), min(bottom, bounds[3])
+    return left, top, right, bottom
+
+
+def _locate_in(image, template, threshold, left=0, top=0):
+    """画像の中でテンプレートを探し、見つかれば画面上の中心座標を返します。"""
+    th, tw = np.asarray(template).shape[:2]
+    if image.shape[0] < th or image.shape[1] < tw:
+        return None
+    found = find_template(image, template)
+    if found is None or found[2] < threshold:
+        return None
+    return left + found[0] + tw // 2, top + found[1] + th // 2
+
+
+def virtual_screen_bbox():
+    """すべてのモニターを合わせた仮想スクリーンの範囲 ``(left, top, right, bottom)`` を返します。
+
+    Windows 以外では ``None`` を返します（主画面だけを扱います）。
+    """
+    try:
+        import ctypes
+
+        metrics = ctypes.windll.user32.GetSystemMetrics
+    except (ImportError, AttributeError, OSError):
+        return None
+    # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+    left, top = metrics(76), metrics(77)
+    return left, top, left + metrics(78), top + metrics(79)
+
+
+def grab_screen(bbox=None):
+    """画面を撮影した PIL 画像を返します。
+
+    ``bbox`` は仮想スクリーンの座標で、主画面以外のモニター（負の座標を含む）も撮影できます。
+    省略すると、すべてのモニターを撮影します。Windows では ``bbox`` の範囲だけを
+    BitBlt で撮影し、仮想スクリーン全体は撮影しません。
+    """
+    if bbox is None:
+        bbox = virtual_screen_bbox()
+    if bbox is not None:
+        try:
+            return _grab_region_win32(bbox)
+        except ImportError:
+            pass
+    from PIL import ImageGrab
+
+    return ImageGrab.grab(bbox=bbox, all_screens=True)
+
+
+def _grab_region_win32(bbox):
+    """画面 DC から ``bbox`` の範囲だけを BitBlt でコピーした PIL 画像を返します。"""
+    import win32con
+    import win32gui
+    import win32ui
+    from PIL import Image
+
+    left, top, right, bottom = bbox
+    width, height = right - left, bottom - top
+    screen_dc = win32gui.GetDC(0)
+    source = win32ui.CreateDCFromHandle(screen_dc)
+    memory = source.CreateCompatibleDC()
+    bitmap = win32ui.CreateBitmap()
+    try:
+        bitmap.CreateCompatibleBitmap(source, width, height)
+        memory.SelectObject(bitmap)
+        # 重ねて表示されたウィンドウ（ツールチップなど）も撮影する
+        memory.BitBlt((0, 0), (width, height), source, (left, top), win32con.SRCCOPY | CAPTUREBLT)
+        bits = bitmap.GetBitmapBits(True)
+    finally:
+        memory.DeleteDC()
+        source.DeleteDC()
+        win32gui.ReleaseDC(0, screen_dc)
+        win32gui.DeleteObject(bitmap.GetHandle())
+    return Image.frombuffer("RGB", (width, height), bits, "raw", "BGRX", 0, 1)
+
+
+def template_bbox(x, y, size=DEFAULT_TEMPLATE_SIZE):
+    """``(x, y)`` を中心としたテンプレートの範囲 ``(left, top, right, bottom)`` を返します。"""
+    half = size // 2
+    return x - half, y - half, x - half + size, y - half + size
+
+
+def capture_template(x, y, size=DEFAULT_TEMPLATE_SIZE):
+    """画面上の ``(x, y)`` を中心とした正方形を切り出した PIL 画像を返します。"""
+    return grab_screen(template_bbox(x, y, size))
+
+
+def locate_on_screen(template_path, near=None, threshold=DEFAULT_THRESHOLD, margin=DEFAULT_SEARCH_MARGIN):
+    """画像ファイルを画面上で探し、中心座標 ``(x, y)`` を返します。見つからなければ ``None`` です。
+
+    ``near`` を渡すと、まずそのまわりだけを撮影して探すため、画面全体を
+    撮影するより大幅に速くなります。すべてのモニターが対象です。
+    """
+    from PIL import Image
+
+    template = np.asarray(Image.open(template_path).convert("RGB"))
+    screen_bbox = virtual_screen_bbox()
+    if near is not None:
+        bbox = search_region(near, template.shape, margin, screen_bbox)
+        found = _locate_in(np.asarray(grab_screen(bbox)), template, threshold, bbox[0], bbox[1])
+        if found is not None:
+            return found
+    origin = screen_bbox[:2] if screen_bbox is not None else (0, 0)
+    return _locate_in(np.asarray(grab_screen(screen_bbox)), template, threshold, *origin)
@@ -0,0 +1,197 @@
+"""Lightweight span tracing with per-span latency histograms.
+
+Tracing is off unless the ``RECORDER_TRACE`` environment variable is set to
+``1`` or it is switched on from the trace tab. While it is off, ``span``
+returns a shared no-op context manager, so an instrumented hot path only
+pays for one attribute check and one method call.
+"""
+
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+TRACE_ENV = "RECORDER_TRACE"
+DEFAULT_DUMP_PATH = os.path.join("logs", "trace.json")
+# 1オクターブ（2倍）あたりのバケット数。バケットの幅は約9%になる
+BUCKETS_PER_OCTAVE = 8
+# 1マイクロ秒から約70分までを記録する
+BUCKET_COUNT = 32 * BUCKETS_PER_OCTAVE
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with constant-time recording.
+
+    Durations are kept in microsecond buckets that grow by a factor of
+    ``2 ** (1 / BUCKETS_PER_OCTAVE)``, so percentiles are accurate to about
+    half a bucket width (about 5%) whatever the scale, and memory stays
+    fixed.
+    """
+
+    def __init__(self):
+        """空のヒストグラムを作成します。"""
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def bucket(ms):
+        """所要時間（ミリ秒）が入るバケットの番号を返します。"""
+        us = ms * 1000
+        if us <= 1:
+            return 0
+        return min(BUCKET_COUNT - 1, int(math.log2(us) * BUCKETS_PER_OCTAVE))
+
+    @staticmethod
+    def midpoint(bucket):
+        """バケットの代表値（上下限の幾何平均、ミリ秒）を返します。"""
+        return 2 ** ((bucket + 0.5) / BUCKETS_PER_OCTAVE) / 1000
+
+    def record(self, ms):
+        """所要時間（ミリ秒）を1件記録します。"""
+        self.counts[self.bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p):
+        """``p``（0〜100）パーセンタイルの所要時間（ミリ秒）を返します。"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.midpoint(bucket), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        """件数・平均・p50/p95/p99・最大（ミリ秒）を返します。"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class _NullSpan:
+    """Span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Measures one ``with`` block and records it on exit."""
+
+    __slots__ = ("tracer", "name", "started")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class Tracer:
+    """Collects span latencies by name.
+
+    ``span(name)`` is used as ``with tracer.span("uia.children"):`` and
+    ``traced(name)`` decorates a whole function. Names are dotted, with the
+    layer first (``win32.``, ``uia.``, ``strategy.``, ``inspector.``,
+    ``recorder.``) so the stats panel groups related spans.
+    """
+
+    def __init__(self, enabled=False):
+        """トレースの有効・無効を設定します。"""
+        self.enabled = enabled
+        self.started = time.time()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        """``with`` ブロックの所要時間を記録するスパンを返します。無効なときは何もしません。"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def traced(self, name):
+        """関数全体の所要時間を記録するデコレーターを返します。"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, ms):
+        """スパンの所要時間（ミリ秒）を記録します。"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(ms)
+
+    def snapshot(self):
+        """スパン名ごとの集計を名前順の辞書で返します。"""
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def reset(self):
+        """記録をすべて消去します。"""
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def dump(self, path=DEFAULT_DUMP_PATH):
+        """集計を JSON ファイルに書き出します。記録がなければ何もしません。"""
+        spans = self.snapshot()
+        if not spans:
+            return None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+                        "dumped": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "spans": spans,
+                    },
+                    file,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            return path
+        except OSError:
+            logging.error("Could not write the trace report", exc_info=True)
+            return None
+
+
+# アプリ全体で共有するトレーサー
+tracer = Tracer(enabled=os.environ.get(TRACE_ENV) == "1")
@@ -0,0 +1,47 @@
+"""Simplification of recorded mouse trajectories."""
+
+
+def simplify_path(points, tolerance):
+    """Ramer–Douglas–Peucker 法で折れ線を簡略化し、残す点の添字を返します。
+
+    ``points`` は ``(x, y, ...)`` の並びで、先頭2列だけを使います。各区間の
+    点と線分の距離は NumPy でまとめて計算し、再帰の代わりにスタックを使います。
+    """
+    # NumPy は起動時ではなく、初めて軌跡を簡略化するときに読み込む
+    import numpy as np
+
+    pts = np.asarray([p[:2] for p in points], dtype=float)
+    n = len(pts)
+    if n <= 2:
+        return list(range(n))
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a = pts[start]
+        direction = pts[end] - a
+        inner = pts[start + 1:end] - a
+        length = np.hypot(direction[0], direction[1])
+        if length == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            # 線分の外への射影は端点に寄せ、行き過ぎや引き返しも距離に含める
+            t = np.clip(inner @ direction / (length * length), 0.0, 1.0)
+            offset = inner - t[:, None] * direction
+            distances = np.hypot(offset[:, 0], offset[:, 1])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = start + 1 + farthest
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return np.flatnonzero(keep).tolist()
+
+
+def simplify_timed_path(points, tolerance):
+    """``(x, y, t)`` の軌跡を簡略化し、残った点を時刻付きのまま返します。"""
+    return [points[i] for i in simplify_path(points, tolerance)]
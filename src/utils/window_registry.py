@@ -0,0 +1,256 @@
+"""Shared registry of top-level windows kept current by WinEvents or polling."""
+
+import ctypes
+import logging
+import threading
+from collections import deque, namedtuple
+from ctypes import wintypes
+
+import win32con
+import win32gui
+import win32process
+
+WindowInfo = namedtuple("WindowInfo", "hwnd title class_name pid")
+
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None,
+    wintypes.HANDLE,
+    wintypes.DWORD,
+    wintypes.HWND,
+    wintypes.LONG,
+    wintypes.LONG,
+    wintypes.DWORD,
+    wintypes.DWORD,
+)
+
+
+def read_window_info(hwnd):
+    """一覧に載せるウィンドウなら ``WindowInfo`` を、そうでなければ ``None`` を返します。
+
+    ``pygetwindow.getAllTitles()`` と同じく、表示中でタイトルが空でない
+    トップレベルウィンドウだけを対象にします。
+    """
+    try:
+        if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd):
+            return None
+        if win32gui.GetAncestor(hwnd, win32con.GA_ROOT) != hwnd:
+            return None
+        title = win32gui.GetWindowText(hwnd)
+        if not title.strip():
+            return None
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return WindowInfo(hwnd, title, win32gui.GetClassName(hwnd), pid)
+    except win32gui.error:
+        return None
+
+
+def enumerate_windows():
+    """現在のトップレベルウィンドウを ``{hwnd: WindowInfo}`` で返します。"""
+    windows = {}
+
+    def callback(hwnd, _):
+        info = read_window_info(hwnd)
+        if info is not None:
+            windows[hwnd] = info
+        return True
+
+    win32gui.EnumWindows(callback, None)
+    return windows
+
+
+class WindowRegistry:
+    """Single source of truth for the open windows shown by the GUI tabs.
+
+    The registry is updated from window create/destroy/show/hide/name-change
+    WinEvents on its own message-loop thread. If the hooks cannot be
+    installed it falls back to a poller that re-enumerates the windows and
+    diffs them against the last snapshot. Either way subscribers only
+    receive ``(added, removed, changed)`` lists of ``WindowInfo``.
+
+    Diffs are computed under the lock but delivered after it is released, in
+    the order they were computed, on whichever thread detected the change
+    (the registry thread or a caller of ``refresh``). Subscribers must
+    therefore return quickly and never wait on the Tk main loop; the GUI
+    tabs only put the diff on a queue that they drain from ``after``.
+    """
+
+    def __init__(self, poll_interval=1.0, use_events=True):
+        """ポーリング間隔（秒）とイベント監視の有無を設定します。"""
+        self.poll_interval = poll_interval
+        self.use_events = use_events
+        self.mode = None
+        self._windows = {}
+        self._subscribers = []
+        self._pending = deque()
+        self._dispatching = False
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._thread_id = None
+        self._hook_proc = None
+
+    def start(self):
+        """初回の列挙を行い、監視スレッドを開始します。"""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="WindowRegistry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """監視スレッドを停止します。"""
+        self._stop_event.set()
+        if self._thread_id is not None:
+            user32 = ctypes.windll.user32
+            user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+            user32.PostThreadMessageW.restype = wintypes.BOOL
+            user32.PostThreadMessageW(self._thread_id, win32con.WM_QUIT, 0, 0)
+
+    def windows(self):
+        """現在のウィンドウ一覧を返します。"""
+        with self._lock:
+            return list(self._windows.values())
+
+    def subscribe(self, callback):
+        """差分の通知先を登録し、登録時点のウィンドウ一覧を返します。"""
+        with self._lock:
+            self._subscribers.append(callback)
+            return list(self._windows.values())
+
+    def unsubscribe(self, callback):
+        """通知先の登録を解除します。"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def refresh(self):
+        """全ウィンドウを列挙し直し、前回との差分を通知します。"""
+        current = enumerate_windows()
+        with self._lock:
+            previous = self._windows
+            added = [info for hwnd, info in current.items() if hwnd not in previous]
+            removed = [info for hwnd, info in previous.items() if hwnd not in current]
+            changed = [
+                info for hwnd, info in current.items()
+                if hwnd in previous and previous[hwnd] != info
+            ]
+            self._windows = current
+            self._queue_diff(added, removed, changed)
+        self._dispatch()
+
+    def _update_window(self, hwnd):
+        """1つのウィンドウの状態を確認し、変化があれば通知します。"""
+        info = read_window_info(hwnd)
+        with self._lock:
+            previous = self._windows.get(hwnd)
+            if info is None:
+                if previous is not None:
+                    del self._windows[hwnd]
+                    self._queue_diff([], [previous], [])
+            elif previous is None:
+                self._windows[hwnd] = info
+                self._queue_diff([info], [], [])
+            elif previous != info:
+                self._windows[hwnd] = info
+                self._queue_diff([], [], [info])
+        self._dispatch()
+
+    def _queue_diff(self, added, removed, changed):
+        """差分をその時点の購読者と一緒に配信待ちに積みます（ロック保持中に呼び出します）。"""
+        if added or removed or changed:
+            self._pending.append((tuple(self._subscribers), (added, removed, changed)))
+
+    def _dispatch(self):
+        """配信待ちの差分を、ロックを解放した状態で順番に購読者へ渡します。
+
+        既に別のスレッドが配信中なら、そのスレッドが続けて配信します。
+        """
+        with self._lock:
+            if self._dispatching:
+                return
+            self._dispatching = True
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._dispatching = False
+                    return
+                subscribers, diff = self._pending.popleft()
+            for callback in subscribers:
+                try:
+                    callback(*diff)
+                except Exception:
+                    logging.error("WindowRegistry subscriber error", exc_info=True)
+
+    def _run(self):
+        """イベント監視を試み、使えなければポーリングで監視します。"""
+        if self.use_events:
+            try:
+                self._run_event_loop()
+                return
+            except Exception:
+                logging.error("WindowRegistry event hook failed, falling back to polling", exc_info=True)
+        self.mode = "poll"
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logging.error("WindowRegistry poll error", exc_info=True)
+
+    def _run_event_loop(self):
+        """WinEvent フックを登録し、メッセージループを回します。"""
+        user32 = ctypes.windll.user32
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            WinEventProc,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+        def on_event(_hook, _event, hwnd, id_object, id_child, _thread, _time):
+            if hwnd and id_object == OBJID_WINDOW and id_child == CHILDID_SELF:
+                try:
+                    self._update_window(hwnd)
+                except Exception:
+                    logging.error("WindowRegistry event error", exc_info=True)
+
+        # コールバックがガベージコレクトされないよう参照を保持する
+        self._hook_proc = WinEventProc(on_event)
+        hooks = [
+            user32.SetWinEventHook(
+                EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE, 0, self._hook_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            ),
+            user32.SetWinEventHook(
+                EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, 0, self._hook_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            ),
+        ]
+        if not all(hooks):
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            raise OSError("SetWinEventHook failed")
+
+        self.mode = "events"
+        # フック登録までに起きた変化を取りこぼさないよう、もう一度列挙する
+        self.refresh()
+        try:
+            msg = wintypes.MSG()
+            while not self._stop_event.is_set() and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
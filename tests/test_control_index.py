@@ -0,0 +1,41 @@
+import unittest
+
+from src.utils.control_index import ControlIndex
+
+
+def _dump(*controls):
+    lines = ["Control Identifiers:", ""]
+    for i, (kind, title, auto_id) in enumerate(controls):
+        lines.append(f"   | {kind} - '{title}'    (L{i}, T0, R{i + 80}, B24)")
+        lines.append(f"   | ['{title}', '{kind}']")
+        lines.append(f'   | child_window(title="{title}", auto_id="{auto_id}", control_type="{kind}")')
+    return lines
+
+
+class ControlIndexJapaneseTest(unittest.TestCase):
+    """Japanese titles are one token, so short terms must match inside them."""
+
+    def setUp(self):
+        self.index = ControlIndex.from_lines(_dump(
+            ("Button", "名前を付けて保存", "btnSaveAs"),
+            ("Button", "保存", "btnSave"),
+            ("MenuItem", "開く", "mnuOpen"),
+            ("Edit", "Save path", "txtPath"),
+        ))
+
+    def test_two_character_term_matches_inside_a_title(self):
+        self.assertEqual(self.index.search("title:保存"), [0, 1])
+        self.assertEqual(self.index.search("保存"), [0, 1])
+
+    def test_single_character_term(self):
+        self.assertEqual(self.index.search("保"), [0, 1])
+        self.assertEqual(self.index.search("type:menuitem 開"), [2])
+
+    def test_short_ascii_terms_stay_prefix_matches(self):
+        self.assertEqual(self.index.search("sa"), [3])
+        self.assertEqual(self.index.search("id:btn"), [0, 1])
+        self.assertEqual(self.index.search("av"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+
+from src.automation.backends import FakeBackend
+from src.automation.replay import STATUS_DONE, STATUS_STOPPED, ReplayEngine
+from src.utils.codegen import step
+
+
+def _clicks(*times):
+    return [(t, step("pyautogui.click", i, i), 0.0) for i, t in enumerate(times)]
+
+
+class ReplayPauseTest(unittest.TestCase):
+    """Pausing must hold the step that is being waited for."""
+
+    def test_pause_while_waiting_shifts_the_schedule(self):
+        backend = FakeBackend()
+        engine = ReplayEngine(backend)
+        done = threading.Event()
+        engine.on_done = lambda report: done.set()
+        started = time.monotonic()
+        engine.start(_clicks(0.0, 0.3, 0.4))
+        time.sleep(0.05)
+        engine.pause()
+        time.sleep(0.3)
+        self.assertEqual(len(backend.calls), 1)
+        engine.resume()
+        self.assertTrue(done.wait(2))
+        second = backend.calls[1][0] - started
+        third = backend.calls[2][0] - started
+        # 0.05 秒から 0.35 秒まで止めたので、0.3 秒のステップは約 0.6 秒に実行される
+        self.assertAlmostEqual(second, 0.6, delta=0.05)
+        self.assertAlmostEqual(third - second, 0.1, delta=0.02)
+
+    def test_stop_while_paused(self):
+        backend = FakeBackend()
+        reports = []
+        engine = ReplayEngine(backend, on_done=reports.append)
+        engine.start(_clicks(0.0, 0.3))
+        time.sleep(0.05)
+        engine.pause()
+        engine.stop()
+        engine._thread.join(1)
+        self.assertEqual(reports[0].status, STATUS_STOPPED)
+        self.assertEqual(len(backend.calls), 1)
+
+    def test_step_while_paused_runs_one_step(self):
+        backend = FakeBackend()
+        reports = []
+        engine = ReplayEngine(backend, on_done=reports.append)
+        engine.pause()
+        engine.start(_clicks(0.0, 5.0, 10.0))
+        time.sleep(0.05)
+        self.assertEqual(backend.calls, [])
+        engine.step()
+        time.sleep(0.05)
+        engine.step()
+        time.sleep(0.05)
+        self.assertEqual(len(backend.calls), 2)
+        engine.stop()
+        engine._thread.join(1)
+        self.assertEqual(reports[0].status, STATUS_STOPPED)
+
+    def test_unpaused_run_completes(self):
+        report = ReplayEngine(FakeBackend()).run(_clicks(0.0, 0.02, 0.04))
+        self.assertEqual(report.status, STATUS_DONE)
+        self.assertEqual(report.summary()["steps"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
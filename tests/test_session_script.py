@@ -0,0 +1,78 @@
+import unittest
+
+from src.utils.event_timeline import EVENT_KEY, EVENT_MOUSE
+from src.utils.session_script import timeline_to_steps
+from src.utils.codegen import render_step
+
+
+def _key(name, pressed, t):
+    return (EVENT_KEY, name, pressed, 0, 0, t)
+
+
+def _mouse(x, y, pressed, t, button="left"):
+    return (EVENT_MOUSE, button, pressed, x, y, t)
+
+
+def _code(timeline):
+    return [render_step(item) for _, item, _ in timeline_to_steps(timeline)]
+
+
+class ModifierClickTest(unittest.TestCase):
+    """Modifiers held across mouse input must stay held during replay."""
+
+    def test_ctrl_held_across_clicks(self):
+        timeline = [
+            _key("ctrl", True, 0.0),
+            _mouse(100, 100, True, 0.1),
+            _mouse(100, 100, False, 0.15),
+            _mouse(200, 200, True, 0.6),
+            _mouse(200, 200, False, 0.65),
+            _key("ctrl", False, 0.8),
+        ]
+        self.assertEqual(_code(timeline), [
+            "pyautogui.keyDown('ctrl')",
+            "pyautogui.click(100, 100)",
+            "pyautogui.click(200, 200)",
+            "pyautogui.keyUp('ctrl')",
+        ])
+
+    def test_modifier_released_at_end_of_recording(self):
+        timeline = [_key("shift", True, 0.0), _mouse(5, 5, True, 0.1), _mouse(5, 5, False, 0.15)]
+        self.assertEqual(_code(timeline), [
+            "pyautogui.keyDown('shift')",
+            "pyautogui.click(5, 5)",
+            "pyautogui.keyUp('shift')",
+        ])
+
+    def test_hotkey_while_modifier_is_down(self):
+        timeline = [
+            _key("ctrl", True, 0.0),
+            _mouse(5, 5, True, 0.1),
+            _mouse(5, 5, False, 0.15),
+            _key("shift", True, 0.2),
+            _key("s", True, 0.3),
+            _key("s", False, 0.35),
+            _key("shift", False, 0.4),
+            _key("ctrl", False, 0.5),
+        ]
+        self.assertEqual(_code(timeline), [
+            "pyautogui.keyDown('ctrl')",
+            "pyautogui.click(5, 5)",
+            "pyautogui.hotkey('shift', 's')",
+            "pyautogui.keyUp('ctrl')",
+        ])
+
+    def test_lone_modifier_and_hotkey_unchanged(self):
+        timeline = [
+            _key("ctrl", True, 0.0),
+            _key("c", True, 0.1),
+            _key("c", False, 0.12),
+            _key("ctrl", False, 0.2),
+            _key("shift", True, 0.3),
+            _key("shift", False, 0.35),
+        ]
+        self.assertEqual(_code(timeline), ["pyautogui.hotkey('ctrl', 'c')", "pyautogui.press('shift')"])
+
+
+if __name__ == "__main__":
+    unittest.main()
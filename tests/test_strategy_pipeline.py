@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from src.utils.strategy_pipeline import DetectionStrategy, InspectionContext, StrategyPipeline
+
+
+def _context():
+    return InspectionContext(0, 0, "uia", 0, "Notepad", desktop=None)
+
+
+class StrategyPipelineHangTest(unittest.TestCase):
+    """A hung target application must not starve later inspections."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _hang(self, context):
+        self.release.wait(5)
+        return None
+
+    def test_hung_strategies_do_not_block_later_runs(self):
+        pipeline = StrategyPipeline(deadline=1.0)
+        for i in range(6):
+            pipeline.register(DetectionStrategy(f"hung{i}", self._hang, 0.05))
+        pipeline.register(DetectionStrategy("fast", lambda context: {"name": "ok"}, 0.5))
+        for attempt in range(3):
+            started = time.monotonic()
+            self.assertEqual(pipeline.run(_context()), {"name": "ok"})
+            self.assertLess(time.monotonic() - started, 0.5)
+        # 初回に時間切れになった戦略は、実行中のあいだ次回以降は呼ばれない
+        self.assertEqual(pipeline.timeouts["hung0"], 1)
+        self.assertEqual(pipeline.skips["hung0"], 2)
+
+    def test_strategy_runs_again_after_it_finishes(self):
+        calls = []
+
+        def slow(context):
+            calls.append(context)
+            self.release.wait(5)
+            return {"name": "slow"}
+
+        pipeline = StrategyPipeline(deadline=1.0)
+        pipeline.register(DetectionStrategy("slow", slow, 0.05))
+        self.assertIsNone(pipeline.run(_context()))
+        self.release.set()
+        time.sleep(0.05)
+        self.release.clear()
+        pipeline.run(_context())
+        self.assertEqual(len(calls), 2)
+
+    def test_strategy_threads_are_daemons(self):
+        pipeline = StrategyPipeline(deadline=1.0)
+        pipeline.register(DetectionStrategy("hung", self._hang, 0.05))
+        pipeline.run(_context())
+        threads = [t for t in threading.enumerate() if t.name == "InspectStrategy-hung"]
+        self.assertTrue(threads)
+        self.assertTrue(all(t.daemon for t in threads))
+
+    def test_race_returns_first_result_while_others_hang(self):
+        pipeline = StrategyPipeline(deadline=1.0, race=True)
+        pipeline.register(DetectionStrategy("hung", self._hang, 0.5, independent=True))
+        pipeline.register(DetectionStrategy("fast", lambda context: {"name": "ok"}, 0.5, independent=True))
+        started = time.monotonic()
+        self.assertEqual(pipeline.run(_context()), {"name": "ok"})
+        self.assertLess(time.monotonic() - started, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()